@@ -1,15 +1,30 @@
+import copy
+import hashlib
 import io
+import itertools
 import logging
+import mimetypes
 import os
 import shutil
+import stat
 import tempfile
+import threading
+import time
 import zipfile
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from urllib.parse import quote
 
 import yaml
 from flask import (
     Flask,
+    Response,
     abort,
+    g,
+    has_request_context,
     jsonify,
     render_template,
     request,
@@ -17,60 +32,351 @@ from flask import (
     send_from_directory,
 )
 from flask_compress import Compress
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+from werkzeug.http import generate_etag, is_resource_modified
 from werkzeug.utils import secure_filename
 
 from trinetra import gcode_handler, search
 from trinetra import three_mf
 from trinetra.database import DatabaseManager
-from trinetra.config_paths import resolve_storage_paths
+from trinetra.config_paths import resolve_cache_root, resolve_storage_paths
+from trinetra.json_provider import install_json_provider
+from trinetra.integrations.bambu.types import BambuIntegrationSettings
+from trinetra.integrations.moonraker.types import MoonrakerIntegrationSettings
 from trinetra.integrations.registry import get_printer_integration, list_printer_integrations
 
 # Import logging configuration from trinetra package
 from trinetra.logger import get_logger, configure_logging
 
+try:
+    from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on libyaml availability
+    from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader
+
 # Global logger - will be configured after config is loaded
 logger = None
 
-DEFAULT_PRINTER_VOLUME = {"x": 220.0, "y": 220.0, "z": 270.0}
-DEFAULT_LIBRARY_HISTORY_SETTINGS = {
-    "enabled": True,
-    "ttl_days": 180,
-    "cleanup_trigger": "refresh",
-}
+DEFAULT_PRINTER_VOLUME = MappingProxyType({"x": 220.0, "y": 220.0, "z": 270.0})
+DEFAULT_LIBRARY_HISTORY_SETTINGS = MappingProxyType(
+    {
+        "enabled": True,
+        "ttl_days": 180,
+        "cleanup_trigger": "refresh",
+    }
+)
 DEFAULT_STL_SORT_BY = "created_at"
 DEFAULT_STL_SORT_ORDER = "desc"
-POPULAR_PRINTERS = [
-    {"id": "bambu_a1_mini", "name": "Bambu Lab A1 mini", "x": 180, "y": 180, "z": 180},
-    {"id": "bambu_a1", "name": "Bambu Lab A1", "x": 256, "y": 256, "z": 256},
-    {"id": "bambu_x1_p1", "name": "Bambu Lab X1 / P1 Series", "x": 256, "y": 256, "z": 256},
-    {"id": "prusa_mk4", "name": "Prusa MK4 / MK3S+", "x": 250, "y": 210, "z": 220},
-    {"id": "ender3_v2", "name": "Creality Ender 3 V2", "x": 220, "y": 220, "z": 250},
-]
+POPULAR_PRINTERS = tuple(
+    MappingProxyType(printer)
+    for printer in (
+        {"id": "bambu_a1_mini", "name": "Bambu Lab A1 mini", "x": 180, "y": 180, "z": 180},
+        {"id": "bambu_a1", "name": "Bambu Lab A1", "x": 256, "y": 256, "z": 256},
+        {"id": "bambu_x1_p1", "name": "Bambu Lab X1 / P1 Series", "x": 256, "y": 256, "z": 256},
+        {"id": "prusa_mk4", "name": "Prusa MK4 / MK3S+", "x": 250, "y": 210, "z": 220},
+        {"id": "ender3_v2", "name": "Creality Ender 3 V2", "x": 220, "y": 220, "z": 250},
+    )
+)
+
+
+def popular_printers_payload():
+    """Plain-dict copy of POPULAR_PRINTERS for JSON/template serialization."""
+    return [dict(printer) for printer in POPULAR_PRINTERS]
+
+
+# Parsed config files keyed by absolute path -> (mtime_ns, size, config)
+_YAML_CACHE = OrderedDict()
+_YAML_CACHE_MAX = 32
 
 
 def safe_join(base, *paths):
     """Safely join one or more path components to a base path to prevent directory traversal."""
-    base_path = os.path.abspath(base)
-    final_path = os.path.abspath(os.path.join(base, *paths))
-    if not final_path.startswith(base_path + os.sep):
+    # Configured storage roots are already absolute, so only relative bases pay for abspath
+    base_path = os.path.normpath(base) if os.path.isabs(base) else os.path.abspath(base)
+    final_path = os.path.normpath(os.path.join(base_path, *paths))
+    if os.path.commonpath((base_path, final_path)) != base_path:
         raise Exception("Attempted Path Traversal")
     return final_path
 
 
+ZIP_STREAM_CHUNK_SIZE = 1024 * 1024
+# Default size bounds of the regenerable download caches, overridable in the config
+DEFAULT_ARCHIVE_CACHE_MAX_MB = 2048
+DEFAULT_PLATE_CACHE_MAX_MB = 512
+LIBRARY_FILE_CACHE_CONTROL = "public, no-cache"
+STATS_CACHE_TTL_SECONDS = 60
+PATH_CACHE_TTL_SECONDS = 5
+PATH_CACHE_MAX_ENTRIES = 4096
+UPLOAD_EXTRACT_MAX_WORKERS = min(8, os.cpu_count() or 4)
+FOLDER_SCAN_MAX_WORKERS = 16
+
+# Single worker so post-upload index refreshes are serialized
+_INDEX_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trinetra-index")
+# Caps the CPU spent on uploads whose zips are extracted in the background
+_UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="trinetra-upload")
+UPLOAD_JOB_HISTORY = 64
+# Already-compressed or poorly-compressible formats are stored as-is in download archives
+ZIP_STORED_EXTENSIONS = {
+    ".3mf",
+    ".stl",
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".webp",
+    ".pdf",
+    ".zip",
+    ".gz",
+}
+# ZipFile(compresslevel=...) is not applied to explicit ZipInfo members, so the level is
+# set on each member through ZipInfo's private attribute, renamed in Python 3.13
+_ZIPINFO_LEVEL_ATTR = (
+    "compress_level" if hasattr(zipfile.ZipInfo, "compress_level") else "_compresslevel"
+)
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only sink that lets ZipFile output be drained chunk by chunk."""
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        return len(data)
+
+    def read_and_reset(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def iter_folder_files(folder_path):
+    """Lazily yield (path, arcname, stat) for every file below folder_path."""
+    pending = [(folder_path, "")]
+    while pending:
+        dir_path, prefix = pending.pop()
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                arcname = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, arcname + "/"))
+                elif entry.is_file():
+                    yield entry.path, arcname, entry.stat()
+
+
+def folder_listing(folder_path):
+    """
+    Walk folder_path once into a list of (path, arcname, stat) sorted by arcname.
+
+    The same listing keys the archive cache and feeds the ZIP writer, so a download
+    never walks or stats the folder twice.
+    """
+    return sorted(iter_folder_files(folder_path), key=lambda item: item[1])
+
+
+def zip_info_from_stat(arcname, file_stat):
+    """ZipInfo.from_file without its own os.stat call."""
+    zinfo = zipfile.ZipInfo(arcname, time.localtime(file_stat.st_mtime)[:6])
+    zinfo.external_attr = (file_stat.st_mode & 0xFFFF) << 16
+    zinfo.file_size = file_stat.st_size
+    return zinfo
+
+
+def iter_zip_folder(listing):
+    """Yield a ZIP archive of a folder_listing() incrementally as it is compressed."""
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+        for file_path, arcname, file_stat in listing:
+            zinfo = zip_info_from_stat(arcname, file_stat)
+            if os.path.splitext(arcname)[1].lower() in ZIP_STORED_EXTENSIONS:
+                zinfo.compress_type = zipfile.ZIP_STORED
+            else:
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                setattr(zinfo, _ZIPINFO_LEVEL_ATTR, 1)
+            with open(file_path, "rb") as src, zipf.open(zinfo, "w", force_zip64=True) as dst:
+                while True:
+                    chunk = src.read(ZIP_STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    data = stream.read_and_reset()
+                    if data:
+                        yield data
+            data = stream.read_and_reset()
+            if data:
+                yield data
+    yield stream.read_and_reset()
+
+
+def folder_archive_name(listing, folder_key):
+    """
+    Name the cached ZIP of a folder_listing() as <folder digest>-<listing digest>.zip.
+
+    The listing digest covers member names, sizes and mtimes, so any change to the folder
+    yields a new name and an unchanged folder keeps hitting the same archive.
+    """
+    digest = hashlib.sha1()
+    for _file_path, arcname, file_stat in listing:
+        digest.update(f"{arcname}\0{file_stat.st_size}\0{file_stat.st_mtime_ns}\n".encode())
+    folder_digest = hashlib.sha1(folder_key.encode()).hexdigest()[:16]
+    return f"{folder_digest}-{digest.hexdigest()[:16]}.zip"
+
+
+def touch_cache_entry(path):
+    """
+    Mark a cache file as just used. Only the access time moves, since send_file derives
+    ETags from the mtime; eviction drops the least recently accessed files first.
+    """
+    try:
+        os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+    except OSError:
+        pass
+
+
+def cache_max_bytes(max_mb):
+    """Byte budget for a cache configured in megabytes; 0 or less disables the bound."""
+    try:
+        return max(0, int(float(max_mb) * 1024 * 1024))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _prune_cached_versions(cache_dir, keep_name, suffix=".zip", max_bytes=0):
+    """
+    Remove older cache files sharing keep_name's "<key>-" prefix, then evict the least
+    recently used files until cache_dir fits in max_bytes. keep_name itself is never evicted.
+    """
+    prefix = keep_name.split("-", 1)[0] + "-"
+    kept = []
+    total = 0
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(suffix) or entry.name == keep_name:
+                continue
+            try:
+                if entry.name.startswith(prefix):
+                    os.remove(entry.path)
+                    continue
+                entry_stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            kept.append((entry_stat.st_atime_ns, entry.path, entry_stat.st_size))
+            total += entry_stat.st_size
+    if max_bytes <= 0:
+        return
+    try:
+        total += os.path.getsize(os.path.join(cache_dir, keep_name))
+    except OSError:
+        pass
+    for _atime_ns, path, size in sorted(kept):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def open_cache_tmp(cache_dir, name):
+    """
+    Open a uniquely named temp file next to cache_dir/name for an atomic os.replace.
+
+    mkstemp keeps concurrent writers in any worker process apart; the file is widened
+    from mkstemp's 0600 so a front-end server can still read the finished entry.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f"{name}.", suffix=".tmp")
+    os.chmod(tmp_path, 0o644)
+    return os.fdopen(fd, "wb"), tmp_path
+
+
+def iter_zip_folder_cached(listing, cache_dir, archive_name, max_bytes=0):
+    """
+    Stream a ZIP of a folder_listing() while writing the same bytes into the cache.
+
+    The cached copy only becomes visible once the whole archive was produced; an aborted
+    download leaves nothing behind.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    archive_path = os.path.join(cache_dir, archive_name)
+    archive, tmp_path = open_cache_tmp(cache_dir, archive_name)
+    completed = False
+    try:
+        with archive:
+            for chunk in iter_zip_folder(listing):
+                archive.write(chunk)
+                yield chunk
+        os.replace(tmp_path, archive_path)
+        completed = True
+    finally:
+        if not completed and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    _prune_cached_versions(cache_dir, archive_name, max_bytes=max_bytes)
+
+
+def cached_folder_archive(folder_path, cache_dir, folder_key, max_bytes=0):
+    """
+    Return the name of a ZIP of folder_path inside cache_dir, building it if needed.
+
+    An unchanged folder is zipped once; stale archives are dropped on rebuild and the
+    least recently used ones once the cache outgrows max_bytes.
+    """
+    listing = folder_listing(folder_path)
+    archive_name = folder_archive_name(listing, folder_key)
+    archive_path = os.path.join(cache_dir, archive_name)
+    if os.path.isfile(archive_path):
+        touch_cache_entry(archive_path)
+    else:
+        for _chunk in iter_zip_folder_cached(
+            listing, cache_dir, archive_name, max_bytes
+        ):
+            pass
+    return archive_name
+
+
+@lru_cache(maxsize=2)
+def activity_calendar_days(today_iso):
+    """Date keys for the 365-day activity window ending on today_iso, computed once per day."""
+    start_date = date.fromisoformat(today_iso) - timedelta(days=364)
+    return tuple((start_date + timedelta(days=i)).isoformat() for i in range(365))
+
+
 def load_config(yaml_file=None):
     """Loads configuration from a YAML file."""
     if not yaml_file:
         yaml_file = os.getenv("CONFIG_FILE", "config_dev.yaml")  # Default config file name
 
+    cache_key = os.path.abspath(yaml_file)
+    try:
+        file_stat = os.stat(cache_key)
+        signature = (file_stat.st_mtime_ns, file_stat.st_size)
+    except OSError:
+        signature = None
+
+    cached = _YAML_CACHE.get(cache_key)
+    if signature is not None and cached is not None and cached[:2] == signature:
+        _YAML_CACHE.move_to_end(cache_key)
+        return copy.deepcopy(cached[2])
+
     try:
         with open(yaml_file) as file:
-            config = yaml.safe_load(file)
-            return config or {}
+            config = yaml.load(file, Loader=_YamlLoader) or {}
     except Exception as e:
         # Use basic logging here since logger might not be configured yet
         print(f"Error loading configuration file: {e}")
         return {}
 
+    if signature is not None:
+        _YAML_CACHE[cache_key] = (*signature, config)
+        _YAML_CACHE.move_to_end(cache_key)
+        while len(_YAML_CACHE) > _YAML_CACHE_MAX:
+            _YAML_CACHE.popitem(last=False)
+    return copy.deepcopy(config)
+
 
 def create_app(config_file=None, config_overrides=None):
     active_config_file = config_file or os.getenv("CONFIG_FILE", "config_dev.yaml")
@@ -86,6 +392,7 @@ def create_app(config_file=None, config_overrides=None):
     logger = get_logger(__name__)
 
     app = Flask(__name__)
+    install_json_provider(app)
     Compress(app)
 
     # Set up config in app.config
@@ -109,6 +416,11 @@ def create_app(config_file=None, config_overrides=None):
         os.makedirs(db_dir, exist_ok=True)
     app.config["STL_FILES_PATH"] = stl_files_path
     app.config["GCODE_FILES_PATH"] = gcode_files_path
+    cache_root = resolve_cache_root(config, db_path)
+    app.config.setdefault("ARCHIVE_CACHE_PATH", os.path.join(cache_root, "archives"))
+    app.config.setdefault("ARCHIVE_CACHE_MAX_MB", DEFAULT_ARCHIVE_CACHE_MAX_MB)
+    app.config.setdefault("PLATE_CACHE_PATH", os.path.join(cache_root, "plates"))
+    app.config.setdefault("PLATE_CACHE_MAX_MB", DEFAULT_PLATE_CACHE_MAX_MB)
 
     # Initialize database manager
     app.config["DATABASE_PATH"] = db_path
@@ -149,19 +461,48 @@ def create_app(config_file=None, config_overrides=None):
             "z": z if z is not None else DEFAULT_PRINTER_VOLUME["z"],
         }
 
+    config_write_lock = threading.RLock()
+
+    def update_config(build_updates):
+        """Read the config, derive updates from it and write them under one lock."""
+        config_path = app.config.get("CONFIG_FILE_PATH")
+        if not config_path:
+            raise ValueError("Config file path is not set")
+
+        with config_write_lock:
+            updates = build_updates(load_config(config_path))
+            write_config_updates(updates)
+        return updates
+
     def write_config_updates(updates: dict):
         config_path = app.config.get("CONFIG_FILE_PATH")
         if not config_path:
             raise ValueError("Config file path is not set")
 
-        current_config = load_config(config_path)
-        current_config.update(updates)
+        with config_write_lock:
+            current_config = load_config(config_path)
+            current_config.update(updates)
 
-        with open(config_path, "w", encoding="utf-8") as file:
-            yaml.safe_dump(current_config, file, sort_keys=False)
+            # Write next to the config and swap it in so readers never see a partial file
+            tmp_path = f"{config_path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    yaml.dump(current_config, file, Dumper=_YamlDumper, sort_keys=False)
+                os.replace(tmp_path, config_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            _YAML_CACHE.pop(os.path.abspath(config_path), None)
 
         for key, value in updates.items():
             app.config[key.upper()] = value
+        with integration_state_lock:
+            config_version[0] += 1
+            integration_state_cache.clear()
+        if has_request_context():
+            g.pop("runtime_integration_config", None)
+            g.pop("trinetra_settings", None)
 
     def get_library_history_settings() -> dict:
         raw_library = app.config.get("LIBRARY", {})
@@ -186,14 +527,37 @@ def create_app(config_file=None, config_overrides=None):
         }
 
     def get_runtime_integration_config() -> dict:
+        # Built at most once per request; write_config_updates drops the cached copy
+        if has_request_context() and "runtime_integration_config" in g:
+            return g.runtime_integration_config
         integrations = app.config.get("INTEGRATIONS", {})
         if not isinstance(integrations, dict):
             integrations = {}
-        return {
+        runtime_config = {
             "integrations": integrations,
             "moonraker_url": app.config.get("MOONRAKER_URL", ""),
             "library": {"history": get_library_history_settings()},
         }
+        if has_request_context():
+            g.runtime_integration_config = runtime_config
+        return runtime_config
+
+    # UI states only change when settings are written, so compute each once per config version
+    integration_state_lock = threading.Lock()
+    integration_state_cache = {}
+    config_version = [0]
+
+    def get_cached_integration_state(integration) -> dict:
+        with integration_state_lock:
+            version = config_version[0]
+            cached = integration_state_cache.get(integration.integration_id)
+        if cached is not None and cached[0] == version:
+            return copy.deepcopy(cached[1])
+        state = integration.get_ui_state(get_runtime_integration_config())
+        with integration_state_lock:
+            if config_version[0] == version:
+                integration_state_cache[integration.integration_id] = (version, state)
+        return copy.deepcopy(state)
 
     def get_moonraker_integration_state() -> dict:
         integration = get_printer_integration("moonraker")
@@ -206,7 +570,7 @@ def create_app(config_file=None, config_overrides=None):
                 "configured": False,
                 "settings": {"base_url": ""},
             }
-        return integration.get_ui_state(get_runtime_integration_config())
+        return get_cached_integration_state(integration)
 
     def get_enabled_moonraker_url() -> str | None:
         state = get_moonraker_integration_state()
@@ -234,7 +598,7 @@ def create_app(config_file=None, config_overrides=None):
                 "configured": False,
                 "settings": {"mode": "cloud", "access_token": "", "refresh_token": "", "region": "global"},
             }
-        return integration.get_ui_state(get_runtime_integration_config())
+        return get_cached_integration_state(integration)
 
     def sync_bambu_history(*, cleanup_expired: bool) -> dict:
         runtime_config = get_runtime_integration_config()
@@ -266,13 +630,13 @@ def create_app(config_file=None, config_overrides=None):
 
     @app.context_processor
     def inject_global_settings():
-        return {
-            "trinetra_settings": {
+        if "trinetra_settings" not in g:
+            g.trinetra_settings = {
                 "printer_volume": get_current_printer_volume(),
                 "library_history": get_library_history_settings(),
                 "integrations": list_printer_integrations(get_runtime_integration_config()),
             }
-        }
+        return {"trinetra_settings": g.trinetra_settings}
 
     def get_stl_files(base_path):
         """Get STL files from database instead of filesystem."""
@@ -281,42 +645,50 @@ def create_app(config_file=None, config_overrides=None):
     def fix_duplicated_folders(base_path):
         """Fix existing folders that have duplicated structure like folder/folder/"""
         fixed_count = 0
-        for root, dirs, files in os.walk(base_path):
-            # Check if this is a duplicated folder structure
-            rel_path = os.path.relpath(root, base_path)
-            path_parts = rel_path.split(os.sep)
-
-            # If we have a path like "folder/folder", fix it
-            if len(path_parts) >= 2 and path_parts[0] == path_parts[1]:
-                # This is a duplicated folder structure
-                parent_folder = os.path.join(base_path, path_parts[0])
-                duplicated_folder = root
-
-                # Check if the parent folder is empty or only contains the duplicated folder
-                parent_contents = os.listdir(parent_folder)
-                if len(parent_contents) == 1 and os.path.isdir(duplicated_folder):
-                    # Move all contents from duplicated_folder to parent_folder
-                    for item in os.listdir(duplicated_folder):
-                        source_path = os.path.join(duplicated_folder, item)
-                        dest_path = os.path.join(parent_folder, item)
-                        import shutil
-
-                        shutil.move(source_path, dest_path)
-
-                    # Remove the empty duplicated folder
-                    import shutil
-
-                    shutil.rmtree(duplicated_folder)
-                    fixed_count += 1
-                    app.logger.info(f"Fixed duplicated folder structure: {rel_path}")
+        # Duplication only ever happens one level deep, so one scandir pass is enough
+        with os.scandir(base_path) as entries:
+            candidates = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+
+        def duplicated_child(entry):
+            # Only fix when the parent folder contains nothing but the duplicated folder; the
+            # child's DirEntry answers is_dir without another stat
+            with os.scandir(entry.path) as children_iter:
+                children = list(itertools.islice(children_iter, 2))
+            if len(children) != 1:
+                return None
+            child = children[0]
+            if child.name != entry.name or not child.is_dir(follow_symlinks=False):
+                return None
+            return child.path
+
+        # Probing is one directory read per folder and latency-bound on network storage, so
+        # the reads overlap; the moves below stay sequential
+        if len(candidates) > 1:
+            max_workers = min(FOLDER_SCAN_MAX_WORKERS, len(candidates))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                duplicated = list(executor.map(duplicated_child, candidates))
+        else:
+            duplicated = [duplicated_child(entry) for entry in candidates]
+
+        for entry, duplicated_folder in zip(candidates, duplicated):
+            if duplicated_folder is None:
+                continue
+
+            # Rename first so an inner item sharing the folder name cannot collide
+            staging_folder = os.path.join(entry.path, f".{entry.name}.dedupe")
+            os.rename(duplicated_folder, staging_folder)
+            for item in os.listdir(staging_folder):
+                shutil.move(os.path.join(staging_folder, item), os.path.join(entry.path, item))
+            os.rmdir(staging_folder)
+            fixed_count += 1
+            app.logger.info(f"Fixed duplicated folder structure: {entry.name}/{entry.name}")
 
         return fixed_count
 
     def extract_gcode_metadata_from_file(file_path):
         metadata = {}
         try:
-            with open(file_path, encoding="utf-8", errors="ignore") as file:
-                metadata = gcode_handler.extract_gcode_metadata(file)
+            metadata = gcode_handler.extract_gcode_metadata_from_path(file_path)
         except Exception as e:
             app.logger.error(f"Error reading G-code file {file_path}: {e}")
         return metadata
@@ -329,6 +701,19 @@ def create_app(config_file=None, config_overrides=None):
         """Get parsed 3MF project data for folder."""
         return db_manager.get_folder_three_mf_projects(folder_name)
 
+    def page_args(sort_by="folder_name", sort_order="asc") -> dict:
+        """Pagination, sort and filter arguments shared by the paginated listings."""
+        args = request.args
+        return {
+            "page": args.get("page", 1, type=int),
+            "per_page": args.get("per_page", 15, type=int),
+            "sort_by": args.get("sort_by", sort_by),
+            "sort_order": args.get("sort_order", sort_order),
+            "filter_text": args.get("filter", ""),
+            "filter_type": args.get("filter_type", "all"),
+            "cursor": args.get("cursor") or None,
+        }
+
     # --- All routes below, using app.config for paths ---
     @app.route("/")
     def index():
@@ -338,39 +723,23 @@ def create_app(config_file=None, config_overrides=None):
     @app.route("/gcode_files")
     def gcode_files_view():
         """Display all G-code files across all folders with links to their parent folders."""
-        # Check if pagination is requested
-        page = request.args.get("page", 1, type=int)
-        per_page = request.args.get("per_page", 15, type=int)
-        sort_by = request.args.get("sort_by", "folder_name")
-        sort_order = request.args.get("sort_order", "asc")
-        filter_text = request.args.get("filter", "")
-        filter_type = request.args.get("filter_type", "all")
-
-        # Get paginated data
-        paginated_data = db_manager.get_gcode_files_paginated(
-            page=page,
-            per_page=per_page,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            filter_text=filter_text,
-            filter_type=filter_type,
-        )
+        kwargs = page_args()
+        # The rendered page links by page number; cursors are only handed out by the API
+        kwargs.pop("cursor")
+        paginated_data = db_manager.get_gcode_files_paginated(**kwargs)
 
         return render_template("gcode_files.html", gcode_files=paginated_data)
 
     @app.route("/folder/<path:folder_name>")
     def folder_view(folder_name):
-        folder_name = folder_name.split("/")[0]
-        stl_files, image_files, pdf_files, gcode_files = get_folder_contents(folder_name)
-        three_mf_projects = get_folder_three_mf_projects(folder_name)
+        folder_name, _, _ = folder_name.partition("/")
+        if not folder_name or ".." in folder_name or folder_name.startswith("."):
+            abort(400)
+        bundle = db_manager.get_folder_bundle(folder_name)
         return render_template(
             "folder_view.html",
             folder_name=folder_name,
-            stl_files=stl_files,
-            image_files=image_files,
-            pdf_files=pdf_files,
-            gcode_files=gcode_files,
-            three_mf_projects=three_mf_projects,
+            **bundle._asdict(),
         )
 
     @app.route("/3mf_plate")
@@ -388,31 +757,179 @@ def create_app(config_file=None, config_overrides=None):
             if not os.path.isfile(abs_path):
                 return "File not found", 404
 
+            # Revalidation hits skip parsing the 3MF project entirely
+            project_stat = os.stat(abs_path)
+            etag = library_file_etag(project_stat, f"plate{plate_index}")
+            last_modified = datetime.fromtimestamp(project_stat.st_mtime, tz=timezone.utc)
+            cached = not_modified_response(etag, last_modified)
+            if cached is not None:
+                return cached
+
+            download_name = (
+                f"{os.path.splitext(os.path.basename(filename))[0]}_plate_{plate_index}.stl"
+            )
+            plate_path = cached_plate_stl_path(filename, plate_index, etag)
+            if os.path.isfile(plate_path):
+                touch_cache_entry(plate_path)
+                return send_cached_plate(plate_path, download_name, etag, last_modified)
+
             parsed = three_mf.load_3mf_project(abs_path)
             triangles = three_mf.get_plate_triangles(parsed, plate_index)
             if not triangles:
                 return "Plate not found or empty", 404
 
-            stl_bytes = three_mf.build_plate_stl_bytes(
-                parsed,
-                plate_index,
-                header_text=f"{os.path.basename(filename)} plate {plate_index}",
-            )
-            return send_file(
-                io.BytesIO(stl_bytes),
-                mimetype="model/stl",
-                as_attachment=False,
-                download_name=f"{os.path.splitext(os.path.basename(filename))[0]}_plate_{plate_index}.stl",
-            )
+            header_text = f"{os.path.basename(filename)} plate {plate_index}"
+            try:
+                write_cached_plate(
+                    plate_path,
+                    three_mf.iter_plate_stl_chunks(parsed, plate_index, header_text=header_text),
+                )
+            except OSError as e:
+                # An unwritable cache directory only costs the reuse; stream the plate instead
+                app.logger.warning(f"Could not cache 3MF plate for {filename}: {e}")
+            else:
+                return send_cached_plate(plate_path, download_name, etag, last_modified)
+
+            total_length = three_mf.compute_plate_stl_length(parsed, plate_index)
+
+            # Viewers probe with Range requests; only honour them while If-Range still matches
+            byte_range = None
+            if request.range and request.range.units == "bytes":
+                if_range = request.if_range
+                if not (if_range.etag or if_range.date) or if_range.etag == etag:
+                    byte_range = request.range.range_for_length(total_length)
+                    if byte_range is None:
+                        response = Response(status=416)
+                        response.headers["Content-Range"] = f"bytes */{total_length}"
+                        return response
+
+            if byte_range is not None:
+                start, stop = byte_range
+                response = Response(
+                    three_mf.iter_plate_stl_range(
+                        parsed, plate_index, start, stop, header_text=header_text
+                    ),
+                    status=206,
+                    mimetype="model/stl",
+                )
+                response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{total_length}"
+                response.content_length = stop - start
+            else:
+                response = Response(
+                    three_mf.iter_plate_stl_chunks(parsed, plate_index, header_text=header_text),
+                    mimetype="model/stl",
+                )
+                response.content_length = total_length
+            response.headers.set("Content-Disposition", "inline", filename=download_name)
+            response.headers["Accept-Ranges"] = "bytes"
+            return apply_library_cache_headers(response, etag, last_modified)
         except Exception as e:
             app.logger.error(f"Error serving 3MF plate for {filename}: {e}")
             return "Failed to parse 3MF project", 500
 
+    def cached_plate_stl_path(filename, plate_index, etag):
+        # One file per (project, plate); the project's stat ETag in the name retires old builds
+        plate_key = hashlib.sha1(f"{filename}\0{plate_index}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(app.config["PLATE_CACHE_PATH"], f"{plate_key}-{etag}.stl")
+
+    def write_cached_plate(plate_path, chunks):
+        cache_dir, plate_name = os.path.split(plate_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        plate_file, tmp_path = open_cache_tmp(cache_dir, plate_name)
+        try:
+            with plate_file:
+                for chunk in chunks:
+                    plate_file.write(chunk)
+            os.replace(tmp_path, plate_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        _prune_cached_versions(
+            cache_dir,
+            plate_name,
+            suffix=".stl",
+            max_bytes=cache_max_bytes(app.config["PLATE_CACHE_MAX_MB"]),
+        )
+
+    def send_cached_plate(plate_path, download_name, etag, last_modified):
+        try:
+            response = send_file(
+                plate_path,
+                mimetype="model/stl",
+                download_name=download_name,
+                conditional=True,
+                etag=etag,
+                last_modified=last_modified,
+            )
+        except RequestedRangeNotSatisfiable as e:
+            # Raised from inside the route's catch-all, so answer the 416 here
+            return e.get_response()
+        return apply_library_cache_headers(response, etag)
+
+    def library_file_etag(stat_result, *extra) -> str:
+        parts = [f"{stat_result.st_mtime_ns:x}", f"{stat_result.st_size:x}", *map(str, extra)]
+        return "-".join(parts)
+
+    def apply_library_cache_headers(response, etag, last_modified=None):
+        # Paths can be overwritten by uploads, so browsers revalidate (cheap 304) instead of
+        # treating the URL as immutable.
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        response.headers["Cache-Control"] = LIBRARY_FILE_CACHE_CONTROL
+        return response
+
+    def not_modified_response(etag, last_modified=None):
+        if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            return None
+        return apply_library_cache_headers(Response(status=304), etag, last_modified)
+
+    def send_library_file(base_path, library_key, filename, mimetype=None):
+        """Send a library file, handing the transfer to nginx when X-Accel-Redirect is configured."""
+        abs_path = safe_join(base_path, filename)
+        try:
+            stat_result = os.stat(abs_path)
+        except OSError:
+            return "File not found", 404
+        if not stat.S_ISREG(stat_result.st_mode):
+            return "File not found", 404
+
+        etag = library_file_etag(stat_result)
+        last_modified = datetime.fromtimestamp(stat_result.st_mtime, tz=timezone.utc)
+        cached = not_modified_response(etag, last_modified)
+        if cached is not None:
+            return cached
+
+        accel_prefixes = app.config.get("X_ACCEL_REDIRECT") or {}
+        accel_prefix = accel_prefixes.get(library_key) if isinstance(accel_prefixes, dict) else None
+        if not accel_prefix:
+            # Hand werkzeug the stat-derived validators so Range/If-Range use the same ETag
+            response = send_from_directory(
+                base_path,
+                filename,
+                mimetype=mimetype,
+                conditional=True,
+                etag=etag,
+                last_modified=last_modified,
+            )
+            return apply_library_cache_headers(response, etag)
+
+        rel_path = os.path.relpath(abs_path, base_path).replace(os.sep, "/")
+        response = Response(
+            mimetype=mimetype or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        )
+        response.headers["X-Accel-Redirect"] = quote(f"{accel_prefix.rstrip('/')}/{rel_path}")
+        return apply_library_cache_headers(response, etag, last_modified)
+
     @app.route("/stl/<path:filename>")
     def serve_stl(filename):
         try:
-            return send_from_directory(
-                app.config["STL_FILES_PATH"], filename, mimetype="application/octet-stream"
+            return send_library_file(
+                app.config["STL_FILES_PATH"],
+                "models",
+                filename,
+                mimetype="application/octet-stream",
             )
         except Exception as e:
             app.logger.error(f"Error serving STL file {filename}: {e}")
@@ -421,7 +938,7 @@ def create_app(config_file=None, config_overrides=None):
     @app.route("/file/<path:filename>")
     def serve_file(filename):
         try:
-            return send_from_directory(app.config["STL_FILES_PATH"], filename)
+            return send_library_file(app.config["STL_FILES_PATH"], "models", filename)
         except Exception as e:
             app.logger.error(f"Error serving file {filename}: {e}")
             return "File not found", 404
@@ -430,17 +947,178 @@ def create_app(config_file=None, config_overrides=None):
     def serve_gcode(base_path, filename):
         if base_path == "STL_BASE_PATH":
             _base_path = app.config["STL_FILES_PATH"]
+            library_key = "models"
         elif base_path == "GCODE_BASE_PATH":
             _base_path = app.config["GCODE_FILES_PATH"]
+            library_key = "gcodes"
         else:
             return "File not found", 404
 
         try:
-            return send_from_directory(_base_path, filename)
+            return send_library_file(_base_path, library_key, filename)
         except Exception as e:
             app.logger.error(f"Error serving G-code file {filename}: {e}")
             return "File not found", 404
 
+    index_refresh_lock = threading.Lock()
+    index_refresh_state = {"future": None, "job_id": 0, "mode": None, "status": {"state": "idle"}}
+
+    def reload_index_counts(mode, moonraker_url, moonraker_client) -> dict:
+        """Rebuild the parts of the index selected by mode ("all", "files" or "stats")."""
+        counts = {}
+        if mode == "all":
+            counts = db_manager.reload_index(
+                app.config["STL_FILES_PATH"],
+                app.config["GCODE_FILES_PATH"],
+                moonraker_url,
+                moonraker_client,
+            )
+            counts["bambu_history_synced"] = sync_bambu_history(cleanup_expired=True)
+        elif mode == "files":
+            counts = db_manager.reload_index(
+                app.config["STL_FILES_PATH"], app.config["GCODE_FILES_PATH"]
+            )
+        else:
+            if moonraker_url:
+                moonraker_counts = db_manager.reload_moonraker_only(
+                    moonraker_url, moonraker_client
+                )
+                counts["moonraker_stats_updated"] = moonraker_counts.get("updated", 0)
+                counts["moonraker_stats_failed"] = moonraker_counts.get("failed", 0)
+            counts["bambu_history_synced"] = sync_bambu_history(cleanup_expired=True)
+        return counts
+
+    def run_index_refresh(job_id, mode, moonraker_url, moonraker_client):
+        with index_refresh_lock:
+            index_refresh_state["status"] = {"state": "running", "job_id": job_id, "mode": mode}
+        try:
+            counts = reload_index_counts(mode, moonraker_url, moonraker_client)
+            status = {"state": "done", "job_id": job_id, "mode": mode, "counts": counts}
+        except Exception as e:
+            app.logger.error(f"Error refreshing index in the background: {e}")
+            status = {"state": "error", "job_id": job_id, "mode": mode, "error": str(e)}
+        invalidate_library_caches()
+        with index_refresh_lock:
+            index_refresh_state["status"] = status
+        return status
+
+    def schedule_index_refresh(mode="all") -> dict:
+        """Queue a background index refresh, coalescing with one that has not started yet."""
+        with index_refresh_lock:
+            future = index_refresh_state["future"]
+            pending = future is not None and not future.running() and not future.done()
+            # A queued full refresh already covers files and stats
+            if pending and index_refresh_state["mode"] in {mode, "all"}:
+                return {"job_id": index_refresh_state["job_id"], "coalesced": True}
+            index_refresh_state["job_id"] += 1
+            job_id = index_refresh_state["job_id"]
+            index_refresh_state["mode"] = mode
+            index_refresh_state["status"] = {"state": "queued", "job_id": job_id, "mode": mode}
+            index_refresh_state["future"] = _INDEX_EXECUTOR.submit(
+                run_index_refresh,
+                job_id,
+                mode,
+                get_enabled_moonraker_url(),
+                get_enabled_moonraker_client(),
+            )
+            return {"job_id": job_id, "coalesced": False}
+
+    def wait_for_index_refresh(timeout=None) -> dict:
+        future = index_refresh_state["future"]
+        if future is not None:
+            future.result(timeout=timeout)
+        with index_refresh_lock:
+            return dict(index_refresh_state["status"])
+
+    @app.route("/api/refresh_status", methods=["GET"])
+    def refresh_status():
+        with index_refresh_lock:
+            status = dict(index_refresh_state["status"])
+        return jsonify({"success": True, "refresh": status})
+
+    def extract_saved_zip(temp_zip_path, filename, source=None) -> dict:
+        """
+        Extract an uploaded zip into its library folder.
+
+        source may be a seekable upload stream read in place; otherwise the zip saved at
+        temp_zip_path is read and deleted afterwards.
+        """
+        folder_name = os.path.splitext(filename)[0]
+        extract_to = os.path.join(app.config["STL_FILES_PATH"], folder_name)
+        folder_exists = os.path.exists(extract_to)
+        try:
+            with zipfile.ZipFile(source or temp_zip_path, "r") as zip_ref:
+                if folder_exists:
+                    if os.path.isdir(extract_to):
+                        shutil.rmtree(extract_to)
+                    else:
+                        os.remove(extract_to)
+                os.makedirs(extract_to, exist_ok=True)
+                extract_zip_members(zip_ref, extract_to, folder_name)
+            return {
+                "filename": filename,
+                "folder_name": folder_name,
+                "status": "success",
+                "folder_existed": folder_exists,
+            }
+        except Exception as e:
+            app.logger.error(f"Error extracting zip file {filename}: {e}")
+            return {
+                "filename": filename,
+                "folder_name": folder_name,
+                "status": "error",
+                "error": str(e),
+            }
+        finally:
+            if temp_zip_path and os.path.exists(temp_zip_path):
+                os.remove(temp_zip_path)
+
+    upload_jobs_lock = threading.Lock()
+    upload_jobs = OrderedDict()
+
+    def run_upload_job(job_id, zip_jobs, refresh_index):
+        with upload_jobs_lock:
+            upload_jobs[job_id]["state"] = "running"
+        results = [extract_saved_zip(temp_zip_path, filename) for temp_zip_path, filename in zip_jobs]
+        status = {"state": "done", "job_id": job_id, "results": results}
+        if refresh_index:
+            status["index_refresh"] = {"success": True, "pending": True, **schedule_index_refresh()}
+        with upload_jobs_lock:
+            upload_jobs[job_id].update(status)
+        return status
+
+    def schedule_upload_job(zip_jobs, refresh_index) -> int:
+        """Extract already-saved zips on the upload pool and refresh the index afterwards."""
+        with upload_jobs_lock:
+            job_id = next(reversed(upload_jobs), 0) + 1
+            upload_jobs[job_id] = {"state": "queued", "job_id": job_id}
+            while len(upload_jobs) > UPLOAD_JOB_HISTORY:
+                upload_jobs.popitem(last=False)
+            upload_jobs[job_id]["future"] = _UPLOAD_EXECUTOR.submit(
+                run_upload_job, job_id, zip_jobs, refresh_index
+            )
+        return job_id
+
+    def get_upload_job_status(job_id):
+        with upload_jobs_lock:
+            job = upload_jobs.get(job_id)
+            if job is None:
+                return None
+            return {key: value for key, value in job.items() if key != "future"}
+
+    def wait_for_upload_job(job_id, timeout=None) -> dict:
+        with upload_jobs_lock:
+            future = upload_jobs[job_id]["future"]
+        future.result(timeout=timeout)
+        return get_upload_job_status(job_id)
+
+    @app.route("/api/upload_status/<int:job_id>", methods=["GET"])
+    def upload_status(job_id):
+        status = get_upload_job_status(job_id)
+        if status is None:
+            return jsonify({"success": False, "error": "Upload job not found"}), 404
+        return jsonify({"success": True, "upload": status})
+
     @app.route("/upload", methods=["POST"])
     def upload():
         allowed_extensions = {".zip", ".3mf", ".gcode", ".stl"}
@@ -470,6 +1148,7 @@ def create_app(config_file=None, config_overrides=None):
         if conflict_action not in {"check", "skip", "overwrite"}:
             conflict_action = "skip"
         refresh_index = parse_bool_form("refresh_index", True)
+        background = parse_bool_form("background", False)
         if "file" not in request.files:
             return jsonify({"error": "No file part"}), 400
         raw_files = request.files.getlist("file")
@@ -488,12 +1167,26 @@ def create_app(config_file=None, config_overrides=None):
         if not files:
             return jsonify({"error": "No files selected"}), 400
 
+        # Every upload target is a direct child of one of the library roots, so one scandir
+        # per root answers all existence checks for the batch.
+        existing_entries = {}
+
+        def target_exists(target_path: str) -> bool:
+            parent, name = os.path.split(target_path)
+            if parent not in existing_entries:
+                try:
+                    with os.scandir(parent) as entries:
+                        existing_entries[parent] = {entry.name for entry in entries}
+                except OSError:
+                    existing_entries[parent] = set()
+            return name in existing_entries[parent]
+
         # Step 1: Check for conflicts if conflict_action is missing or 'check'
         if conflict_action == "check":
             conflicts = []
             for _, filename in files:
                 upload_kind, target_path = upload_target_for(filename)
-                if target_path and os.path.exists(target_path):
+                if target_path and target_exists(target_path):
                     if upload_kind in {"zip", "stl"}:
                         conflicts.append(os.path.splitext(filename)[0])
                     else:
@@ -502,15 +1195,32 @@ def create_app(config_file=None, config_overrides=None):
                 return jsonify({"ask_user": True, "conflicts": conflicts}), 200
             # If no conflicts, proceed as normal (fall through)
 
+        def extract_one_zip(file, filename) -> dict:
+            stream = file.stream
+            if callable(getattr(stream, "seekable", None)) and stream.seekable():
+                # Werkzeug already spooled the body; read the archive from there instead of
+                # copying it into the library first
+                return extract_saved_zip(None, filename, source=stream)
+            temp_zip_path = os.path.join(app.config["STL_FILES_PATH"], filename)
+            file.save(temp_zip_path)
+            return extract_saved_zip(temp_zip_path, filename)
+
         # Step 2: Actually process files (skip/overwrite)
         results = []
+        zip_jobs = []
+        claimed_targets = set()
         for file, filename in files:
             ext = get_extension(filename)
             upload_kind, target_path = upload_target_for(filename)
             item_name = (
                 os.path.splitext(filename)[0] if upload_kind in {"zip", "stl"} else filename
             )
-            item_exists = target_path and os.path.exists(target_path)
+            # A second item in the same batch targeting the same path counts as existing
+            item_exists = target_path and (
+                target_path in claimed_targets or target_exists(target_path)
+            )
+            if target_path:
+                claimed_targets.add(target_path)
 
             # Skip existing items by default. Overwrite only when explicitly requested.
             if conflict_action != "overwrite" and item_exists:
@@ -525,71 +1235,9 @@ def create_app(config_file=None, config_overrides=None):
                 )
                 continue
             if upload_kind == "zip":
-                # Save the zip file temporarily
-                temp_zip_path = os.path.join(app.config["STL_FILES_PATH"], filename)
-                file.save(temp_zip_path)
-                folder_name = os.path.splitext(filename)[0]
-                extract_to = os.path.join(app.config["STL_FILES_PATH"], folder_name)
-                folder_exists = os.path.exists(extract_to)
-                try:
-                    with zipfile.ZipFile(temp_zip_path, "r") as zip_ref:
-                        if folder_exists:
-                            if os.path.isdir(extract_to):
-                                shutil.rmtree(extract_to)
-                            else:
-                                os.remove(extract_to)
-                        os.makedirs(extract_to, exist_ok=True)
-
-                        # Extract to a temporary location first to handle folder duplication
-                        with tempfile.TemporaryDirectory() as temp_dir:
-                            safe_extract(zip_ref, temp_dir)
-
-                            # Check if the extracted content has a folder with the same name as the zip
-                            temp_contents = os.listdir(temp_dir)
-                            if (
-                                len(temp_contents) == 1
-                                and os.path.isdir(os.path.join(temp_dir, temp_contents[0]))
-                                and temp_contents[0] == folder_name
-                            ):
-                                # The zip contains a folder with the same name as the zip file
-                                # Move contents from temp_dir/folder_name to extract_to
-                                source_folder = os.path.join(temp_dir, folder_name)
-                                for item in os.listdir(source_folder):
-                                    source_path = os.path.join(source_folder, item)
-                                    dest_path = os.path.join(extract_to, item)
-                                    shutil.move(source_path, dest_path)
-                            else:
-                                # Normal case: move all contents from temp_dir to extract_to
-                                for item in os.listdir(temp_dir):
-                                    source_path = os.path.join(temp_dir, item)
-                                    dest_path = os.path.join(extract_to, item)
-                                    shutil.move(source_path, dest_path)
-
-                        # Remove __MACOSX folder if present
-                        macosx_path = os.path.join(extract_to, "__MACOSX")
-                        if os.path.exists(macosx_path):
-                            shutil.rmtree(macosx_path, ignore_errors=True)
-                    results.append(
-                        {
-                            "filename": filename,
-                            "folder_name": folder_name,
-                            "status": "success",
-                            "folder_existed": folder_exists,
-                        }
-                    )
-                except Exception as e:
-                    app.logger.error(f"Error extracting zip file {filename}: {e}")
-                    results.append(
-                        {
-                            "filename": filename,
-                            "folder_name": folder_name,
-                            "status": "error",
-                            "error": str(e),
-                        }
-                    )
-                finally:
-                    if os.path.exists(temp_zip_path):
-                        os.remove(temp_zip_path)
+                # Zips are extracted concurrently; keep a slot so results stay in upload order
+                results.append(None)
+                zip_jobs.append((len(results) - 1, file, filename))
             elif upload_kind == "stl" and target_path:
                 try:
                     file_dir = target_path
@@ -652,24 +1300,52 @@ def create_app(config_file=None, config_overrides=None):
                         "error": f"Unsupported file type: {ext}",
                     }
                 )
+        if zip_jobs and background:
+            # Only the request body is read here; extraction and the index refresh that must
+            # follow it run on the upload pool, and clients poll /api/upload_status/<job_id>
+            saved_zips = []
+            for slot, file, filename in zip_jobs:
+                temp_zip_path = os.path.join(app.config["STL_FILES_PATH"], filename)
+                file.save(temp_zip_path)
+                saved_zips.append((temp_zip_path, filename))
+            job_id = schedule_upload_job(saved_zips, refresh_index)
+            for slot, file, filename in zip_jobs:
+                results[slot] = {
+                    "filename": filename,
+                    "folder_name": os.path.splitext(filename)[0],
+                    "status": "queued",
+                    "job_id": job_id,
+                }
+            return (
+                jsonify(
+                    {
+                        "success": True,
+                        "results": results,
+                        "job_id": job_id,
+                        "index_refresh": (
+                            {"success": True, "pending": True}
+                            if refresh_index
+                            else {"success": True, "skipped": True}
+                        ),
+                    }
+                ),
+                202,
+            )
+
+        if zip_jobs:
+            max_workers = min(UPLOAD_EXTRACT_MAX_WORKERS, len(zip_jobs))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    (slot, executor.submit(extract_one_zip, file, filename))
+                    for slot, file, filename in zip_jobs
+                ]
+                for slot, future in futures:
+                    results[slot] = future.result()
+
         # Refresh DB index once after all upload processing is complete (optional).
-        index_refresh = {"success": False}
+        # The refresh runs in the background; clients poll /api/refresh_status for the outcome.
         if refresh_index:
-            try:
-                moonraker_url = get_enabled_moonraker_url()
-                moonraker_client = get_enabled_moonraker_client()
-                counts = db_manager.reload_index(
-                    app.config["STL_FILES_PATH"],
-                    app.config["GCODE_FILES_PATH"],
-                    moonraker_url,
-                    moonraker_client,
-                )
-                bambu_sync = sync_bambu_history(cleanup_expired=True)
-                counts["bambu_history_synced"] = bambu_sync
-                index_refresh = {"success": True, "counts": counts}
-            except Exception as e:
-                app.logger.error(f"Error refreshing index after upload: {e}")
-                index_refresh = {"success": False, "error": str(e)}
+            index_refresh = {"success": True, "pending": True, **schedule_index_refresh()}
         else:
             index_refresh = {"success": True, "skipped": True}
 
@@ -678,13 +1354,40 @@ def create_app(config_file=None, config_overrides=None):
     def allowed_file(filename):
         return filename.lower().endswith((".zip", ".stl", ".3mf", ".gcode"))
 
-    def safe_extract(zip_file, path):
-        """Safely extract zip files to prevent zip slip vulnerabilities."""
-        for member in zip_file.namelist():
-            member_path = os.path.realpath(os.path.join(path, member))
-            if not member_path.startswith(os.path.realpath(path) + os.sep):
+    def extract_zip_members(zip_file, extract_to, wrapper_name):
+        """Extract a zip straight into extract_to, unwrapping a top-level folder named wrapper_name."""
+        members = [
+            info
+            for info in zip_file.infolist()
+            if info.filename.split("/", 1)[0] != "__MACOSX"
+        ]
+        prefix = f"{wrapper_name}/"
+        if not members or not all(info.filename.startswith(prefix) for info in members):
+            prefix = ""
+
+        # Resolve every destination first so the directory tree can be created once up front
+        targets = []
+        directories = set()
+        for info in members:
+            rel_path = info.filename[len(prefix) :]
+            if not rel_path.strip("/"):
+                continue
+            try:
+                dest_path = safe_join(extract_to, rel_path)
+            except Exception:
                 raise Exception("Attempted Path Traversal in Zip File")
-        zip_file.extractall(path)
+            if info.is_dir():
+                directories.add(dest_path)
+            else:
+                directories.add(os.path.dirname(dest_path))
+                targets.append((info, dest_path))
+
+        for directory in sorted(directories):
+            os.makedirs(directory, exist_ok=True)
+
+        for info, dest_path in targets:
+            with zip_file.open(info) as src, open(dest_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, ZIP_STREAM_CHUNK_SIZE)
 
     @app.route("/delete_folder", methods=["POST"])
     def delete_folder():
@@ -697,6 +1400,7 @@ def create_app(config_file=None, config_overrides=None):
         try:
             success = db_manager.delete_folder(folder_name)
             if success:
+                invalidate_library_caches()
                 return jsonify({"success": True}), 200
             else:
                 return jsonify({"success": False, "error": "Folder does not exist."}), 404
@@ -716,39 +1420,98 @@ def create_app(config_file=None, config_overrides=None):
         except Exception as e:
             return "Invalid folder path.", 400
 
+        if folder_path == os.path.normpath(app.config["STL_FILES_PATH"]):
+            return "Invalid folder path.", 400
         if not os.path.isdir(folder_path):
             return "Folder does not exist.", 404
 
-        memory_file = io.BytesIO()
-
-        try:
-            with zipfile.ZipFile(memory_file, "w", zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(folder_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, folder_path)
-                        zipf.write(file_path, arcname)
-            memory_file.seek(0)
+        download_name = f"{os.path.basename(folder_name)}.zip"
+        accel_prefixes = app.config.get("X_ACCEL_REDIRECT") or {}
+        accel_prefix = accel_prefixes.get("archives") if isinstance(accel_prefixes, dict) else None
+        if accel_prefix:
+            # Zip once into the archive cache and let nginx send the file with sendfile(2)
+            try:
+                archive_name = cached_folder_archive(
+                    folder_path,
+                    app.config["ARCHIVE_CACHE_PATH"],
+                    folder_name,
+                    cache_max_bytes(app.config["ARCHIVE_CACHE_MAX_MB"]),
+                )
+            except Exception as e:
+                app.logger.error(f"Error zipping folder: {e}")
+                return "Error creating archive.", 500
+            response = Response(mimetype="application/zip")
+            response.headers["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{archive_name}"
+            response.headers.set("Content-Disposition", "attachment", filename=download_name)
+            return response
+
+        cache_dir = app.config["ARCHIVE_CACHE_PATH"]
+        listing = folder_listing(folder_path)
+        archive_name = folder_archive_name(listing, folder_name)
+        archive_path = os.path.join(cache_dir, archive_name)
+        if os.path.isfile(archive_path):
+            # Unchanged folder: serve the archive built by an earlier download, with Range
+            # and If-None-Match support
+            touch_cache_entry(archive_path)
             return send_file(
-                memory_file,
-                download_name=f"{os.path.basename(folder_name)}.zip",
+                archive_path,
+                mimetype="application/zip",
                 as_attachment=True,
+                download_name=download_name,
+                conditional=True,
             )
-        except Exception as e:
-            app.logger.error(f"Error zipping folder: {e}")
-            return f"Error zipping folder: {e!s}", 500
+
+        def generate():
+            try:
+                yield from iter_zip_folder_cached(
+                    listing,
+                    cache_dir,
+                    archive_name,
+                    cache_max_bytes(app.config["ARCHIVE_CACHE_MAX_MB"]),
+                )
+            except Exception as e:
+                app.logger.error(f"Error zipping folder: {e}")
+                raise
+
+        response = Response(generate(), mimetype="application/zip")
+        response.headers.set("Content-Disposition", "attachment", filename=download_name)
+        return response
+
+    path_cache_lock = threading.Lock()
+    path_cache = {}
+
+    def invalidate_path_cache():
+        with path_cache_lock:
+            path_cache.clear()
+
+    def resolve_library_file(base_path, filename):
+        """Absolute path of an existing file under base_path, or None; memoized briefly."""
+        key = (base_path, filename)
+        now = time.monotonic()
+        with path_cache_lock:
+            cached = path_cache.get(key)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+
+        try:
+            abs_path = safe_join(base_path, filename)
+        except Exception:
+            abs_path = None
+        if abs_path is not None and not os.path.isfile(abs_path):
+            abs_path = None
+
+        with path_cache_lock:
+            if len(path_cache) >= PATH_CACHE_MAX_ENTRIES:
+                path_cache.clear()
+            path_cache[key] = (now + PATH_CACHE_TTL_SECONDS, abs_path)
+        return abs_path
 
     @app.route("/copy_path/<path:filename>", methods=["GET"])
     def copy_path(filename):
-        try:
-            abs_path = safe_join(app.config["STL_FILES_PATH"], filename)
-            if os.path.isfile(abs_path):
-                return jsonify({"path": abs_path})
-            else:
-                return jsonify({"path": ""}), 404
-        except Exception as e:
-            app.logger.error(f"Error copying path: {e}")
-            return jsonify({"path": ""}), 404
+        abs_path = resolve_library_file(app.config["STL_FILES_PATH"], filename)
+        if abs_path:
+            return jsonify({"path": abs_path})
+        return jsonify({"path": ""}), 404
 
     @app.route("/copy_gcode_path/<base_path>/<path:filename>", methods=["GET"])
     def copy_gcode_path(base_path, filename):
@@ -759,30 +1522,16 @@ def create_app(config_file=None, config_overrides=None):
         else:
             return jsonify({"path": ""}), 404
 
-        try:
-            abs_path = safe_join(_base_path, filename)
-            if os.path.isfile(abs_path):
-                return jsonify({"path": abs_path})
-            else:
-                return jsonify({"path": ""}), 404
-        except Exception as e:
-            app.logger.error(f"Error copying G-code path: {e}")
-            return jsonify({"path": ""}), 404
+        abs_path = resolve_library_file(_base_path, filename)
+        if abs_path:
+            return jsonify({"path": abs_path})
+        return jsonify({"path": ""}), 404
 
     @app.route("/moonraker_stats/<path:filename>", methods=["GET"])
     def get_moonraker_stats(filename):
         """Get Moonraker print statistics for a G-code file from database."""
         try:
-            # Get file stats from database
-            all_gcode_files = db_manager.get_all_gcode_files()
-
-            # Find the file with matching name
-            file_stats = None
-            for gcode_file in all_gcode_files:
-                if gcode_file["file_name"] == filename:
-                    file_stats = gcode_file["stats"]
-                    break
-
+            file_stats = db_manager.get_gcode_stats_by_name(filename)
             if file_stats:
                 return jsonify({"success": True, "stats": file_stats})
             else:
@@ -798,9 +1547,9 @@ def create_app(config_file=None, config_overrides=None):
         query_text = request.args.get("q", "").strip()
         search_limit = app.config.get("SEARCH_RESULT_LIMIT", 25)
 
-        filtered_folders = db_manager.search_stl_files(query_text, search_limit)
-
-        total_matches = sum(len(folder["files"]) for folder in filtered_folders)
+        filtered_folders, total_matches = db_manager.search_stl_files_with_total(
+            query_text, search_limit
+        )
         metadata = {"matches": total_matches}
 
         return jsonify({"stl_files": filtered_folders, "metadata": metadata})
@@ -814,84 +1563,111 @@ def create_app(config_file=None, config_overrides=None):
         metadata = {"matches": len(filtered_gcode_files)}
         return jsonify({"gcode_files": filtered_gcode_files, "metadata": metadata})
 
+    def invalidate_library_caches():
+        invalidate_stats_cache()
+        invalidate_path_cache()
+
+    def etag_matches(etag):
+        # Flask-Compress suffixes validators of compressed responses with ":<encoding>"
+        client_etags = request.if_none_match
+        return client_etags.star_tag or any(
+            tag.split(":", 1)[0] == etag for tag in client_etags.as_set(include_weak=True)
+        )
+
+    def library_listing_response(build_payload):
+        """JSON listing revalidated against the library versions and the query string."""
+        # The versions live in the database, so every worker derives the same ETag and a
+        # write through any of them retires it
+        versions = db_manager.library_versions()
+        token = f"{versions.get('files', 0):x}-{versions.get('gcode', 0):x}"
+        etag = generate_etag(f"{token}?{request.query_string.decode()}".encode("utf-8"))
+        if etag_matches(etag):
+            response = Response(status=304)
+        else:
+            try:
+                response = jsonify(build_payload())
+            except ValueError as e:
+                return jsonify({"success": False, "error": str(e)}), 400
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
     @app.route("/api/stl_files")
     def api_stl_files():
         """API endpoint for paginated STL files."""
-        page = request.args.get("page", 1, type=int)
-        per_page = request.args.get("per_page", 15, type=int)
-        sort_by = request.args.get("sort_by", DEFAULT_STL_SORT_BY)
-        sort_order = request.args.get("sort_order", DEFAULT_STL_SORT_ORDER)
-        filter_text = request.args.get("filter", "")
-        filter_type = request.args.get("filter_type", "all")
-
-        paginated_data = db_manager.get_stl_files_paginated(
-            page=page,
-            per_page=per_page,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            filter_text=filter_text,
-            filter_type=filter_type,
-        )
-
-        return jsonify(paginated_data)
+        kwargs = page_args(DEFAULT_STL_SORT_BY, DEFAULT_STL_SORT_ORDER)
+        return library_listing_response(lambda: db_manager.get_stl_files_paginated(**kwargs))
 
     @app.route("/api/gcode_files")
     def api_gcode_files():
         """API endpoint for paginated G-code files."""
-        page = request.args.get("page", 1, type=int)
-        per_page = request.args.get("per_page", 15, type=int)
-        sort_by = request.args.get("sort_by", "folder_name")
-        sort_order = request.args.get("sort_order", "asc")
-        filter_text = request.args.get("filter", "")
-        filter_type = request.args.get("filter_type", "all")
-
-        paginated_data = db_manager.get_gcode_files_paginated(
-            page=page,
-            per_page=per_page,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            filter_text=filter_text,
-            filter_type=filter_type,
+        kwargs = page_args()
+        return library_listing_response(lambda: db_manager.get_gcode_files_paginated(**kwargs))
+
+    stats_cache_lock = threading.Lock()
+    stats_cache = {"generation": 0, "key": None, "expires_at": 0.0, "stats": None}
+
+    def invalidate_stats_cache():
+        with stats_cache_lock:
+            stats_cache["generation"] += 1
+            stats_cache["key"] = None
+
+    def build_stats():
+        # Get file and folder statistics from database
+        db_stats = db_manager.get_stats()
+
+        # Get printing statistics from database
+        printing_stats = db_manager.get_printing_stats()
+
+        # --- Activity Calendar Generation ---
+        # Dense 365-day window with 0 prints for days without activity
+        today = datetime.now().date()
+        calendar_days = activity_calendar_days(today.isoformat())
+        activity_calendar = dict.fromkeys(calendar_days, 0)
+
+        # Fill with data from database, which only returns days inside the window
+        activity_calendar.update(
+            db_manager.get_activity_calendar(since=calendar_days[0], until=calendar_days[-1])
         )
+        # --- End Activity Calendar Generation ---
+
+        return {
+            **db_stats,
+            "printing_stats": printing_stats,
+            "activity_calendar": activity_calendar,
+        }
 
-        return jsonify(paginated_data)
+    def get_cached_stats():
+        """Stats payload reused for STATS_CACHE_TTL_SECONDS or until the index changes."""
+        key = datetime.now().date().isoformat()
+        with stats_cache_lock:
+            if stats_cache["key"] == key and stats_cache["expires_at"] > time.monotonic():
+                return stats_cache["stats"]
+            generation = stats_cache["generation"]
+
+        stats = build_stats()
+        with stats_cache_lock:
+            # Skip storing if a refresh invalidated the cache while we were querying
+            if stats_cache["generation"] == generation:
+                stats_cache["key"] = key
+                stats_cache["expires_at"] = time.monotonic() + STATS_CACHE_TTL_SECONDS
+                stats_cache["stats"] = stats
+        return stats
 
     @app.route("/stats")
     def stats_view():
         """Display comprehensive statistics about files, folders, and printing activity."""
         try:
-            # Get file and folder statistics from database
-            db_stats = db_manager.get_stats()
-
-            # Get printing statistics from database
-            printing_stats = db_manager.get_printing_stats()
-
-            # --- Activity Calendar Generation ---
-            from datetime import datetime, timedelta
-            import collections
-
-            # Initialize activity calendar with 0 prints for each day
-            activity_calendar = collections.OrderedDict()
-            today = datetime.now().date()
-            start_date = today - timedelta(days=364)
-            for i in range(365):
-                day = start_date + timedelta(days=i)
-                activity_calendar[day.strftime("%Y-%m-%d")] = 0
-
-            # Fill with data from database
-            db_activity_data = db_manager.get_activity_calendar()
-            for date_str, count in db_activity_data.items():
-                if date_str in activity_calendar:
-                    activity_calendar[date_str] = count
-            # --- End Activity Calendar Generation ---
-
-            stats = {
-                **db_stats,
-                "printing_stats": printing_stats,
-                "activity_calendar": activity_calendar,
-            }
-
-            return render_template("stats.html", stats=stats)
+            stats = get_cached_stats()
+            body = render_template("stats.html", stats=stats)
+            etag = generate_etag(body.encode("utf-8"))
+            if etag_matches(etag):
+                response = Response(status=304)
+            else:
+                response = app.make_response(body)
+            response.set_etag(etag, weak=True)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
 
         except Exception as e:
             app.logger.error(f"Error generating stats: {e}")
@@ -902,7 +1678,7 @@ def create_app(config_file=None, config_overrides=None):
         return render_template(
             "settings.html",
             printer_volume=get_current_printer_volume(),
-            popular_printers=POPULAR_PRINTERS,
+            popular_printers=popular_printers_payload(),
             library_history_settings=get_library_history_settings(),
             bambu_integration=get_bambu_integration_state(),
             moonraker_integration=get_moonraker_integration_state(),
@@ -915,8 +1691,8 @@ def create_app(config_file=None, config_overrides=None):
                 {
                     "success": True,
                     "printer_volume": get_current_printer_volume(),
-                    "default_printer_volume": DEFAULT_PRINTER_VOLUME,
-                    "popular_printers": POPULAR_PRINTERS,
+                    "default_printer_volume": dict(DEFAULT_PRINTER_VOLUME),
+                    "popular_printers": popular_printers_payload(),
                 }
             )
 
@@ -975,8 +1751,7 @@ def create_app(config_file=None, config_overrides=None):
         if cleanup_trigger not in {"refresh"}:
             return jsonify({"success": False, "error": "Unsupported cleanup trigger"}), 400
 
-        try:
-            current_config = load_config(app.config["CONFIG_FILE_PATH"])
+        def build_updates(current_config):
             library_cfg = current_config.get("library", {})
             if not isinstance(library_cfg, dict):
                 library_cfg = {}
@@ -988,8 +1763,10 @@ def create_app(config_file=None, config_overrides=None):
             history_cfg["ttl_days"] = ttl_days
             history_cfg["cleanup_trigger"] = cleanup_trigger
             library_cfg["history"] = history_cfg
+            return {"library": library_cfg}
 
-            write_config_updates({"library": library_cfg})
+        try:
+            update_config(build_updates)
             return jsonify({"success": True, "history": get_library_history_settings()})
         except Exception as e:
             app.logger.error(f"Error saving library history settings: {e}")
@@ -1001,13 +1778,11 @@ def create_app(config_file=None, config_overrides=None):
             return jsonify({"success": True, "integration": get_bambu_integration_state()})
 
         payload = request.get_json(silent=True) or {}
-        enabled = bool(payload.get("enabled", False))
-        mode = str(payload.get("mode", "cloud")).strip().lower() or "cloud"
-        access_token = str(payload.get("access_token", "")).strip()
-        refresh_token = str(payload.get("refresh_token", "")).strip()
-        region = str(payload.get("region", "global")).strip().lower() or "global"
+        if not isinstance(payload, dict):
+            return jsonify({"success": False, "error": "Invalid settings payload"}), 400
+        settings = BambuIntegrationSettings.from_payload(payload)
 
-        if mode != "cloud":
+        if settings.mode != "cloud":
             return jsonify(
                 {
                     "success": False,
@@ -1015,11 +1790,10 @@ def create_app(config_file=None, config_overrides=None):
                 }
             ), 400
 
-        if enabled and not access_token:
+        if settings.enabled and not settings.access_token:
             return jsonify({"success": False, "error": "Bambu access token is required when enabled"}), 400
 
-        try:
-            current_config = load_config(app.config["CONFIG_FILE_PATH"])
+        def build_updates(current_config):
             integrations = current_config.get("integrations", {})
             if not isinstance(integrations, dict):
                 integrations = {}
@@ -1028,16 +1802,12 @@ def create_app(config_file=None, config_overrides=None):
             if not isinstance(bambu_cfg, dict):
                 bambu_cfg = {}
 
-            bambu_cfg["enabled"] = enabled
-            bambu_cfg["mode"] = mode
-            bambu_cfg["cloud"] = {
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-                "region": region,
-            }
+            bambu_cfg.update(settings.to_config_block())
             integrations["bambu"] = bambu_cfg
+            return {"integrations": integrations}
 
-            write_config_updates({"integrations": integrations})
+        try:
+            update_config(build_updates)
             return jsonify({"success": True, "integration": get_bambu_integration_state()})
         except Exception as e:
             app.logger.error(f"Error saving bambu integration settings: {e}")
@@ -1049,14 +1819,14 @@ def create_app(config_file=None, config_overrides=None):
             return jsonify({"success": True, "integration": get_moonraker_integration_state()})
 
         payload = request.get_json(silent=True) or {}
-        enabled = bool(payload.get("enabled", False))
-        base_url = str(payload.get("base_url", "")).strip()
+        if not isinstance(payload, dict):
+            return jsonify({"success": False, "error": "Invalid settings payload"}), 400
+        settings = MoonrakerIntegrationSettings.from_payload(payload)
 
-        if enabled and not base_url:
+        if settings.enabled and not settings.base_url:
             return jsonify({"success": False, "error": "Moonraker URL is required when enabled"}), 400
 
-        try:
-            current_config = load_config(app.config["CONFIG_FILE_PATH"])
+        def build_updates(current_config):
             integrations = current_config.get("integrations", {})
             if not isinstance(integrations, dict):
                 integrations = {}
@@ -1065,11 +1835,12 @@ def create_app(config_file=None, config_overrides=None):
             if not isinstance(moonraker_cfg, dict):
                 moonraker_cfg = {}
 
-            moonraker_cfg["enabled"] = enabled
-            moonraker_cfg["base_url"] = base_url
+            moonraker_cfg.update(settings.to_config_block())
             integrations["moonraker"] = moonraker_cfg
+            return {"integrations": integrations, "moonraker_url": settings.base_url}
 
-            write_config_updates({"integrations": integrations, "moonraker_url": base_url})
+        try:
+            update_config(build_updates)
 
             return jsonify({"success": True, "integration": get_moonraker_integration_state()})
         except Exception as e:
@@ -1099,32 +1870,15 @@ def create_app(config_file=None, config_overrides=None):
             if mode not in {"all", "files", "stats"}:
                 return jsonify({"success": False, "error": "Invalid reload mode"}), 400
 
-            counts = {}
-            if mode == "all":
-                stl_base_path = app.config["STL_FILES_PATH"]
-                gcode_base_path = app.config["GCODE_FILES_PATH"]
-
-                moonraker_url = get_enabled_moonraker_url()
-                moonraker_client = get_enabled_moonraker_client()
-                counts = db_manager.reload_index(
-                    stl_base_path, gcode_base_path, moonraker_url, moonraker_client
-                )
-                counts["bambu_history_synced"] = sync_bambu_history(cleanup_expired=True)
-            elif mode == "files":
-                stl_base_path = app.config["STL_FILES_PATH"]
-                gcode_base_path = app.config["GCODE_FILES_PATH"]
-                counts = db_manager.reload_index(stl_base_path, gcode_base_path)
-            else:
-                moonraker_url = get_enabled_moonraker_url()
-                moonraker_client = get_enabled_moonraker_client()
-                if moonraker_url:
-                    moonraker_counts = db_manager.reload_moonraker_only(
-                        moonraker_url, moonraker_client
-                    )
-                    counts["moonraker_stats_updated"] = moonraker_counts.get("updated", 0)
-                    counts["moonraker_stats_failed"] = moonraker_counts.get("failed", 0)
-                counts["bambu_history_synced"] = sync_bambu_history(cleanup_expired=True)
+            if request.args.get("background", "").strip().lower() in {"1", "true", "yes"}:
+                # Large libraries take minutes to walk; poll /api/refresh_status instead
+                job = schedule_index_refresh(mode)
+                return jsonify({"success": True, "pending": True, **job}), 202
 
+            counts = reload_index_counts(
+                mode, get_enabled_moonraker_url(), get_enabled_moonraker_client()
+            )
+            invalidate_library_caches()
             return jsonify(
                 {"success": True, "message": "Index reloaded successfully", "counts": counts}
             ), 200
@@ -1154,13 +1908,14 @@ def create_app(config_file=None, config_overrides=None):
             f"Calling Moonraker integration queue with: filenames={filenames}, reset={reset}"
         )
         success = integration.queue_jobs(runtime_config, filenames, reset)
-        app.logger.debug(f"Moonraker integration queue result: {success}")
+        app.logger.debug("Moonraker integration queue result: %s", success)
         if not success:
             return jsonify({"error": "Failed to add files to Moonraker queue"}), 502
         return jsonify({"result": "ok"})
 
     # Attach helpers for testing
     app.get_stl_files = get_stl_files
+    app.fix_duplicated_folders = fix_duplicated_folders
     app.extract_gcode_metadata_from_file = extract_gcode_metadata_from_file
     app.get_folder_contents = get_folder_contents
     app.get_folder_three_mf_projects = get_folder_three_mf_projects
@@ -1170,15 +1925,33 @@ def create_app(config_file=None, config_overrides=None):
     app.get_bambu_integration_state = get_bambu_integration_state
     app.get_moonraker_integration_state = get_moonraker_integration_state
     app.allowed_file = allowed_file
-    app.safe_extract = safe_extract
+    app.extract_zip_members = extract_zip_members
+    app.wait_for_index_refresh = wait_for_index_refresh
+    app.wait_for_upload_job = wait_for_upload_job
+    app.invalidate_stats_cache = invalidate_stats_cache
+    app.invalidate_path_cache = invalidate_path_cache
+    app.invalidate_library_caches = invalidate_library_caches
     app.safe_join = safe_join
     app.load_config = load_config
+    app.update_config = update_config
+    app.write_config_updates = write_config_updates
 
     return app
 
 
+_app = None
+
+
+def get_app():
+    """Return the process-wide app, creating it on first use."""
+    global _app
+    if _app is None:
+        _app = create_app()
+    return _app
+
+
 if __name__ == "__main__":
-    app = create_app()
+    app = get_app()
     logger.info(
         f"STL files: {app.config['STL_FILES_PATH']}, GCODE files: {app.config['GCODE_FILES_PATH']}"
     )
@@ -1187,6 +1960,6 @@ if __name__ == "__main__":
         app.run(host="0.0.0.0", port=app.config.get("PORT", 8969), debug=False)
     else:
         app.run()
-
-# Create global app instance for gunicorn
-app = create_app()
+elif os.environ.get("GUNICORN_CMD_ARGS"):
+    # Keep "gunicorn app:app" working; run.sh uses the "app:get_app()" factory instead
+    app = get_app()
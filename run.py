@@ -3,7 +3,7 @@ import os
 import gunicorn.app.base
 import yaml
 
-from app import app
+from app import get_app
 
 
 class GunicornApp(gunicorn.app.base.BaseApplication):
@@ -27,7 +27,7 @@ if __name__ == "__main__":
     # Read config.yaml file
     if os.path.exists(config_file):
         with open(config_file) as file:
-            config_data = yaml.safe_load(file)
+            config_data = yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
     else:
         raise FileNotFoundError("config.yaml not found in the local directory.")
 
@@ -40,9 +40,11 @@ if __name__ == "__main__":
         "bind": f"0.0.0.0:{config_data.get('port', 8969)}",
         "workers": config_data.get("workers", 1),
         "threads": config_data.get("threads", 2),
+        "worker_class": config_data.get("worker_class", "gthread"),
+        "worker_connections": config_data.get("worker_connections", 1000),
         "loglevel": config_data["log_level"],
         "logfile": config_data.get("log_file", "trinetra.log"),
     }
 
     # Start Gunicorn with the Flask app
-    GunicornApp(app, options).run()
+    GunicornApp(get_app(), options).run()
@@ -11,6 +11,13 @@ fi
 PYTHON_RUNTIME=$1
 CONFIG_FILE=${2:-${CONFIG_FILE:-config.yaml}}
 LOG_FILE=${TRINETRA_LOG_FILE:-trinetra.log}
+# Worker model: the default threaded worker needs no extra packages. With the
+# gevent extra installed, TRINETRA_WORKER_CLASS=gevent lets slow connector calls
+# (Moonraker/Bambu refreshes) wait without holding up other requests.
+WORKER_CLASS=${TRINETRA_WORKER_CLASS:-gthread}
+WORKERS=${TRINETRA_WORKERS:-1}
+THREADS=${TRINETRA_THREADS:-2}
+WORKER_CONNECTIONS=${TRINETRA_WORKER_CONNECTIONS:-1000}
 
 echo "Loading from config: "$CONFIG_FILE
 
@@ -28,8 +35,9 @@ fi
 
 # Run Gunicorn using the specified Python runtime and config file
 "$PYTHON_RUNTIME" -m gunicorn \
-  -w 1 --threads 2 \
-  -b 0.0.0.0:8969 app:app \
+  -k "$WORKER_CLASS" -w "$WORKERS" --threads "$THREADS" \
+  --worker-connections "$WORKER_CONNECTIONS" \
+  -b 0.0.0.0:8969 'app:get_app()' \
   --log-level "$LOG_LEVEL" \
   --env "CONFIG_FILE=$CONFIG_FILE" \
   --log-file "$LOG_FILE"
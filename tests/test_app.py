@@ -6,10 +6,13 @@ Covers all routes, error cases, and edge conditions
 import os
 import tempfile
 import shutil
+import stat
+import threading
 import zipfile
+import zlib
 import json
 import yaml
-from unittest.mock import patch, MagicMock, mock_open, Mock
+from unittest.mock import patch, mock_open, Mock
 from io import BytesIO
 
 import pytest
@@ -30,6 +33,10 @@ configure_logging(test_config)
 logger = get_logger(__name__)
 
 from app import create_app
+from trinetra.database import DatabaseManager
+from trinetra.integrations.bambu.types import BambuIntegrationSettings
+from trinetra.integrations.moonraker.types import MoonrakerIntegrationSettings
+from trinetra.integrations.registry import get_printer_integration
 
 
 class TestAppRoutes:
@@ -46,6 +53,10 @@ class TestAppRoutes:
         self.config = {
             "base_path": self.stl_path,
             "gcode_path": self.gcode_path,
+            "database_path": os.path.join(self.temp_dir, "trinetra.db"),
+            # Keep regenerable caches out of the working tree and the user cache dir
+            "archive_cache_path": os.path.join(self.temp_dir, "archives"),
+            "plate_cache_path": os.path.join(self.temp_dir, "plates"),
             "log_level": "INFO",
             "search_result_limit": 25,
             "moonraker_url": "http://localhost:7125",
@@ -88,6 +99,27 @@ class TestAppRoutes:
         assert os.path.isdir(app.config["STL_FILES_PATH"])
         assert os.path.isdir(app.config["GCODE_FILES_PATH"])
         assert os.path.isdir(os.path.dirname(app.config["DATABASE_PATH"]))
+        assert app.config["ARCHIVE_CACHE_PATH"] == os.path.join(
+            os.path.abspath(single_root), "system", "archives"
+        )
+
+    def test_legacy_paths_keep_caches_out_of_working_directory(self, monkeypatch):
+        """Legacy configs put regenerable caches in the user cache dir, not next to a CWD db."""
+        cache_home = os.path.join(self.temp_dir, "xdg-cache")
+        monkeypatch.setenv("XDG_CACHE_HOME", cache_home)
+        monkeypatch.chdir(self.temp_dir)
+        app = create_app(
+            config_overrides={
+                "base_path": self.stl_path,
+                "gcode_path": self.gcode_path,
+                "log_level": "INFO",
+                "mode": "DEV",
+            }
+        )
+
+        archive_path = app.config["ARCHIVE_CACHE_PATH"]
+        assert archive_path.startswith(os.path.join(cache_home, "trinetra") + os.sep)
+        assert os.path.basename(archive_path) == "archives"
 
     def test_index_route(self):
         """Test the index route"""
@@ -113,6 +145,16 @@ class TestAppRoutes:
         response = self.client.get("/folder/test_folder")
         assert response.status_code == 200
 
+        response = self.client.get("/folder/test_folder/nested/deeper")
+        assert response.status_code == 200
+
+    def test_folder_view_rejects_hidden_and_parent_names(self):
+        for url in ["/folder/..", "/folder/.hidden", "/folder/..%2Fetc"]:
+            response = self.client.get(url)
+            assert response.status_code in (400, 404), url
+        assert self.client.get("/folder/.hidden").status_code == 400
+        assert self.client.get("/folder/a..b").status_code == 400
+
     def test_serve_stl_route(self):
         """Test serving STL files"""
         # Create a test STL file
@@ -129,6 +171,92 @@ class TestAppRoutes:
         response = self.client.get("/stl/nonexistent.stl")
         assert response.status_code == 404
 
+    def test_serve_stl_route_revalidates_with_etag(self):
+        """Library files carry an ETag and answer matching revalidations with 304."""
+        stl_file = os.path.join(self.stl_path, "cached.stl")
+        with open(stl_file, "w") as f:
+            f.write("dummy stl content")
+
+        response = self.client.get("/stl/cached.stl")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert "no-cache" in response.headers["Cache-Control"]
+
+        cached = self.client.get("/stl/cached.stl", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.data == b""
+
+        with open(stl_file, "w") as f:
+            f.write("updated stl content, longer")
+        changed = self.client.get("/stl/cached.stl", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+    def test_serve_file_route_honours_if_modified_since_and_range(self):
+        """Stat-derived Last-Modified drives 304s and the same ETag validates Range requests."""
+        pdf_file = os.path.join(self.stl_path, "manual.pdf")
+        with open(pdf_file, "wb") as f:
+            f.write(b"0123456789")
+
+        response = self.client.get("/file/manual.pdf")
+        assert response.status_code == 200
+        last_modified = response.headers["Last-Modified"]
+        etag = response.headers["ETag"]
+
+        cached = self.client.get("/file/manual.pdf", headers={"If-Modified-Since": last_modified})
+        assert cached.status_code == 304
+
+        partial = self.client.get(
+            "/file/manual.pdf", headers={"Range": "bytes=2-5", "If-Range": etag}
+        )
+        assert partial.status_code == 206
+        assert partial.data == b"2345"
+        assert partial.headers["ETag"] == etag
+
+    def test_serve_3mf_plate_revalidation_skips_parsing(self):
+        three_mf_file = os.path.join(self.stl_path, "cached.3mf")
+        with zipfile.ZipFile(three_mf_file, "w") as archive:
+            archive.writestr("3D/3dmodel.model", "<model/>")
+
+        with patch("app.three_mf.load_3mf_project") as mock_load:
+            mock_load.return_value = {"plates": []}
+            first = self.client.get("/3mf_plate?file=cached.3mf&plate=1")
+            assert first.status_code == 404
+
+        stat_result = os.stat(three_mf_file)
+        etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}-plate1"'
+        with patch("app.three_mf.load_3mf_project") as mock_load:
+            response = self.client.get(
+                "/3mf_plate?file=cached.3mf&plate=1", headers={"If-None-Match": etag}
+            )
+        assert response.status_code == 304
+        mock_load.assert_not_called()
+
+    def test_serve_routes_use_x_accel_redirect_when_configured(self):
+        """Configured nginx prefixes should replace the body with an X-Accel-Redirect header."""
+        self.app.config["X_ACCEL_REDIRECT"] = {
+            "models": "/_protected_models/",
+            "gcodes": "/_protected_gcodes",
+        }
+        os.makedirs(os.path.join(self.stl_path, "my project"), exist_ok=True)
+        with open(os.path.join(self.stl_path, "my project", "part.stl"), "w") as f:
+            f.write("dummy stl content")
+        with open(os.path.join(self.gcode_path, "job.gcode"), "w") as f:
+            f.write(";FLAVOR:Marlin\n")
+
+        response = self.client.get("/stl/my project/part.stl")
+        assert response.status_code == 200
+        assert response.headers["X-Accel-Redirect"] == "/_protected_models/my%20project/part.stl"
+        assert response.mimetype == "application/octet-stream"
+        assert response.data == b""
+
+        response = self.client.get("/gcode/GCODE_BASE_PATH/job.gcode")
+        assert response.status_code == 200
+        assert response.headers["X-Accel-Redirect"] == "/_protected_gcodes/job.gcode"
+
+        assert self.client.get("/stl/missing.stl").status_code == 404
+        assert self.client.get("/stl/../outside.stl").status_code == 404
+
     def test_serve_3mf_plate_route(self):
         """Test serving a generated STL for a plate inside a 3MF project."""
         model_xml = """<?xml version="1.0" encoding="UTF-8"?>
@@ -162,6 +290,109 @@ class TestAppRoutes:
         assert response.mimetype == "model/stl"
         # Binary STL header (80 bytes + 4-byte face count)
         assert len(response.data) > 84
+        assert response.content_length == len(response.data)
+        assert response.headers["Accept-Ranges"] == "bytes"
+
+        full_body = response.data
+        partial = self.client.get(
+            "/3mf_plate?file=simple.3mf&plate=1", headers={"Range": "bytes=80-99"}
+        )
+        assert partial.status_code == 206
+        assert partial.data == full_body[80:100]
+        assert partial.headers["Content-Range"] == f"bytes 80-99/{len(full_body)}"
+
+        unsatisfiable = self.client.get(
+            "/3mf_plate?file=simple.3mf&plate=1",
+            headers={"Range": f"bytes={len(full_body)}-"},
+        )
+        assert unsatisfiable.status_code == 416
+
+        stale = self.client.get(
+            "/3mf_plate?file=simple.3mf&plate=1",
+            headers={"Range": "bytes=0-9", "If-Range": '"stale"'},
+        )
+        assert stale.status_code == 200
+        assert stale.data == full_body
+
+    def test_serve_3mf_plate_reuses_cached_stl(self):
+        """Plate STLs are built once per project version and then sent from disk."""
+        plate_dir = os.path.join(self.temp_dir, "plates")
+        self.app.config["PLATE_CACHE_PATH"] = plate_dir
+        three_mf_file = os.path.join(self.stl_path, "reuse.3mf")
+        with zipfile.ZipFile(three_mf_file, "w") as archive:
+            archive.writestr("3D/3dmodel.model", "<model/>")
+        parsed = {
+            "plates": [
+                {"index": 1, "triangles": [((0, 0, 0), (10, 0, 0), (0, 10, 0))]},
+            ]
+        }
+
+        import app as app_module
+
+        with patch("app.three_mf.load_3mf_project", return_value=parsed) as mock_load, patch(
+            "app.open_cache_tmp", wraps=app_module.open_cache_tmp
+        ) as mock_tmp:
+            first = self.client.get("/3mf_plate?file=reuse.3mf&plate=1")
+            assert first.status_code == 200
+            body = first.get_data()
+            first.close()
+            # Built in a per-writer temp file, never one shared by name across workers
+            mock_tmp.assert_called_once()
+            second = self.client.get("/3mf_plate?file=reuse.3mf&plate=1")
+            assert second.get_data() == body
+            assert second.headers["ETag"] == first.headers["ETag"]
+            assert "reuse_plate_1.stl" in second.headers["Content-Disposition"]
+            second.close()
+        assert mock_load.call_count == 1
+        assert len(os.listdir(plate_dir)) == 1
+
+        stat_result = os.stat(three_mf_file)
+        os.utime(three_mf_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000))
+        with patch("app.three_mf.load_3mf_project", return_value=parsed) as mock_load:
+            rebuilt = self.client.get("/3mf_plate?file=reuse.3mf&plate=1")
+            assert rebuilt.status_code == 200
+            rebuilt.close()
+        mock_load.assert_called_once()
+        # The build for the old project version was replaced, not kept alongside
+        (cached_plate,) = os.listdir(plate_dir)
+        etag = rebuilt.headers["ETag"].strip('"')
+        assert cached_plate.endswith(f"-{etag}.stl")
+
+    def test_serve_3mf_plate_cache_is_size_bounded(self):
+        """Plate builds beyond the cache budget evict the least recently used ones."""
+        plate_dir = self.app.config["PLATE_CACHE_PATH"]
+        parsed = {
+            "plates": [
+                {"index": 1, "triangles": [((0, 0, 0), (10, 0, 0), (0, 10, 0))] * 50},
+            ]
+        }
+        for name in ("first.3mf", "second.3mf", "third.3mf"):
+            with zipfile.ZipFile(os.path.join(self.stl_path, name), "w") as archive:
+                archive.writestr("3D/3dmodel.model", "<model/>")
+
+        # Each 50-triangle plate is 2584 bytes; leave room for two of them
+        self.app.config["PLATE_CACHE_MAX_MB"] = 6000 / (1024 * 1024)
+        with patch("app.three_mf.load_3mf_project", return_value=parsed):
+            for name in ("first.3mf", "second.3mf"):
+                response = self.client.get(f"/3mf_plate?file={name}&plate=1")
+                assert response.status_code == 200
+                response.close()
+            for plate_name in os.listdir(plate_dir):
+                os.utime(os.path.join(plate_dir, plate_name), ns=(1, 1))
+            # Reusing the first plate makes the second one the eviction candidate
+            self.client.get("/3mf_plate?file=first.3mf&plate=1").close()
+            before = set(os.listdir(plate_dir))
+            self.client.get("/3mf_plate?file=third.3mf&plate=1").close()
+
+        after = set(os.listdir(plate_dir))
+        assert len(after) == 2
+        evicted = before - after
+        assert len(evicted) == 1
+        with patch("app.three_mf.load_3mf_project", return_value=parsed) as mock_load:
+            self.client.get("/3mf_plate?file=first.3mf&plate=1").close()
+            mock_load.assert_not_called()
+            self.client.get("/3mf_plate?file=second.3mf&plate=1").close()
+            mock_load.assert_called_once()
 
     def test_api_stl_files_includes_three_mf_projects(self):
         """Home API should include 3MF project previews for virtual/root projects."""
@@ -334,6 +565,118 @@ class TestAppRoutes:
         data = json.loads(response.data)
         assert data["success"] is True
 
+    def test_upload_route_zip_unwraps_matching_folder(self):
+        """A zip wrapping everything in a folder named like the zip should not nest twice."""
+        zip_data = BytesIO()
+        with zipfile.ZipFile(zip_data, "w") as zipf:
+            zipf.writestr("wrapped/", "")
+            zipf.writestr("wrapped/parts/body.stl", "solid body\nendsolid body\n")
+            zipf.writestr("wrapped/readme.txt", "notes")
+            zipf.writestr("__MACOSX/wrapped/._readme.txt", "junk")
+        zip_data.seek(0)
+
+        response = self.client.post("/upload", data={"file": (zip_data, "wrapped.zip")})
+        assert response.status_code == 200
+        payload = json.loads(response.data)
+        assert payload["results"][0]["status"] == "success"
+
+        extract_to = os.path.join(self.stl_path, "wrapped")
+        assert os.path.isfile(os.path.join(extract_to, "parts", "body.stl"))
+        assert os.path.isfile(os.path.join(extract_to, "readme.txt"))
+        assert not os.path.exists(os.path.join(extract_to, "wrapped"))
+        assert not os.path.exists(os.path.join(extract_to, "__MACOSX"))
+        assert not os.path.exists(os.path.join(self.stl_path, "wrapped.zip"))
+
+    def test_upload_route_multiple_zips_keep_result_order(self):
+        """Zips extracted concurrently should report results in upload order."""
+        uploads = []
+        for index in range(4):
+            zip_data = BytesIO()
+            with zipfile.ZipFile(zip_data, "w") as zipf:
+                zipf.writestr(f"part_{index}.stl", "solid x\nendsolid x\n")
+            zip_data.seek(0)
+            uploads.append((zip_data, f"pack_{index}.zip"))
+        uploads.insert(2, (BytesIO(b";FLAVOR:Marlin\nG28 ;Home\n"), "between.gcode"))
+
+        response = self.client.post("/upload", data={"file": uploads})
+        assert response.status_code == 200
+        payload = json.loads(response.data)
+        assert [result["filename"] for result in payload["results"]] == [
+            "pack_0.zip",
+            "pack_1.zip",
+            "between.gcode",
+            "pack_2.zip",
+            "pack_3.zip",
+        ]
+        assert all(result["status"] == "success" for result in payload["results"])
+        for index in range(4):
+            assert os.path.isfile(os.path.join(self.stl_path, f"pack_{index}", f"part_{index}.stl"))
+
+    def test_upload_route_background_extracts_zips_off_request(self):
+        """With background=true, zips are queued and extracted by an upload job."""
+        zip_data = BytesIO()
+        with zipfile.ZipFile(zip_data, "w") as zipf:
+            zipf.writestr("inside.stl", "solid x\nendsolid x\n")
+        zip_data.seek(0)
+        data = {
+            "file": [(zip_data, "queued_pack.zip"), (BytesIO(b"dummy 3mf"), "inline.3mf")],
+            "background": "true",
+        }
+
+        with patch.object(
+            self.app.config["DB_MANAGER"], "reload_index", return_value={}
+        ) as mock_reload:
+            response = self.client.post("/upload", data=data)
+            assert response.status_code == 202
+            payload = json.loads(response.data)
+            job_id = payload["job_id"]
+            assert [result["status"] for result in payload["results"]] == ["queued", "success"]
+            assert payload["results"][0]["job_id"] == job_id
+
+            job = self.app.wait_for_upload_job(job_id, timeout=10)
+            self.app.wait_for_index_refresh(timeout=10)
+
+        assert job["state"] == "done"
+        assert job["results"][0]["status"] == "success"
+        assert job["index_refresh"]["pending"] is True
+        mock_reload.assert_called_once()
+        assert os.path.isfile(os.path.join(self.stl_path, "queued_pack", "inside.stl"))
+        assert not os.path.exists(os.path.join(self.stl_path, "queued_pack.zip"))
+
+        status_response = self.client.get(f"/api/upload_status/{job_id}")
+        assert status_response.status_code == 200
+        assert json.loads(status_response.data)["upload"]["state"] == "done"
+        assert self.client.get(f"/api/upload_status/{job_id + 1000}").status_code == 404
+
+    def test_upload_route_zip_extracts_from_upload_stream(self):
+        """Seekable upload bodies are read in place rather than copied into the library."""
+        zip_data = BytesIO()
+        with zipfile.ZipFile(zip_data, "w") as zipf:
+            zipf.writestr("part.stl", "solid x\nendsolid x\n")
+        zip_data.seek(0)
+
+        with patch("werkzeug.datastructures.FileStorage.save") as mock_save:
+            response = self.client.post("/upload", data={"file": (zip_data, "streamed.zip")})
+
+        assert response.status_code == 200
+        assert json.loads(response.data)["results"][0]["status"] == "success"
+        mock_save.assert_not_called()
+        assert os.path.isfile(os.path.join(self.stl_path, "streamed", "part.stl"))
+
+    def test_upload_route_zip_rejects_path_traversal(self):
+        """Zip members escaping the target folder should fail that upload item."""
+        zip_data = BytesIO()
+        with zipfile.ZipFile(zip_data, "w") as zipf:
+            zipf.writestr("../escaped.stl", "solid x\nendsolid x\n")
+        zip_data.seek(0)
+
+        response = self.client.post("/upload", data={"file": (zip_data, "evil.zip")})
+        assert response.status_code == 200
+        payload = json.loads(response.data)
+        assert payload["results"][0]["status"] == "error"
+        assert "Path Traversal" in payload["results"][0]["error"]
+        assert not os.path.exists(os.path.join(self.stl_path, "escaped.stl"))
+
     def test_upload_route_success_3mf(self):
         """Test successful direct 3MF file upload."""
         data = {"file": (BytesIO(b"dummy 3mf bytes"), "single_model.3mf")}
@@ -404,6 +747,27 @@ class TestAppRoutes:
         assert payload.get("ask_user") is True
         assert "existing_model.3mf" in payload.get("conflicts", [])
 
+    def test_upload_route_conflict_check_spans_both_library_roots(self):
+        """Conflict check should detect existing folders and G-code files in one pass."""
+        os.makedirs(os.path.join(self.stl_path, "existing_pack"), exist_ok=True)
+        with open(os.path.join(self.gcode_path, "existing_job.gcode"), "w") as f:
+            f.write(";FLAVOR:Marlin\n")
+
+        data = {
+            "file": [
+                (BytesIO(b"zip bytes"), "existing_pack.zip"),
+                (BytesIO(b";FLAVOR:Marlin\n"), "existing_job.gcode"),
+                (BytesIO(b";FLAVOR:Marlin\n"), "fresh_job.gcode"),
+            ],
+            "conflict_action": "check",
+        }
+        with patch("app.os.path.exists", side_effect=AssertionError("per-file stat")):
+            response = self.client.post("/upload", data=data)
+        assert response.status_code == 200
+        payload = json.loads(response.data)
+        assert payload.get("ask_user") is True
+        assert payload["conflicts"] == ["existing_pack", "existing_job.gcode"]
+
     def test_upload_route_triggers_single_reload_after_mixed_batch(self):
         """A mixed upload batch should trigger one DB reload after all processing."""
         zip_data = BytesIO()
@@ -425,11 +789,14 @@ class TestAppRoutes:
             return_value={"folders": 1, "stl_files": 1, "gcode_files": 1},
         ) as mock_reload:
             response = self.client.post("/upload", data=data)
+            refresh_status = self.app.wait_for_index_refresh(timeout=10)
 
         assert response.status_code == 200
         payload = json.loads(response.data)
         assert payload["success"] is True
         assert payload.get("index_refresh", {}).get("success") is True
+        assert payload.get("index_refresh", {}).get("pending") is True
+        assert refresh_status["state"] == "done"
         mock_reload.assert_called_once()
 
     def test_upload_route_refresh_index_false_skips_reload(self):
@@ -455,14 +822,28 @@ class TestAppRoutes:
             self.app.config["DB_MANAGER"], "reload_index", side_effect=RuntimeError("reload failed")
         ) as mock_reload:
             response = self.client.post("/upload", data=data)
+            self.app.wait_for_index_refresh(timeout=10)
 
         assert response.status_code == 200
         payload = json.loads(response.data)
         assert payload["success"] is True
-        assert payload.get("index_refresh", {}).get("success") is False
-        assert "reload failed" in payload.get("index_refresh", {}).get("error", "")
+        assert payload.get("index_refresh", {}).get("pending") is True
         mock_reload.assert_called_once()
 
+        status_response = self.client.get("/api/refresh_status")
+        assert status_response.status_code == 200
+        refresh = json.loads(status_response.data)["refresh"]
+        assert refresh["state"] == "error"
+        assert "reload failed" in refresh["error"]
+        assert refresh["job_id"] == payload["index_refresh"]["job_id"]
+
+    def test_refresh_status_idle_before_any_upload(self):
+        response = self.client.get("/api/refresh_status")
+        assert response.status_code == 200
+        payload = json.loads(response.data)
+        assert payload["success"] is True
+        assert payload["refresh"]["state"] == "idle"
+
     def test_delete_folder_route_no_folder_name(self):
         """Test delete folder route with no folder name"""
         response = self.client.post("/delete_folder", json={})
@@ -505,6 +886,215 @@ class TestAppRoutes:
         response = self.client.get("/download_folder?folder_name=test_folder")
         assert response.status_code == 200
         assert response.mimetype == "application/zip"
+        assert "test_folder.zip" in response.headers["Content-Disposition"]
+
+    def test_download_folder_route_streams_valid_archive(self):
+        """Streamed folder downloads should produce a complete, readable archive."""
+        test_folder = os.path.join(self.stl_path, "stream_folder")
+        os.makedirs(os.path.join(test_folder, "parts"), exist_ok=True)
+        large_payload = os.urandom(3 * 1024 * 1024)
+        with open(os.path.join(test_folder, "parts", "large.bin"), "wb") as f:
+            f.write(large_payload)
+        with open(os.path.join(test_folder, "notes.txt"), "w") as f:
+            f.write("test content")
+
+        response = self.client.get("/download_folder?folder_name=stream_folder")
+        assert response.status_code == 200
+        assert response.is_streamed
+
+        with zipfile.ZipFile(BytesIO(response.get_data())) as zipf:
+            assert zipf.testzip() is None
+            assert sorted(zipf.namelist()) == ["notes.txt", "parts/large.bin"]
+            assert zipf.read("parts/large.bin") == large_payload
+            assert zipf.read("notes.txt") == b"test content"
+
+    def test_iter_folder_files_walks_nested_dirs_without_following_symlinks(self):
+        """The scandir walker yields every regular file once and skips linked directories."""
+        import app as app_module
+
+        root = os.path.join(self.stl_path, "walk_folder")
+        os.makedirs(os.path.join(root, "a", "b"), exist_ok=True)
+        for rel in ("top.stl", "a/mid.stl", "a/b/deep.stl"):
+            with open(os.path.join(root, rel), "w") as f:
+                f.write(rel)
+        outside = os.path.join(self.temp_dir, "outside")
+        os.makedirs(outside, exist_ok=True)
+        with open(os.path.join(outside, "secret.stl"), "w") as f:
+            f.write("secret")
+        os.symlink(outside, os.path.join(root, "linked"))
+
+        walked = app_module.iter_folder_files(root)
+        files = {arcname: (path, st) for path, arcname, st in walked}
+        assert sorted(files) == ["a/b/deep.stl", "a/mid.stl", "top.stl"]
+        deep_path, deep_stat = files["a/b/deep.stl"]
+        assert deep_path == os.path.join(root, "a", "b", "deep.stl")
+        assert deep_stat.st_size == len("a/b/deep.stl")
+
+    def test_download_folder_walks_the_folder_once_per_request(self):
+        """The listing that keys the archive cache also feeds the ZIP writer."""
+        import app as app_module
+
+        test_folder = os.path.join(self.stl_path, "single_pass")
+        os.makedirs(os.path.join(test_folder, "parts"), exist_ok=True)
+        for rel in ("top.stl", "parts/inner.stl"):
+            with open(os.path.join(test_folder, rel), "w") as f:
+                f.write(rel)
+
+        with patch(
+            "app.iter_folder_files", wraps=app_module.iter_folder_files
+        ) as mock_walk, patch("app.zipfile.ZipInfo.from_file") as mock_from_file:
+            response = self.client.get("/download_folder?folder_name=single_pass")
+            data = response.get_data()
+        assert mock_walk.call_count == 1
+        mock_from_file.assert_not_called()
+        with zipfile.ZipFile(BytesIO(data)) as zipf:
+            assert zipf.read("parts/inner.stl") == b"parts/inner.stl"
+            assert zipf.getinfo("top.stl").file_size == len("top.stl")
+
+    def test_download_folder_route_stores_compressed_formats(self):
+        """Mesh/image/3MF members are stored; text formats like G-code are deflated."""
+        test_folder = os.path.join(self.stl_path, "mixed_folder")
+        os.makedirs(test_folder, exist_ok=True)
+        for name in ("model.stl", "plate.3mf", "photo.JPG", "manual.pdf", "job.gcode.gz"):
+            with open(os.path.join(test_folder, name), "wb") as f:
+                f.write(b"binary" * 100)
+        gcode = "".join(
+            f"G1 X{i % 97} Y{i * 7 % 89} E{i * 0.013:.3f}\n" for i in range(2000)
+        )
+        with open(os.path.join(test_folder, "job.gcode"), "w") as f:
+            f.write(gcode)
+
+        response = self.client.get("/download_folder?folder_name=mixed_folder")
+        assert response.status_code == 200
+
+        with zipfile.ZipFile(BytesIO(response.get_data())) as zipf:
+            compress_types = {info.filename: info.compress_type for info in zipf.infolist()}
+            gcode_size = zipf.getinfo("job.gcode").compress_size
+        assert compress_types["model.stl"] == zipfile.ZIP_STORED
+        assert compress_types["plate.3mf"] == zipfile.ZIP_STORED
+        assert compress_types["photo.JPG"] == zipfile.ZIP_STORED
+        assert compress_types["manual.pdf"] == zipfile.ZIP_STORED
+        assert compress_types["job.gcode.gz"] == zipfile.ZIP_STORED
+        assert compress_types["job.gcode"] == zipfile.ZIP_DEFLATED
+        # Deflated members use the fast level 1, not zlib's default
+        level_one = zlib.compressobj(1, zlib.DEFLATED, -15)
+        expected = level_one.compress(gcode.encode()) + level_one.flush()
+        assert gcode_size == len(expected)
+
+    def test_download_folder_route_serves_cached_archive_on_repeat(self):
+        """The first download is streamed and cached; repeats are sent from the cache."""
+        archive_dir = os.path.join(self.temp_dir, "archives")
+        self.app.config["ARCHIVE_CACHE_PATH"] = archive_dir
+        test_folder = os.path.join(self.stl_path, "repeat_folder")
+        os.makedirs(test_folder, exist_ok=True)
+        with open(os.path.join(test_folder, "part.stl"), "w") as f:
+            f.write("solid part")
+
+        first = self.client.get("/download_folder?folder_name=repeat_folder")
+        assert first.is_streamed
+        body = first.get_data()
+        assert len(os.listdir(archive_dir)) == 1
+
+        with patch("app.iter_zip_folder") as mock_zip:
+            again = self.client.get("/download_folder?folder_name=repeat_folder")
+        mock_zip.assert_not_called()
+        assert again.status_code == 200
+        assert again.get_data() == body
+        assert "repeat_folder.zip" in again.headers["Content-Disposition"]
+        again.close()
+
+        revalidated = self.client.get(
+            "/download_folder?folder_name=repeat_folder",
+            headers={"If-None-Match": again.headers["ETag"]},
+        )
+        assert revalidated.status_code == 304
+
+        with open(os.path.join(test_folder, "notes.txt"), "w") as f:
+            f.write("changed")
+        changed = self.client.get("/download_folder?folder_name=repeat_folder")
+        with zipfile.ZipFile(BytesIO(changed.get_data())) as zipf:
+            assert sorted(zipf.namelist()) == ["notes.txt", "part.stl"]
+        assert len(os.listdir(archive_dir)) == 1
+
+    def test_download_folder_archive_cache_evicts_least_recently_used(self):
+        """Once the archive cache outgrows its budget, the least recently used zip goes."""
+        import app as app_module
+
+        archive_dir = self.app.config["ARCHIVE_CACHE_PATH"]
+        for name in ("old_folder", "hot_folder", "new_folder"):
+            folder = os.path.join(self.stl_path, name)
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, "part.stl"), "wb") as f:
+                f.write(os.urandom(4096))
+
+        def download(name):
+            response = self.client.get(f"/download_folder?folder_name={name}")
+            response.get_data()
+            response.close()
+
+        download("old_folder")
+        download("hot_folder")
+        archives = sorted(os.listdir(archive_dir))
+        assert len(archives) == 2
+        # Age both entries, then mark hot_folder's archive as just used
+        for archive_name in archives:
+            os.utime(os.path.join(archive_dir, archive_name), ns=(1, 1))
+        download("hot_folder")
+
+        # Room for two archives but not three
+        self.app.config["ARCHIVE_CACHE_MAX_MB"] = 9000 / (1024 * 1024)
+        download("new_folder")
+
+        remaining = os.listdir(archive_dir)
+        assert len(remaining) == 2
+        old_folder = os.path.join(self.stl_path, "old_folder")
+        old_listing = app_module.folder_listing(old_folder)
+        old_key = app_module.folder_archive_name(old_listing, "old_folder")
+        assert old_key not in remaining
+
+    def test_download_folder_route_uses_cached_archive_with_x_accel_redirect(self):
+        """With an archives prefix, folders are zipped once and handed to nginx."""
+        self.app.config["X_ACCEL_REDIRECT"] = {"archives": "/_protected_archives/"}
+        archive_dir = os.path.join(self.temp_dir, "archives")
+        self.app.config["ARCHIVE_CACHE_PATH"] = archive_dir
+        test_folder = os.path.join(self.stl_path, "accel_folder")
+        os.makedirs(test_folder, exist_ok=True)
+        with open(os.path.join(test_folder, "part.stl"), "w") as f:
+            f.write("solid part")
+
+        response = self.client.get("/download_folder?folder_name=accel_folder")
+        assert response.status_code == 200
+        assert response.data == b""
+        assert "accel_folder.zip" in response.headers["Content-Disposition"]
+        redirect = response.headers["X-Accel-Redirect"]
+        assert redirect.startswith("/_protected_archives/")
+        archive_name = redirect.rsplit("/", 1)[1]
+        with zipfile.ZipFile(os.path.join(archive_dir, archive_name)) as zipf:
+            assert zipf.read("part.stl") == b"solid part"
+
+        with patch("app.iter_zip_folder") as mock_zip:
+            again = self.client.get("/download_folder?folder_name=accel_folder")
+        assert again.headers["X-Accel-Redirect"] == redirect
+        mock_zip.assert_not_called()
+
+        with open(os.path.join(test_folder, "notes.txt"), "w") as f:
+            f.write("changed")
+        changed = self.client.get("/download_folder?folder_name=accel_folder")
+        assert changed.headers["X-Accel-Redirect"] != redirect
+        assert os.listdir(archive_dir) == [changed.headers["X-Accel-Redirect"].rsplit("/", 1)[1]]
+        cached_path = os.path.join(archive_dir, os.listdir(archive_dir)[0])
+        assert stat.S_IMODE(os.stat(cached_path).st_mode) == 0o644
+
+    def test_open_cache_tmp_gives_each_writer_its_own_file(self):
+        """Concurrent builders of one cache entry never share a temp file."""
+        import app as app_module
+
+        first, first_path = app_module.open_cache_tmp(self.temp_dir, "key-digest.zip")
+        second, second_path = app_module.open_cache_tmp(self.temp_dir, "key-digest.zip")
+        with first, second:
+            assert first_path != second_path
+        assert os.path.basename(first_path).startswith("key-digest.zip.")
+        assert first_path.endswith(".tmp")
 
     def test_copy_path_route_success(self):
         """Test successful path copying"""
@@ -552,37 +1142,44 @@ class TestAppRoutes:
         response = self.client.get("/copy_gcode_path/INVALID_BASE/test.gcode")
         assert response.status_code == 404
 
+    def test_copy_path_route_reuses_resolution_until_invalidated(self):
+        """Repeated lookups are served from the path cache until the index changes"""
+        test_file = os.path.join(self.stl_path, "cached.txt")
+        with open(test_file, "w") as f:
+            f.write("test content")
+
+        with patch("app.os.path.isfile", wraps=os.path.isfile) as mock_isfile:
+            for _ in range(3):
+                response = self.client.get("/copy_path/cached.txt")
+                assert json.loads(response.data)["path"] == test_file
+            assert mock_isfile.call_count == 1
+
+        os.remove(test_file)
+        assert self.client.get("/copy_path/cached.txt").status_code == 200
+        self.app.invalidate_path_cache()
+        assert self.client.get("/copy_path/cached.txt").status_code == 404
+        assert self.client.get("/copy_path/../outside.txt").status_code == 404
+
     def test_moonraker_stats_route_success(self):
         """Test successful Moonraker stats retrieval from database"""
-        # Mock the database manager to return file with stats
-        mock_gcode_files = [
-            {
-                "file_name": "test.gcode",
-                "stats": {"total_prints": 5, "successful_prints": 4, "canceled_prints": 1},
-            }
-        ]
+        # Mock the database manager to return stats for the file
+        mock_stats = {"total_prints": 5, "successful_prints": 4, "canceled_prints": 1}
 
         with patch.object(
-            self.app.config["DB_MANAGER"], "get_all_gcode_files", return_value=mock_gcode_files
-        ):
+            self.app.config["DB_MANAGER"], "get_gcode_stats_by_name", return_value=mock_stats
+        ) as mock_lookup:
             response = self.client.get("/moonraker_stats/test.gcode")
             assert response.status_code == 200
             data = json.loads(response.data)
             assert data["success"] is True
-            assert "stats" in data
+            assert data["stats"] == mock_stats
+            mock_lookup.assert_called_once_with("test.gcode")
 
     def test_moonraker_stats_route_no_stats(self):
         """Test Moonraker stats route with no stats in database"""
-        # Mock the database manager to return files without matching stats
-        mock_gcode_files = [
-            {
-                "file_name": "other.gcode",
-                "stats": {"total_prints": 1, "successful_prints": 1, "canceled_prints": 0},
-            }
-        ]
-
+        # Mock the database manager to find no stats for the file
         with patch.object(
-            self.app.config["DB_MANAGER"], "get_all_gcode_files", return_value=mock_gcode_files
+            self.app.config["DB_MANAGER"], "get_gcode_stats_by_name", return_value=None
         ):
             response = self.client.get("/moonraker_stats/test.gcode")
             assert response.status_code == 200
@@ -600,6 +1197,29 @@ class TestAppRoutes:
         assert "stl_files" in data
         assert "metadata" in data
 
+    def test_search_route_counts_matched_files(self):
+        for folder_name, file_names in {
+            "bracket_set": ["left.stl", "right.stl"],
+            "misc_parts": ["bracket_clip.stl", "spacer.stl"],
+        }.items():
+            folder_path = os.path.join(self.stl_path, folder_name)
+            os.makedirs(folder_path, exist_ok=True)
+            for file_name in file_names:
+                with open(os.path.join(folder_path, file_name), "w", encoding="utf-8") as f:
+                    f.write("solid test\nendsolid test\n")
+
+        self.client.post("/reload_index?mode=files")
+        response = self.client.get("/search?q=bracket")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        files_by_folder = {
+            folder["folder_name"]: sorted(f["file_name"] for f in folder["files"])
+            for folder in data["stl_files"]
+        }
+        assert files_by_folder["bracket_set"] == ["left.stl", "right.stl"]
+        assert files_by_folder["misc_parts"] == ["bracket_clip.stl"]
+        assert data["metadata"]["matches"] == sum(len(v) for v in files_by_folder.values())
+
     @patch("trinetra.search.search_gcode_files")
     def test_search_gcode_route(self, mock_search):
         """Test search G-code route"""
@@ -650,6 +1270,67 @@ class TestAppRoutes:
                     response = self.client.get("/stats")
                     assert response.status_code == 200
 
+    def test_stats_route_caches_payload_and_revalidates(self):
+        db_manager = self.app.config["DB_MANAGER"]
+        with patch.object(db_manager, "get_stats", wraps=db_manager.get_stats) as mock_get_stats:
+            first = self.client.get("/stats")
+            second = self.client.get("/stats", headers={"If-None-Match": first.headers["ETag"]})
+            assert mock_get_stats.call_count == 1
+
+            self.app.invalidate_stats_cache()
+            third = self.client.get("/stats")
+            assert mock_get_stats.call_count == 2
+
+        assert first.status_code == 200
+        assert first.headers["ETag"].startswith('W/"')
+        assert second.status_code == 304
+        assert third.status_code == 200
+
+        compressed_etag = first.headers["ETag"][:-1] + ':gzip"'
+        revalidated = self.client.get("/stats", headers={"If-None-Match": compressed_etag})
+        assert revalidated.status_code == 304
+
+    def test_get_app_creates_app_once(self):
+        import app as app_module
+
+        sentinel = object()
+        with patch.object(app_module, "_app", None), patch.object(
+            app_module, "create_app", return_value=sentinel
+        ) as mock_create:
+            assert app_module.get_app() is sentinel
+            assert app_module.get_app() is sentinel
+        mock_create.assert_called_once_with()
+
+    def test_api_listings_revalidate_until_library_changes(self):
+        for endpoint in ("/api/stl_files?page=1", "/api/gcode_files?page=1"):
+            first = self.client.get(endpoint)
+            assert first.status_code == 200
+            etag = first.headers["ETag"]
+            assert first.headers["Cache-Control"] == "private, no-cache"
+
+            revalidated = self.client.get(endpoint, headers={"If-None-Match": etag})
+            assert revalidated.status_code == 304
+            other_page = self.client.get(endpoint + "&per_page=5", headers={"If-None-Match": etag})
+            assert other_page.status_code == 200
+
+            # A write through another worker's manager must retire this worker's ETag
+            other_worker = DatabaseManager(self.app.config["DATABASE_PATH"])
+            other_worker.invalidate_search_candidates_cache()
+            other_worker.invalidate_gcode_files_cache()
+            other_worker.engine.dispose()
+            changed = self.client.get(endpoint, headers={"If-None-Match": etag})
+            assert changed.status_code == 200
+            assert changed.headers["ETag"] != etag
+
+    def test_activity_calendar_days_cover_trailing_year(self):
+        import app as app_module
+
+        days = app_module.activity_calendar_days("2024-03-01")
+        assert len(days) == 365
+        assert days[0] == "2023-03-03"
+        assert days[-1] == "2024-03-01"
+        assert app_module.activity_calendar_days("2024-03-01") is days
+
     def test_reload_index_stats_mode_skips_filesystem_reindex(self):
         with patch.object(self.app.config["DB_MANAGER"], "reload_index") as mock_reload:
             response = self.client.post("/reload_index?mode=stats")
@@ -706,6 +1387,29 @@ class TestAppRoutes:
         after_names = {folder["folder_name"] for folder in after_payload.get("folders", [])}
         assert "persist_me" in after_names
 
+    def test_reload_index_background_returns_job_and_reports_status(self):
+        with patch.object(
+            self.app.config["DB_MANAGER"], "reload_index", return_value={"folders": 2}
+        ) as mock_reload:
+            response = self.client.post("/reload_index?mode=files&background=1")
+            refresh_status = self.app.wait_for_index_refresh(timeout=10)
+
+        assert response.status_code == 202
+        payload = json.loads(response.data)
+        assert payload["success"] is True
+        assert payload["pending"] is True
+        mock_reload.assert_called_once_with(
+            self.app.config["STL_FILES_PATH"], self.app.config["GCODE_FILES_PATH"]
+        )
+
+        status_response = self.client.get("/api/refresh_status")
+        refresh = json.loads(status_response.data)["refresh"]
+        assert refresh == refresh_status
+        assert refresh["state"] == "done"
+        assert refresh["mode"] == "files"
+        assert refresh["job_id"] == payload["job_id"]
+        assert refresh["counts"] == {"folders": 2}
+
     def test_reload_index_rejects_invalid_mode(self):
         response = self.client.post("/reload_index?mode=invalid")
         assert response.status_code == 400
@@ -720,6 +1424,21 @@ class TestAppRoutes:
         assert b"Library History" in response.data
         assert b"Integrations" in response.data
 
+    def test_global_settings_computed_once_per_request(self):
+        """Template context settings should be built once and reused within a request."""
+        with patch("app.list_printer_integrations", return_value=[]) as mock_list:
+            with self.app.test_request_context("/settings"):
+                first = {}
+                second = {}
+                self.app.update_template_context(first)
+                self.app.update_template_context(second)
+            assert first["trinetra_settings"] is second["trinetra_settings"]
+            mock_list.assert_called_once()
+
+            with self.app.test_request_context("/settings"):
+                self.app.update_template_context({})
+            assert mock_list.call_count == 2
+
     def test_api_settings_printer_volume_get(self):
         """Settings API should return current/default printer volume."""
         response = self.client.get("/api/settings/printer_volume")
@@ -730,6 +1449,40 @@ class TestAppRoutes:
         assert "x" in data["printer_volume"]
         assert "y" in data["printer_volume"]
         assert "z" in data["printer_volume"]
+        assert data["default_printer_volume"] == {"x": 220.0, "y": 220.0, "z": 270.0}
+        assert any(printer["id"] == "bambu_a1" for printer in data["popular_printers"])
+
+    def test_printer_defaults_are_read_only(self):
+        import app as app_module
+
+        with pytest.raises(TypeError):
+            app_module.DEFAULT_PRINTER_VOLUME["x"] = 1.0
+        with pytest.raises(TypeError):
+            app_module.POPULAR_PRINTERS[0]["x"] = 1
+
+    def test_json_provider_keeps_default_encodings(self):
+        from datetime import datetime
+        from types import MappingProxyType
+
+        with self.app.test_request_context():
+            response = self.app.json.response(
+                {
+                    "when": datetime(2025, 1, 2, 3, 4, 5),
+                    "volume": MappingProxyType({"x": 1.0}),
+                    2: "int key",
+                }
+            )
+        data = json.loads(response.get_data(as_text=True))
+        assert data["when"] == "Thu, 02 Jan 2025 03:04:05 GMT"
+        assert data["volume"] == {"x": 1.0}
+        assert data["2"] == "int key"
+        assert self.app.json.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_jsonify_writes_orjson_bytes(self):
+        with self.app.test_request_context():
+            response = self.app.json.response(files=["a.stl"], count=1)
+        assert response.mimetype == "application/json"
+        assert response.get_data() == b'{"count":1,"files":["a.stl"]}\n'
 
     def test_api_settings_printer_volume_post_updates_config_file(self):
         """Settings updates should persist in the config file used to start the app."""
@@ -931,6 +1684,85 @@ class TestAppRoutes:
         assert saved_config["integrations"]["moonraker"]["enabled"] is True
         assert saved_config["integrations"]["moonraker"]["base_url"] == "http://localhost:7125"
 
+    def test_api_settings_integrations_normalize_and_reject_payloads(self):
+        for endpoint in ("bambu", "moonraker"):
+            response = self.client.post(f"/api/settings/integrations/{endpoint}", json=["enabled"])
+            assert response.status_code == 400
+            assert json.loads(response.data)["success"] is False
+
+        settings = BambuIntegrationSettings.from_payload(
+            {"enabled": 1, "mode": " CLOUD ", "access_token": " tok ", "region": None}
+        )
+        assert settings == BambuIntegrationSettings(
+            enabled=True, mode="cloud", access_token="tok", refresh_token="", region="global"
+        )
+        assert settings.to_config_block()["cloud"]["access_token"] == "tok"
+        assert MoonrakerIntegrationSettings.from_payload({"base_url": None}).base_url == ""
+
+    def test_integration_state_is_reused_until_config_changes(self):
+        temp_config_path = os.path.join(self.temp_dir, "integration_config.yaml")
+        with open(temp_config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(
+                {
+                    "base_path": os.path.join(self.temp_dir, "integration_data"),
+                    "moonraker_url": "",
+                    "log_level": "INFO",
+                    "mode": "DEV",
+                    "search_result_limit": 25,
+                },
+                f,
+                sort_keys=False,
+            )
+        integration_app = create_app(config_file=temp_config_path)
+        integration_client = integration_app.test_client()
+        moonraker = get_printer_integration("moonraker")
+
+        with patch.object(moonraker, "get_ui_state", wraps=moonraker.get_ui_state) as mock_state:
+            for _ in range(3):
+                response = integration_client.get("/api/settings/integrations/moonraker")
+                assert json.loads(response.data)["integration"]["enabled"] is False
+            assert mock_state.call_count == 1
+
+            integration_client.post(
+                "/api/settings/integrations/moonraker",
+                json={"enabled": True, "base_url": "http://localhost:7125"},
+            )
+            response = integration_client.get("/api/settings/integrations/moonraker")
+            assert json.loads(response.data)["integration"]["enabled"] is True
+            assert mock_state.call_count == 2
+
+    def test_update_config_serializes_concurrent_writers(self):
+        temp_config_path = os.path.join(self.temp_dir, "counter_config.yaml")
+        with open(temp_config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(
+                {
+                    "base_path": os.path.join(self.temp_dir, "counter_data"),
+                    "log_level": "INFO",
+                    "mode": "DEV",
+                    "counter": 0,
+                },
+                f,
+                sort_keys=False,
+            )
+        counter_app = create_app(config_file=temp_config_path)
+
+        def bump():
+            for _ in range(10):
+                counter_app.update_config(lambda cfg: {"counter": cfg.get("counter", 0) + 1})
+
+        workers = [threading.Thread(target=bump) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        with open(temp_config_path, "r", encoding="utf-8") as f:
+            saved_config = yaml.safe_load(f) or {}
+        assert saved_config["counter"] == 40
+        assert saved_config["log_level"] == "INFO"
+        assert counter_app.config["COUNTER"] == 40
+        assert not os.path.exists(f"{temp_config_path}.tmp")
+
     def test_api_add_to_queue_success(self):
         mock_integration = Mock()
         mock_integration.is_enabled.return_value = True
@@ -988,6 +1820,20 @@ class TestAppRoutes:
         with pytest.raises(Exception, match="Attempted Path Traversal"):
             self.app.safe_join("/base", "../outside/file.txt")
 
+        # Sibling directories sharing the base prefix are outside the base
+        with pytest.raises(Exception, match="Attempted Path Traversal"):
+            self.app.safe_join("/base", "../base2/file.txt")
+
+        with pytest.raises(Exception, match="Attempted Path Traversal"):
+            self.app.safe_join("/base", "/etc/passwd")
+
+        # The base itself resolves to the base rather than being rejected
+        assert self.app.safe_join("/base/", "folder", "..") == "/base"
+
+    def test_download_folder_route_rejects_library_root(self):
+        response = self.client.get("/download_folder?folder_name=.")
+        assert response.status_code == 400
+
     def test_load_config_function(self):
         """Test load_config function"""
         mock_config = {"base_path": "/test/path", "log_level": "INFO"}
@@ -997,6 +1843,25 @@ class TestAppRoutes:
                 result = self.app.load_config("test.yaml")
                 assert result == mock_config
 
+    def test_load_config_function_caches_until_file_changes(self):
+        """Repeat loads should reuse the parsed config until the file changes."""
+        config_path = os.path.join(self.temp_dir, "cached_config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump({"log_level": "INFO", "search_result_limit": 25}, f)
+
+        first = self.app.load_config(config_path)
+        first["log_level"] = "MUTATED"
+
+        with patch("builtins.open", side_effect=AssertionError("config re-read")):
+            second = self.app.load_config(config_path)
+        assert second["log_level"] == "INFO"
+
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump({"log_level": "DEBUG", "search_result_limit": 50}, f)
+        third = self.app.load_config(config_path)
+        assert third["log_level"] == "DEBUG"
+        assert third["search_result_limit"] == 50
+
     def test_load_config_function_error(self):
         """Test load_config function with error"""
         with patch("builtins.open", side_effect=FileNotFoundError()):
@@ -1012,28 +1877,6 @@ class TestAppRoutes:
         assert self.app.allowed_file("test.gcode") is True
         assert self.app.allowed_file("test.txt") is False
 
-    def test_safe_extract_function(self):
-        """Test safe_extract function"""
-        mock_zip = MagicMock()
-        mock_zip.namelist.return_value = ["file1.txt", "file2.txt"]
-
-        # Test normal extraction
-        with patch("os.path.realpath") as mock_realpath:
-            mock_realpath.side_effect = lambda x: x
-            self.app.safe_extract(mock_zip, "/test/path")
-            mock_zip.extractall.assert_called_once_with("/test/path")
-
-    def test_safe_extract_function_path_traversal(self):
-        """Test safe_extract function with path traversal attempt"""
-        mock_zip = MagicMock()
-        mock_zip.namelist.return_value = ["../../../outside/file.txt"]
-
-        with patch("os.path.realpath") as mock_realpath:
-            mock_realpath.side_effect = lambda x: x if "outside" not in x else "/outside/file.txt"
-
-            with pytest.raises(Exception, match="Attempted Path Traversal in Zip File"):
-                self.app.safe_extract(mock_zip, "/test/path")
-
     def test_get_stl_files_function(self):
         """Test get_stl_files function"""
         # Mock the database manager to return expected results
@@ -1054,6 +1897,24 @@ class TestAppRoutes:
             assert result[0]["folder_name"] == "project1"
             assert len(result[0]["files"]) == 2
 
+    def test_fix_duplicated_folders_function(self):
+        """Only top-level folder/folder/ nesting should be collapsed."""
+        duplicated = os.path.join(self.stl_path, "widget", "widget")
+        os.makedirs(os.path.join(duplicated, "widget"), exist_ok=True)
+        with open(os.path.join(duplicated, "widget.stl"), "w") as f:
+            f.write("solid widget\nendsolid widget\n")
+
+        untouched = os.path.join(self.stl_path, "bracket", "bracket")
+        os.makedirs(untouched, exist_ok=True)
+        with open(os.path.join(self.stl_path, "bracket", "notes.txt"), "w") as f:
+            f.write("keep nesting")
+
+        assert self.app.fix_duplicated_folders(self.stl_path) == 1
+        assert os.path.isfile(os.path.join(self.stl_path, "widget", "widget.stl"))
+        assert os.path.isdir(os.path.join(self.stl_path, "widget", "widget"))
+        assert not os.path.exists(os.path.join(self.stl_path, "widget", "widget", "widget.stl"))
+        assert os.path.isdir(untouched)
+
     def test_extract_gcode_metadata_from_file_function(self):
         """Test extract_gcode_metadata_from_file function"""
         gcode_file = os.path.join(self.temp_dir, "test.gcode")
@@ -3,6 +3,8 @@ Tests for gcode_handler.py module
 Covers all functions and edge cases for G-code metadata extraction
 """
 
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, mock_open, MagicMock
 import pytest
@@ -293,3 +295,85 @@ support_enable = True
         metadata = gcode_handler.extract_gcode_metadata(gcode_content)
         expected = {"Time": "3h 59m 15s"}
         self.assertEqual(metadata, expected)
+
+    def test_extract_gcode_metadata_from_path_reads_only_file_ends(self):
+        """Large files should yield the same metadata while reading only header and trailer."""
+        header = ";FLAVOR:Marlin\n;TIME:14355\n; thumbnail " + "x" * 200_000 + "\nM140 S70\nM104 S220\nG28 ;Home\n"
+        trailer = (
+            ";End of Gcode\n"
+            ';SETTING_3 {"global_quality": "[general]\\nversion = 4\\n\\n[values]\\nlayer_height = 0.2\\n\\n", '
+            '"extruder_quality": ["[general]\\nversion = 4\\n\\n[values]\\n\\n"]}\n'
+        )
+        body = "G1 X10 Y10 E0.5\n" * 200_000
+        content = header + body + trailer
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "large.gcode")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+            head, tail = gcode_handler.read_gcode_metadata_blocks(path)
+            self.assertLess(len(head) + len(tail), len(content) // 2)
+            self.assertEqual(
+                gcode_handler.extract_gcode_metadata_from_path(path),
+                gcode_handler.extract_gcode_metadata(content),
+            )
+            self.assertEqual(
+                gcode_handler.extract_gcode_metadata_from_path(path),
+                {
+                    "Time": "3h 59m 15s",
+                    "Bed Temperature": "S70",
+                    "Extruder Temperature": "S220",
+                    "Layer Height": "0.2",
+                },
+            )
+
+    def test_extract_gcode_metadata_from_path_small_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "small.gcode")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(";FLAVOR:Marlin\n;TIME:14355\nG28 ;Home\n")
+            self.assertEqual(
+                gcode_handler.extract_gcode_metadata_from_path(path), {"Time": "3h 59m 15s"}
+            )
+
+    def test_extract_gcode_metadata_from_path_reuses_parse_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cached.gcode")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(";FLAVOR:Marlin\n;TIME:600\nG28 ;Home\n")
+
+            first = gcode_handler.extract_gcode_metadata_from_path(path)
+            first["Time"] = "mutated"
+            with patch.object(
+                gcode_handler, "read_gcode_metadata_blocks", side_effect=AssertionError("re-read")
+            ):
+                self.assertEqual(
+                    gcode_handler.extract_gcode_metadata_from_path(path), {"Time": "10m 0s"}
+                )
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(";FLAVOR:Marlin\n;TIME:1200\nG28 ;Home\n")
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertEqual(
+                gcode_handler.extract_gcode_metadata_from_path(path), {"Time": "20m 0s"}
+            )
+
+    def test_extract_gcode_metadata_from_path_falls_back_past_head_window(self):
+        """Header values beyond the head window are still found when nothing was parsed."""
+        padding = "; thumbnail " + "x" * (gcode_handler.GCODE_HEAD_LIMIT_BYTES + 1024) + "\n"
+        content = padding + ";TIME:60\nM140 S60\n" + "G1 X1 Y1\n" * 40_000
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "padded.gcode")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+            self.assertEqual(
+                gcode_handler.extract_gcode_metadata_from_path(path),
+                gcode_handler.extract_gcode_metadata(content),
+            )
+            self.assertEqual(
+                gcode_handler.extract_gcode_metadata_from_path(path)["Time"], "1m 0s"
+            )
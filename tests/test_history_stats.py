@@ -4,8 +4,10 @@ import os
 import shutil
 import tempfile
 import unittest
+from datetime import datetime
 
 from trinetra.database import DatabaseManager
+from trinetra.models import GCodeFile, GCodeFileStats
 
 
 class TestHistoryBackedStats(unittest.TestCase):
@@ -90,6 +92,101 @@ class TestHistoryBackedStats(unittest.TestCase):
         self.assertEqual(sum(calendar.values()), 1)
         self.assertEqual(len(calendar), 1)
 
+    def test_calendar_combines_sql_buckets_and_payload_fallback(self):
+        events = [
+            {
+                "event_uid": "evt-a",
+                "printer_uid": "printer-a",
+                "status": "2",
+                "event_at": "2025-03-04T23:59:00Z",
+            },
+            {
+                "event_uid": "evt-b",
+                "printer_uid": "printer-a",
+                "status": "2",
+                "raw_payload": {"endTime": "2025-03-04T08:00:00Z"},
+            },
+            {
+                "event_uid": "evt-c",
+                "printer_uid": "printer-a",
+                "status": "2",
+                "raw_payload": {"note": "no timestamp"},
+            },
+        ]
+        self.db_manager.sync_print_history_events(
+            integration_id="bambu",
+            integration_mode="cloud",
+            events=events,
+        )
+
+        calendar = self.db_manager.get_activity_calendar()
+        self.assertEqual(calendar, {"2025-03-04": 2})
+
+    def test_calendar_limits_days_to_requested_window(self):
+        events = [
+            {
+                "event_uid": f"evt-{day}",
+                "printer_uid": "printer-a",
+                "status": "2",
+                "event_at": f"2025-03-{day:02d}T12:00:00Z",
+            }
+            for day in (1, 5, 9)
+        ]
+        events.append(
+            {
+                "event_uid": "evt-payload",
+                "printer_uid": "printer-a",
+                "status": "2",
+                "raw_payload": {"endTime": "2025-03-10T08:00:00Z"},
+            }
+        )
+        self.db_manager.sync_print_history_events(
+            integration_id="bambu",
+            integration_mode="cloud",
+            events=events,
+        )
+
+        calendar = self.db_manager.get_activity_calendar(since="2025-03-05", until="2025-03-09")
+        self.assertEqual(calendar, {"2025-03-05": 1, "2025-03-09": 1})
+        calendar = self.db_manager.get_activity_calendar(since="2025-03-09")
+        self.assertEqual(calendar, {"2025-03-09": 1, "2025-03-10": 1})
+
+    def test_calendar_window_without_history_ignores_legacy_stats(self):
+        with self.db_manager.get_session() as session:
+            gcode_file = GCodeFile(
+                file_name="legacy.gcode",
+                rel_path="legacy.gcode",
+                abs_path="/tmp/legacy.gcode",
+                base_path="GCODE_BASE_PATH",
+            )
+            session.add(gcode_file)
+            session.flush()
+            session.add(
+                GCodeFileStats(
+                    gcode_file_id=gcode_file.id,
+                    print_count=4,
+                    last_print_date=datetime(2025, 3, 5, 12, 0),
+                )
+            )
+            session.commit()
+        self.assertEqual(self.db_manager.get_activity_calendar(), {"2025-03-05": 4})
+
+        self.db_manager.sync_print_history_events(
+            integration_id="bambu",
+            integration_mode="cloud",
+            events=[
+                {
+                    "event_uid": "evt-old",
+                    "printer_uid": "printer-a",
+                    "status": "2",
+                    "event_at": "2025-01-01T12:00:00Z",
+                }
+            ],
+        )
+
+        calendar = self.db_manager.get_activity_calendar(since="2025-03-01", until="2025-03-31")
+        self.assertEqual(calendar, {})
+
 
 if __name__ == "__main__":
     unittest.main()
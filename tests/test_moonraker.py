@@ -264,6 +264,28 @@ class TestMoonrakerAPI(unittest.TestCase):
         self.assertIsInstance(api.session, requests.Session)
 
 
+class TestMoonrakerIntegrationClients(unittest.TestCase):
+    """Clients handed out by the integration plugin"""
+
+    def test_create_client_reuses_session_per_base_url(self):
+        from trinetra.integrations.moonraker.plugin import MoonrakerIntegration
+
+        integration = MoonrakerIntegration()
+        config = {"integrations": {"moonraker": {"enabled": True, "base_url": "http://printer:7125"}}}
+
+        first = integration.create_client(config)
+        self.assertIs(integration.create_client(config), first)
+        self.assertEqual(first.session.get_adapter("http://printer:7125")._pool_maxsize, 8)
+
+        config["integrations"]["moonraker"]["base_url"] = "http://other:7125"
+        other = integration.create_client(config)
+        self.assertIsNot(other, first)
+        self.assertEqual(other.base_url, "http://other:7125")
+
+        config["integrations"]["moonraker"]["enabled"] = False
+        self.assertIsNone(integration.create_client(config))
+
+
 class TestMoonrakerFunctions(unittest.TestCase):
     """Test cases for convenience functions"""
 
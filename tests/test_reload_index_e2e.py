@@ -6,6 +6,7 @@ Tests the complete workflow of reloading the index with G-code stats
 import os
 import tempfile
 import shutil
+import threading
 import unittest
 from unittest.mock import Mock, patch
 import json
@@ -159,6 +160,158 @@ G1 X10 Y10 Z0.2
         # We expect at least one file to have stats since we provided Moonraker data
         # for "test.gcode" and we have a file with that name
 
+        # Name lookup should agree with the full listing for the same file
+        expected = next(f["stats"] for f in gcode_files if f["file_name"] == "test.gcode")
+        self.assertEqual(self.db_manager.get_gcode_stats_by_name("test.gcode"), expected)
+        self.assertIsNone(self.db_manager.get_gcode_stats_by_name("missing.gcode"))
+
+    def test_get_all_gcode_files_is_cached_until_reload(self):
+        """Repeated reads should reuse the snapshot until the index is rebuilt"""
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+        first = self.db_manager.get_all_gcode_files()
+
+        with patch.object(self.db_manager, "get_session") as mock_session:
+            second = self.db_manager.get_all_gcode_files()
+        mock_session.assert_not_called()
+        self.assertEqual(second, first)
+        self.assertIsNot(second, first)
+
+        with open(os.path.join(self.gcode_dir, "extra.gcode"), "w") as f:
+            f.write(";FLAVOR:Marlin\nG28 ;Home\n")
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+        names = {f["file_name"] for f in self.db_manager.get_all_gcode_files()}
+        self.assertIn("extra.gcode", names)
+        self.assertEqual(len(names), len({f["file_name"] for f in first}) + 1)
+
+    def test_get_all_gcode_files_sees_reload_from_another_worker(self):
+        """A snapshot must not outlive a reload done by another process on the same DB"""
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+        other_worker = DatabaseManager(self.db_path)
+        first = other_worker.get_all_gcode_files()
+
+        with open(os.path.join(self.gcode_dir, "extra.gcode"), "w") as f:
+            f.write(";FLAVOR:Marlin\nG28 ;Home\n")
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+
+        names = {f["file_name"] for f in other_worker.get_all_gcode_files()}
+        self.assertIn("extra.gcode", names)
+        self.assertEqual(len(names), len({f["file_name"] for f in first}) + 1)
+        other_worker.engine.dispose()
+
+    def test_reload_index_links_gcode_to_longest_matching_stl(self):
+        """G-code in the G-code library should link to the most specific STL name prefix"""
+        for folder, stl_name in (("short", "bracket.stl"), ("long", "bracket_long.stl")):
+            os.makedirs(os.path.join(self.stl_dir, folder))
+            with open(os.path.join(self.stl_dir, folder, stl_name), "w") as f:
+                f.write("solid part\nendsolid part\n")
+        for gcode_name in ("bracket_long_0.2mm.gcode", "bracket_PLA.gcode", "unrelated.gcode"):
+            with open(os.path.join(self.gcode_dir, gcode_name), "w") as f:
+                f.write(";FLAVOR:Marlin\nG28 ;Home\n")
+
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+
+        folders = {
+            f["file_name"]: f["folder_name"]
+            for f in self.db_manager.get_all_gcode_files()
+            if f["base_path"] == "GCODE_BASE_PATH"
+        }
+        self.assertEqual(folders["bracket_long_0.2mm.gcode"], "long")
+        self.assertEqual(folders["bracket_PLA.gcode"], "short")
+        self.assertEqual(folders["unrelated.gcode"], "Unknown")
+
+    def test_three_mf_listing_is_reused_until_a_directory_changes(self):
+        """Folder 3MF discovery should only rescan after entries are added or removed"""
+        self.db_manager.stl_base_path = self.stl_dir
+        nested = os.path.join(self.test_folder, "plates")
+        os.makedirs(nested)
+        first_path = os.path.join(self.test_folder, "project.3mf")
+        self._write_simple_three_mf(first_path)
+
+        listed = self.db_manager._discover_three_mf_candidate_paths("test_folder")
+        self.assertEqual(listed, [first_path])
+        with patch("trinetra.database.os.scandir", side_effect=AssertionError("rescanned")):
+            self.assertEqual(
+                self.db_manager._discover_three_mf_candidate_paths("test_folder"), listed
+            )
+
+        second_path = os.path.join(nested, "plate.3mf")
+        self._write_simple_three_mf(second_path)
+        stat = os.stat(nested)
+        os.utime(nested, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(
+            self.db_manager._discover_three_mf_candidate_paths("test_folder"),
+            sorted([first_path, second_path]),
+        )
+
+    def test_scandir_walk_matches_os_walk(self):
+        """scandir_walk should visit the same files as os.walk without following dir links"""
+        from trinetra.database import scandir_walk
+
+        os.makedirs(os.path.join(self.test_folder, "a", "b"))
+        with open(os.path.join(self.test_folder, "a", "b", "deep.stl"), "w") as f:
+            f.write("solid deep\nendsolid deep\n")
+        os.symlink(self.gcode_dir, os.path.join(self.test_folder, "linked"))
+
+        expected = {
+            os.path.join(root, name)
+            for root, _dirs, files in os.walk(self.stl_dir)
+            for name in files
+        }
+        walked = {
+            entry.path for _root, entries in scandir_walk(self.stl_dir) for entry in entries
+        }
+        self.assertEqual(walked, expected)
+        self.assertNotIn(os.path.join(self.test_folder, "linked", "separate", "separate.gcode"), walked)
+
+    def test_reload_index_reuses_metadata_of_unchanged_gcode(self):
+        """A second reload should only re-parse G-code files whose size or mtime changed"""
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+        before = {f["rel_path"]: f["metadata"] for f in self.db_manager.get_all_gcode_files()}
+
+        with patch.object(
+            self.db_manager, "_extract_gcode_metadata", wraps=self.db_manager._extract_gcode_metadata
+        ) as mock_extract:
+            self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+            mock_extract.assert_not_called()
+
+            stat_result = os.stat(self.gcode_file_path)
+            os.utime(self.gcode_file_path, (stat_result.st_atime, stat_result.st_mtime + 10))
+            self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+            mock_extract.assert_called_once_with(self.gcode_file_path)
+
+        after = {f["rel_path"]: f["metadata"] for f in self.db_manager.get_all_gcode_files()}
+        self.assertEqual(after, before)
+
+    def test_database_connection_uses_wal_journal(self):
+        """The reload transaction should commit through the WAL journal"""
+        from sqlalchemy import text
+
+        with self.db_manager.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(conn.execute(text("PRAGMA synchronous")).scalar(), 1)
+
+    def test_reload_index_parses_new_gcode_files_in_parallel(self):
+        """Queued metadata parsing should keep per-file results and file timestamps"""
+        from datetime import datetime
+        from trinetra.models import GCodeFile
+
+        for minutes in (10, 20, 30):
+            with open(os.path.join(self.gcode_dir, f"job_{minutes}.gcode"), "w") as f:
+                f.write(f";FLAVOR:Marlin\n;TIME:{minutes * 60}\nG28 ;Home\nG1 X1\n")
+
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+
+        files = {f["file_name"]: f for f in self.db_manager.get_all_gcode_files()}
+        for minutes in (10, 20, 30):
+            self.assertEqual(files[f"job_{minutes}.gcode"]["metadata"], {"Time": f"{minutes}m 0s"})
+
+        with self.db_manager.get_session() as session:
+            for gcode_file in session.query(GCodeFile).all():
+                self.assertEqual(
+                    gcode_file.updated_at,
+                    datetime.fromtimestamp(os.path.getmtime(gcode_file.abs_path)),
+                )
+
     def test_reload_index_without_moonraker_stats(self):
         """Test end-to-end reload index without Moonraker stats"""
         # Perform reload index without Moonraker URL
@@ -351,6 +504,281 @@ G1 X10 Y10 Z0.2
         files_with_stats = [f for f in gcode_files if f.get("stats") is not None]
         self.assertGreater(len(files_with_stats), 0)
 
+    def test_folder_bundle_matches_separate_queries(self):
+        """Folder bundle should return the same data as the individual lookups"""
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+
+        bundle = self.db_manager.get_folder_bundle("test_folder")
+
+        self.assertEqual(
+            tuple(bundle[:4]), self.db_manager.get_folder_contents("test_folder")
+        )
+        self.assertEqual(
+            bundle.three_mf_projects,
+            self.db_manager.get_folder_three_mf_projects("test_folder"),
+        )
+        self.assertEqual(self.db_manager.get_folder_bundle("missing"), ([], [], [], [], []))
+
+    def test_folder_contents_cached_until_index_changes(self):
+        """Folder contents are served from memory until STL or G-code rows change"""
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+        first = self.db_manager.get_folder_contents("test_folder")
+
+        with patch.object(
+            self.db_manager,
+            "_get_folder_contents_locked",
+            wraps=self.db_manager._get_folder_contents_locked,
+        ) as mock_load:
+            self.assertEqual(self.db_manager.get_folder_contents("test_folder"), first)
+            self.db_manager.get_folder_bundle("test_folder")
+            mock_load.assert_not_called()
+
+            new_stl = os.path.join(self.test_folder, "bracket.stl")
+            with open(new_stl, "w") as f:
+                f.write("solid bracket\nendsolid bracket\n")
+            self.db_manager.add_stl_file("test_folder", "bracket.stl", "bracket.stl", new_stl)
+            stl_files = self.db_manager.get_folder_contents("test_folder")[0]
+            self.assertIn("bracket.stl", [item["file_name"] for item in stl_files])
+            self.assertEqual(mock_load.call_count, 1)
+
+            self.db_manager.invalidate_gcode_files_cache()
+            self.db_manager.get_folder_contents("test_folder")
+            self.assertEqual(mock_load.call_count, 2)
+
+    def test_folder_contents_follow_writes_from_another_worker(self):
+        """Folder contents cached by one process are reloaded after another one adds a file"""
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+        other_worker = DatabaseManager(self.db_path)
+        other_worker.get_folder_contents("test_folder")
+
+        new_stl = os.path.join(self.test_folder, "bracket.stl")
+        with open(new_stl, "w") as f:
+            f.write("solid bracket\nendsolid bracket\n")
+        self.db_manager.add_stl_file("test_folder", "bracket.stl", "bracket.stl", new_stl)
+
+        stl_files = other_worker.get_folder_contents("test_folder")[0]
+        self.assertIn("bracket.stl", [item["file_name"] for item in stl_files])
+        other_worker.engine.dispose()
+
+    def test_search_matches_cached_until_index_changes(self):
+        """Repeated searches reuse ranked matches until the search index is rebuilt"""
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+        first, first_total = self.db_manager.search_stl_files_with_total("test")
+
+        with patch.object(
+            self.db_manager,
+            "_rank_folder_matches",
+            wraps=self.db_manager._rank_folder_matches,
+        ) as mock_rank:
+            self.assertEqual(
+                self.db_manager.search_stl_files_with_total("  TEST "), (first, first_total)
+            )
+            mock_rank.assert_not_called()
+
+            self.assertEqual(self.db_manager.search_stl_files_with_total("!!"), ([], 0))
+            self.assertEqual(mock_rank.call_count, 1)
+
+            new_stl = os.path.join(self.test_folder, "test_bracket.stl")
+            with open(new_stl, "w") as f:
+                f.write("solid bracket\nendsolid bracket\n")
+            self.db_manager.add_stl_file(
+                "test_folder", "test_bracket.stl", "test_bracket.stl", new_stl
+            )
+            results, _ = self.db_manager.search_stl_files_with_total("test")
+            self.assertEqual(mock_rank.call_count, 2)
+            file_names = [item["file_name"] for folder in results for item in folder["files"]]
+            self.assertIn("test_bracket.stl", file_names)
+
+    def test_search_results_follow_writes_from_another_worker(self):
+        """Search results cached by one process are recomputed after another one reloads"""
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+        other_worker = DatabaseManager(self.db_path)
+        before = [item["file_name"] for item in other_worker.search_gcode_files("bracket")]
+        self.assertNotIn("bracket.gcode", before)
+
+        with open(os.path.join(self.gcode_dir, "bracket.gcode"), "w") as f:
+            f.write(";FLAVOR:Marlin\nG28 ;Home\n")
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+
+        after = [item["file_name"] for item in other_worker.search_gcode_files("bracket")]
+        self.assertIn("bracket.gcode", after)
+        other_worker.engine.dispose()
+
+    def test_reads_during_background_reload_do_not_undo_it(self):
+        """Request threads reading the DB must not roll back a reload running in another thread"""
+        for index in range(40):
+            folder = os.path.join(self.stl_dir, f"folder_{index:02d}")
+            os.makedirs(folder)
+            with open(os.path.join(folder, "part.stl"), "w") as f:
+                f.write("solid part\nendsolid part\n")
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+
+        errors = []
+
+        def reload_repeatedly():
+            try:
+                for _ in range(5):
+                    self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+            except Exception as exc:
+                errors.append(exc)
+
+        worker = threading.Thread(target=reload_repeatedly)
+        worker.start()
+        while worker.is_alive():
+            self.db_manager.get_stats()
+            self.db_manager.library_versions()
+        worker.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.db_manager.get_stats()["total_folders"], 41)
+
+    def test_reload_index_batches_file_inserts(self):
+        """Walked rows are written per table in batches, not one INSERT per file"""
+        from sqlalchemy import event
+
+        for index in range(3):
+            folder = os.path.join(self.stl_dir, f"batch_{index}")
+            os.makedirs(folder)
+            for part in range(5):
+                with open(os.path.join(folder, f"part_{part}.stl"), "w") as f:
+                    f.write("solid part\nendsolid part\n")
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.lstrip().split("(", 1)[0].strip())
+
+        event.listen(self.db_manager.engine, "before_cursor_execute", record)
+        try:
+            counts = self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+        finally:
+            event.remove(self.db_manager.engine, "before_cursor_execute", record)
+
+        self.assertEqual(counts["folders"], 4)
+        self.assertEqual(counts["stl_files"], 16)
+        self.assertEqual(statements.count("INSERT INTO stl_files"), 1)
+        self.assertFalse(any(s.startswith("UPDATE folders") for s in statements))
+
+        stl_files = {
+            item["file_name"]
+            for folder in self.db_manager.get_stl_files()
+            if folder["folder_name"] == "batch_2"
+            for item in folder["files"]
+        }
+        self.assertEqual(stl_files, {f"part_{part}.stl" for part in range(5)})
+
+    def test_get_stl_files_reads_stl_rows_in_one_query(self):
+        """Listing every folder does not issue one STL query per folder"""
+        from sqlalchemy import event
+
+        for index in range(3):
+            folder = os.path.join(self.stl_dir, f"listing_{index}")
+            os.makedirs(folder)
+            with open(os.path.join(folder, f"part_{index}.stl"), "w") as f:
+                f.write("solid part\nendsolid part\n")
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.db_manager.engine, "before_cursor_execute", record)
+        try:
+            folders = self.db_manager.get_stl_files()
+        finally:
+            event.remove(self.db_manager.engine, "before_cursor_execute", record)
+
+        self.assertEqual(
+            {folder["folder_name"]: [f["file_name"] for f in folder["files"]] for folder in folders},
+            {
+                "test_folder": ["test.stl"],
+                "listing_0": ["part_0.stl"],
+                "listing_1": ["part_1.stl"],
+                "listing_2": ["part_2.stl"],
+            },
+        )
+        self.assertEqual(sum("FROM stl_files" in statement for statement in statements), 1)
+
+    def test_get_stats_counts_library_rows(self):
+        """Library counters match the indexed rows, with unlinked G-code not owning a folder"""
+        os.makedirs(os.path.join(self.stl_dir, "no_gcode"))
+        with open(os.path.join(self.stl_dir, "no_gcode", "part.stl"), "w") as f:
+            f.write("solid part\nendsolid part\n")
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+
+        self.assertEqual(
+            self.db_manager.get_stats(),
+            {
+                "total_folders": 2,
+                "total_stl_files": 2,
+                "total_gcode_files": 2,
+                "total_image_files": 0,
+                "total_pdf_files": 0,
+                "folders_with_gcode": 1,
+            },
+        )
+
+    def test_keyset_sort_columns_are_indexed(self):
+        """Created/updated folder and G-code sorts are served from an index"""
+        from sqlalchemy import text
+
+        with self.db_manager.engine.connect() as conn:
+            for table, column in (
+                ("folders", "created_at"),
+                ("folders", "updated_at"),
+                ("gcode_files", "created_at"),
+                ("gcode_files", "updated_at"),
+            ):
+                plan = conn.execute(
+                    text(
+                        f"EXPLAIN QUERY PLAN SELECT id FROM {table} "
+                        f"WHERE ({column} > '2024-01-01' OR ({column} = '2024-01-01' AND id > 3)) "
+                        f"ORDER BY {column}, id LIMIT 20"
+                    )
+                ).fetchall()
+                details = " ".join(str(row[-1]) for row in plan)
+                self.assertIn("USING", details, f"{table}.{column}: {details}")
+                self.assertNotIn("TEMP B-TREE", details, f"{table}.{column}: {details}")
+
+    def test_fallback_search_candidates_cached_until_index_changes(self):
+        """Fuzzy fallback candidates are loaded once per index build"""
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+
+        folders, _total = self.db_manager.search_stl_files_with_total("tset", 25)
+        self.assertEqual([folder["folder_name"] for folder in folders], ["test_folder"])
+
+        with patch.object(
+            self.db_manager, "_load_fallback_candidates", wraps=self.db_manager._load_fallback_candidates
+        ) as mock_load:
+            self.db_manager.search_stl_files_with_total("tset", 25)
+            mock_load.assert_not_called()
+
+            new_stl = os.path.join(self.test_folder, "bracket.stl")
+            with open(new_stl, "w") as f:
+                f.write("solid bracket\nendsolid bracket\n")
+            self.db_manager.add_stl_file("test_folder", "bracket.stl", "bracket.stl", new_stl)
+            self.db_manager.search_stl_files_with_total("brakcet", 25)
+            mock_load.assert_called_once()
+
+    def test_fallback_search_candidates_follow_writes_from_another_worker(self):
+        """Candidates cached by one process are reloaded after another one adds a file"""
+        self.db_manager.reload_index(self.stl_dir, self.gcode_dir)
+        other_worker = DatabaseManager(self.db_path)
+        other_worker.search_stl_files_with_total("tset", 25)
+
+        new_folder = os.path.join(self.stl_dir, "brackets")
+        os.makedirs(new_folder)
+        new_stl = os.path.join(new_folder, "corner.stl")
+        with open(new_stl, "w") as f:
+            f.write("solid corner\nendsolid corner\n")
+        self.db_manager.add_folder("brackets")
+        self.db_manager.add_stl_file("brackets", "corner.stl", "brackets/corner.stl", new_stl)
+
+        folders, _total = other_worker.search_stl_files_with_total("brakcets", 25)
+        self.assertIn("brackets", [folder["folder_name"] for folder in folders])
+        other_worker.engine.dispose()
+
     @patch("trinetra.integrations.moonraker.api.MoonrakerAPI")
     def test_reload_index_with_test_data(self, mock_moonraker_api_class):
         """Test end-to-end reload index with our test data"""
@@ -455,6 +455,24 @@ class TestSearchFunctions(unittest.TestCase):
         assert len(ranked) >= 1
         assert ranked[0]["folder_name"] == "pegboard_hooks"
 
+    def test_text_features_are_memoized_per_string(self):
+        search._text_features.cache_clear()
+        norm, tokens, token_set, trigrams = search._text_features("Pegboard_Hook-V2.stl")
+        self.assertEqual(norm, search.normalize_text("Pegboard_Hook-V2.stl"))
+        self.assertEqual(list(tokens), search.tokenize_text("Pegboard_Hook-V2.stl"))
+        self.assertEqual(token_set, frozenset(tokens))
+        self.assertIn("peg", trigrams)
+
+        first = search.compute_match_score("pegboard hook", "Pegboard_Hook-V2.stl")
+        second = search.compute_match_score("pegboard hook", "Pegboard_Hook-V2.stl")
+        self.assertEqual(first, second)
+        self.assertGreater(search._text_features.cache_info().hits, 0)
+
+    def test_tokenize_text_returns_independent_lists(self):
+        tokens = search.tokenize_text("benchy v2")
+        tokens.append("mutated")
+        self.assertEqual(search.tokenize_text("benchy v2"), ["benchy", "v2", "v", "2"])
+
 
 @pytest.mark.parametrize(
     "query,expected_positives,expected_negatives",
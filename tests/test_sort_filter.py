@@ -91,6 +91,7 @@ class TestSortFilter:
                 sort_order="desc",
                 filter_text="",
                 filter_type="all",
+                cursor=None,
             )
 
     def test_stl_files_api_sort_by_folder_name_asc(self):
@@ -1438,3 +1439,55 @@ class TestSortFilter:
             data = json.loads(response.data)
             assert data["files"] == []
             assert data["pagination"]["total_files"] == 0
+
+    # Keyset Pagination Tests
+
+    def _walk_with_cursor(self, url, key):
+        items = []
+        cursor = None
+        while True:
+            page_url = url if cursor is None else f"{url}&cursor={cursor}"
+            data = json.loads(self.client.get(page_url).data)
+            items.extend(data[key])
+            cursor = data["pagination"]["next_cursor"]
+            if cursor is None:
+                return items, data
+
+    def test_cursor_pagination_matches_page_pagination(self):
+        """Walking next_cursor should visit the same rows as page numbers, without counts."""
+        for i in range(7):
+            folder_path = os.path.join(self.stl_path, f"folder_{i % 3}_{i}")
+            os.makedirs(folder_path, exist_ok=True)
+            with open(os.path.join(folder_path, "part.stl"), "w") as f:
+                f.write("solid test\nendsolid test\n")
+            with open(os.path.join(self.gcode_path, f"job_{i}.gcode"), "w") as f:
+                f.write(";FLAVOR:Marlin\n")
+        self.client.post("/reload_index?mode=files")
+
+        for sort_by, sort_order in [("folder_name", "asc"), ("created_at", "desc")]:
+            url = f"/api/stl_files?per_page=2&sort_by={sort_by}&sort_order={sort_order}"
+            paged = []
+            for page in range(1, 5):
+                paged.extend(json.loads(self.client.get(f"{url}&page={page}").data)["folders"])
+            walked, last = self._walk_with_cursor(url, "folders")
+            assert [f["folder_name"] for f in walked] == [f["folder_name"] for f in paged]
+            assert len(walked) == 7
+            assert last["pagination"]["total_folders"] is None
+
+        url = "/api/gcode_files?per_page=3&sort_by=file_name&sort_order=desc"
+        walked, _ = self._walk_with_cursor(url, "files")
+        assert [f["file_name"] for f in walked] == [f"job_{i}.gcode" for i in range(6, -1, -1)]
+
+        # Files without stats sort on NULL print counts and must still all be visited once
+        for sort_order in ("asc", "desc"):
+            url = f"/api/gcode_files?per_page=2&sort_by=print_count&sort_order={sort_order}"
+            walked, _ = self._walk_with_cursor(url, "files")
+            assert sorted(f["file_name"] for f in walked) == sorted(
+                f"job_{i}.gcode" for i in range(7)
+            )
+
+    def test_cursor_pagination_rejects_malformed_cursor(self):
+        response = self.client.get("/api/stl_files?cursor=not-a-cursor")
+        assert response.status_code == 400
+        response = self.client.get("/api/gcode_files?cursor=not-a-cursor")
+        assert response.status_code == 400
@@ -174,6 +174,49 @@ def test_build_plate_stl_bytes():
         assert triangle_count == 1
 
 
+def test_load_3mf_project_reuses_parse_until_file_changes():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "synthetic.3mf")
+        _write_synthetic_3mf(path)
+
+        first = three_mf.load_3mf_project(path)
+        relative = os.path.relpath(path)
+        assert three_mf.load_3mf_project(relative) is first
+
+        _write_synthetic_3mf(path)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert three_mf.load_3mf_project(path) is not first
+
+
+def test_iter_plate_stl_chunks_matches_built_bytes():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "synthetic.3mf")
+        _write_synthetic_3mf(path)
+
+        parsed = three_mf.load_3mf_project(path)
+        chunks = list(three_mf.iter_plate_stl_chunks(parsed, 1, chunk_bytes=1))
+
+        assert len(chunks) == 2
+        assert len(chunks[0]) == 84
+        assert b"".join(chunks) == three_mf.build_plate_stl_bytes(parsed, 1)
+        assert three_mf.binary_stl_size(1) == len(b"".join(chunks))
+
+
+def test_iter_plate_stl_range_matches_slices():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "synthetic.3mf")
+        _write_synthetic_3mf(path)
+
+        parsed = three_mf.load_3mf_project(path)
+        full = three_mf.build_plate_stl_bytes(parsed, 1)
+        assert three_mf.compute_plate_stl_length(parsed, 1) == len(full)
+
+        for start, stop in [(0, 10), (80, 90), (84, 134), (100, len(full)), (0, len(full))]:
+            ranged = b"".join(three_mf.iter_plate_stl_range(parsed, 1, start, stop))
+            assert ranged == full[start:stop]
+
+
 def test_settings_and_model_metadata_summarization():
     raw_settings = {
         "layer_height": "0.2",
@@ -1,3 +1,4 @@
+import hashlib
 import os
 from typing import Any, Dict, Tuple
 
@@ -6,6 +7,12 @@ def _expand_path(path: str) -> str:
     return os.path.abspath(os.path.expanduser(path))
 
 
+def _is_single_root(config: Dict[str, Any]) -> bool:
+    return bool(config.get("base_path")) and not (
+        config.get("gcode_path") or config.get("database_path")
+    )
+
+
 def resolve_storage_paths(config: Dict[str, Any]) -> Tuple[str, str, str]:
     """
     Resolve STL, G-code, and DB paths from config.
@@ -17,11 +24,10 @@ def resolve_storage_paths(config: Dict[str, Any]) -> Tuple[str, str, str]:
       base_path/models, base_path/gcodes, base_path/system/trinetra.db.
     """
     base_path = _expand_path(str(config.get("base_path", "./stl_files")))
-    has_base_path = bool(config.get("base_path"))
     gcode_path = config.get("gcode_path")
     database_path = config.get("database_path")
 
-    if has_base_path and not gcode_path and not database_path:
+    if _is_single_root(config):
         stl_files_path = os.path.join(base_path, "models")
         gcode_files_path = os.path.join(base_path, "gcodes")
         db_path = os.path.join(base_path, "system", "trinetra.db")
@@ -31,3 +37,20 @@ def resolve_storage_paths(config: Dict[str, Any]) -> Tuple[str, str, str]:
     gcode_files_path = _expand_path(str(gcode_path or "./gcode_files"))
     db_path = _expand_path(str(database_path or "trinetra.db"))
     return stl_files_path, gcode_files_path, db_path
+
+
+def resolve_cache_root(config: Dict[str, Any], db_path: str) -> str:
+    """
+    Resolve the directory for regenerable caches (download archives, plate previews).
+
+    Single-root mode keeps them in base_path/system next to the database. Legacy configs
+    often leave the database in the working directory, so their caches go to the per-user
+    cache directory instead, in a subdirectory keyed by the database path.
+    """
+    if _is_single_root(config):
+        return os.path.dirname(db_path)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    db_key = hashlib.sha1(db_path.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_home, "trinetra", db_key)
@@ -3,14 +3,20 @@ Database manager for Trinetra 3D model manager.
 Handles all database operations and provides compatibility with existing app.py functions.
 """
 
+import base64
 import os
 import logging
 import re
 import json
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy import and_, func, insert, or_, select, text
 
 from trinetra.models import (
     Base,
@@ -23,6 +29,7 @@ from trinetra.models import (
     ThreeMFProjectCache,
     PrintHistoryEvent,
     IntegrationSyncState,
+    LibraryVersion,
     create_database_engine,
     init_database,
     create_session_factory,
@@ -36,19 +43,136 @@ from trinetra.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Parallelism for G-code header/trailer parsing during reload_index
+GCODE_METADATA_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Rows per executemany when reload_index writes walked STL, image and PDF files
+INDEX_INSERT_BATCH_SIZE = 5000
+
+# Library file kinds by lowercase extension, used to dispatch files during reload
+FILE_KIND_BY_EXTENSION = {
+    ".stl": "stl",
+    ".png": "image",
+    ".jpg": "image",
+    ".jpeg": "image",
+    ".gif": "image",
+    ".bmp": "image",
+    ".pdf": "pdf",
+    ".gcode": "gcode",
+}
+
+
+def scandir_walk(top: str):
+    """
+    Like os.walk(top), but yield (root, file_entries) with os.DirEntry objects.
+
+    Entries carry their d_type, and DirEntry.stat() caches its result, so callers get the
+    file kind, size and timestamps without extra stat calls. Directory symlinks are listed
+    but not followed, matching os.walk's default.
+    """
+    pending = [top]
+    while pending:
+        root = pending.pop()
+        file_entries = []
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            pending.append(entry.path)
+                    else:
+                        file_entries.append(entry)
+        except OSError:
+            continue
+        yield root, file_entries
+
+
+def _rel_dir_prefix(root: str, base_path: str) -> str:
+    """Relative path of root under base_path, ready to prepend to file names in root."""
+    rel_root = os.path.relpath(root, base_path)
+    return "" if rel_root == os.curdir else rel_root + os.sep
+
+
+def _entry_stat_fields(entry: os.DirEntry) -> Tuple[int, datetime, datetime]:
+    """(size, created_at, updated_at) of a directory entry from a single stat."""
+    try:
+        file_stat = entry.stat()
+    except OSError:
+        # Fallback to current time if we can't get file timestamps
+        now = datetime.utcnow()
+        return 0, now, now
+    return (
+        file_stat.st_size,
+        datetime.fromtimestamp(file_stat.st_ctime),
+        datetime.fromtimestamp(file_stat.st_mtime),
+    )
+
+
+FolderBundle = namedtuple(
+    "FolderBundle",
+    ["stl_files", "image_files", "pdf_files", "gcode_files", "three_mf_projects"],
+)
+
+
+def encode_page_cursor(sort_value: Any, row_id: int) -> str:
+    """Encode the last row's (sort value, id) as an opaque keyset pagination cursor."""
+    if isinstance(sort_value, datetime):
+        payload = ["dt", sort_value.isoformat(), row_id]
+    else:
+        payload = ["v", sort_value, row_id]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(cursor: str) -> Tuple[Any, int]:
+    """Decode a cursor from encode_page_cursor; raises ValueError when it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if kind == "dt":
+            sort_value = datetime.fromisoformat(sort_value)
+        elif kind != "v":
+            raise ValueError(kind)
+        return sort_value, int(row_id)
+    except (TypeError, ValueError, json.JSONDecodeError) as exc:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from exc
+
 
 class DatabaseManager:
     """Manages database operations for Trinetra."""
     THREE_MF_SUMMARY_VERSION = 1
+    THREE_MF_LISTING_CACHE_MAX = 256
+    FOLDER_CONTENTS_CACHE_MAX = 512
+    SEARCH_RESULTS_CACHE_MAX = 256
+    # Shared write counters: "files" covers folders and STL rows, "gcode" G-code rows and stats
+    LIBRARY_VERSION_NAMES = ("files", "gcode")
 
     def __init__(self, db_path="trinetra.db"):
         self.engine = create_database_engine(db_path)
         self.SessionFactory = create_session_factory(self.engine)
         init_database(self.engine)
+        self._seed_library_versions()
         logger.info(f"Database initialized at {db_path}")
         self.stl_base_path = None
         self.gcode_base_path = None
         self._search_index_available = False
+        # get_all_gcode_files snapshot, reused while the shared "gcode" version is unchanged
+        self._gcode_files_lock = threading.Lock()
+        self._gcode_files_cache: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+        # Per-folder 3MF listings validated against the mtimes of the directories walked
+        self._three_mf_listing_lock = threading.Lock()
+        self._three_mf_listing_cache: Dict[str, Tuple[Dict[str, int], List[str]]] = {}
+        # Full folder/file candidate list for fuzzy search, reused while "files" is unchanged
+        self._search_candidates_lock = threading.Lock()
+        self._search_candidates_cache: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+        # Per-folder DB contents, valid while neither shared library version moved
+        self._folder_contents_lock = threading.Lock()
+        self._folder_contents_cache: "OrderedDict[str, Tuple[Tuple[int, int], Tuple]]" = (
+            OrderedDict()
+        )
+        # Ranked search matches; typeahead clients resend the same query on every keystroke
+        self._search_results_lock = threading.Lock()
+        self._search_results_cache: "OrderedDict[Tuple, Any]" = OrderedDict()
         self._ensure_search_index()
         self.rebuild_search_index()
 
@@ -56,6 +180,38 @@ class DatabaseManager:
         """Get a new database session."""
         return self.SessionFactory()
 
+    def _seed_library_versions(self) -> None:
+        # Start from the clock so a recreated database never repeats an earlier version
+        seed = time.time_ns() // 1000
+        with self.engine.begin() as conn:
+            for name in self.LIBRARY_VERSION_NAMES:
+                conn.execute(
+                    text(
+                        "INSERT OR IGNORE INTO library_versions (name, version) "
+                        "VALUES (:name, :version)"
+                    ),
+                    {"name": name, "version": seed},
+                )
+
+    def library_versions(self, session: Optional[Session] = None) -> Dict[str, int]:
+        """Read the shared write counters, which every worker on this database sees."""
+        statement = select(LibraryVersion.name, LibraryVersion.version)
+        if session is not None:
+            rows = session.execute(statement).all()
+        else:
+            with self.engine.connect() as conn:
+                rows = conn.execute(statement).all()
+        return {name: version for name, version in rows}
+
+    def _bump_library_version(self, name: str, session: Optional[Session] = None) -> None:
+        """Advance a shared counter, inside the caller's transaction when one is given."""
+        statement = text("UPDATE library_versions SET version = version + 1 WHERE name = :name")
+        if session is not None:
+            session.execute(statement, {"name": name})
+            return
+        with self.engine.begin() as conn:
+            conn.execute(statement, {"name": name})
+
     def _three_mf_cache_scope_condition(self, folder_name: str):
         """Match cache rows belonging to a folder (real or virtual root-level folder)."""
         return or_(
@@ -94,12 +250,12 @@ class DatabaseManager:
             return set()
 
         rel_paths: set[str] = set()
-        for root, _dirs, files in os.walk(self.stl_base_path):
-            for file_name in files:
-                if not file_name.lower().endswith(".3mf"):
+        for root, file_entries in scandir_walk(self.stl_base_path):
+            rel_prefix = _rel_dir_prefix(root, self.stl_base_path)
+            for file_entry in file_entries:
+                if not file_entry.name.lower().endswith(".3mf"):
                     continue
-                abs_path = os.path.join(root, file_name)
-                rel_paths.add(os.path.relpath(abs_path, self.stl_base_path))
+                rel_paths.add(rel_prefix + file_entry.name)
         return rel_paths
 
     def _prune_three_mf_cache_deleted_files(self, valid_rel_paths: set[str]) -> int:
@@ -144,11 +300,19 @@ class DatabaseManager:
 
     def rebuild_search_index(self) -> None:
         """Rebuild search index from current database rows."""
-        if not self._search_index_available:
-            return
-        with self.get_session() as session:
-            self._rebuild_search_index_locked(session)
-            session.commit()
+        if self._search_index_available:
+            with self.get_session() as session:
+                self._rebuild_search_index_locked(session)
+                self.invalidate_search_candidates_cache(session)
+                session.commit()
+        else:
+            self.invalidate_search_candidates_cache()
+
+    def invalidate_search_candidates_cache(self, session: Optional[Session] = None) -> None:
+        """Bump the shared "files" version after folder or STL rows change."""
+        self._bump_library_version("files", session)
+        with self._search_candidates_lock:
+            self._search_candidates_cache = None
 
     def _rebuild_search_index_locked(self, session: Session) -> None:
         """Rebuild FTS table inside an existing session."""
@@ -206,6 +370,40 @@ class DatabaseManager:
             return datetime.utcnow() - timedelta(days=7)
         return None
 
+    @staticmethod
+    def _apply_keyset_order(query, order_column, id_column, descending: bool, cursor):
+        """
+        Order by (order_column, id) and, when a cursor is given, seek past it.
+
+        SQLite sorts NULLs first ascending and last descending, so NULL sort
+        values get their own branch of the seek condition.
+        """
+        if descending:
+            query = query.order_by(order_column.desc(), id_column.desc())
+        else:
+            query = query.order_by(order_column.asc(), id_column.asc())
+        if cursor is None:
+            return query
+
+        sort_value, row_id = cursor
+        if sort_value is None:
+            after_id = id_column < row_id if descending else id_column > row_id
+            seek = and_(order_column.is_(None), after_id)
+            if not descending:
+                seek = or_(seek, order_column.isnot(None))
+        elif descending:
+            seek = or_(
+                order_column < sort_value,
+                and_(order_column == sort_value, id_column < row_id),
+                order_column.is_(None),
+            )
+        else:
+            seek = or_(
+                order_column > sort_value,
+                and_(order_column == sort_value, id_column > row_id),
+            )
+        return query.filter(seek)
+
     def _apply_stl_sorting(self, query, sort_by: str, sort_order: str):
         descending = sort_order.lower() == "desc"
         if sort_by == "file_name":
@@ -262,6 +460,20 @@ class DatabaseManager:
             return []
 
     def _fetch_fallback_candidates(self, session: Session) -> List[Dict[str, Any]]:
+        # Typo-tolerant queries that FTS misses score every folder and file; loading that list
+        # once per index build keeps each keystroke from re-reading both tables
+        version = self.library_versions(session).get("files")
+        with self._search_candidates_lock:
+            cached = self._search_candidates_cache
+        if cached is not None and cached[0] == version:
+            return list(cached[1])
+
+        candidates = self._load_fallback_candidates(session)
+        with self._search_candidates_lock:
+            self._search_candidates_cache = (version, candidates)
+        return list(candidates)
+
+    def _load_fallback_candidates(self, session: Session) -> List[Dict[str, Any]]:
         folders = session.query(Folder.id, Folder.name).all()
         files = (
             session.query(STLFile.id, STLFile.folder_id, STLFile.file_name, STLFile.rel_path, Folder.name)
@@ -295,12 +507,54 @@ class DatabaseManager:
             )
         return candidates
 
+    @staticmethod
+    def _search_key_text(query: str) -> str:
+        # Ranking only looks at the normalized query; queries that normalize to nothing keep
+        # their raw text so "" (list everything) and "!!" (match nothing) stay apart
+        return search.normalize_text(query) or query.strip()
+
+    def _cached_search_result(self, key: Tuple, compute) -> Any:
+        """
+        Return compute()'s result for key, reusing it until the library versions change.
+
+        Callers key on _search_key_text(query) plus the shared library version their
+        results depend on, so a write in any worker retires the entry.
+        """
+        with self._search_results_lock:
+            if key in self._search_results_cache:
+                self._search_results_cache.move_to_end(key)
+                return self._search_results_cache[key]
+        result = compute()
+        with self._search_results_lock:
+            self._search_results_cache[key] = result
+            self._search_results_cache.move_to_end(key)
+            while len(self._search_results_cache) > self.SEARCH_RESULTS_CACHE_MAX:
+                self._search_results_cache.popitem(last=False)
+        return result
+
     def _search_folder_matches(
         self,
         session: Session,
         query_text: str,
         filter_type: str,
         limit: int = 400,
+    ) -> List[Dict[str, Any]]:
+        if self._filter_cutoff(filter_type) is not None:
+            # Date filters move with the clock, so their matches are never reused
+            return self._rank_folder_matches(session, query_text, filter_type, limit)
+        version = self.library_versions(session).get("files")
+        key = ("folders", version, self._search_key_text(query_text), limit)
+        matches = self._cached_search_result(
+            key, lambda: self._rank_folder_matches(session, query_text, filter_type, limit)
+        )
+        return list(matches)
+
+    def _rank_folder_matches(
+        self,
+        session: Session,
+        query_text: str,
+        filter_type: str,
+        limit: int = 400,
     ) -> List[Dict[str, Any]]:
         candidates = self._fetch_fts_candidates(session, query_text, max(limit, 200))
         if len(candidates) < 40:
@@ -414,6 +668,11 @@ class DatabaseManager:
         }
         with self.get_session() as session:
             try:
+                # Metadata of unchanged G-code files is carried over instead of re-parsed;
+                # the rest is queued and parsed in parallel once the walk is done
+                gcode_metadata_cache = self._snapshot_gcode_metadata(session)
+                pending_gcode_metadata: List[GCodeFile] = []
+
                 # Clear all existing data. Keep this uncommitted until a successful rebuild
                 # so a scan/index failure cannot leave the DB empty.
                 session.query(GCodeFile).delete()
@@ -424,7 +683,9 @@ class DatabaseManager:
 
                 # Process STL base path
                 if os.path.exists(stl_base_path):
-                    stl_counts = self._process_stl_base_path(session, stl_base_path)
+                    stl_counts = self._process_stl_base_path(
+                        session, stl_base_path, gcode_metadata_cache, pending_gcode_metadata
+                    )
                     # Add STL base path counts to total counts
                     for key, value in stl_counts.items():
                         if key in counts:
@@ -435,7 +696,11 @@ class DatabaseManager:
                 # Process GCODE base path
                 if os.path.exists(gcode_base_path):
                     gcode_counts = self._process_gcode_base_path(
-                        session, gcode_base_path, stl_base_path
+                        session,
+                        gcode_base_path,
+                        stl_base_path,
+                        gcode_metadata_cache,
+                        pending_gcode_metadata,
                     )
                     # Add GCODE base path counts to total counts
                     for key, value in gcode_counts.items():
@@ -444,7 +709,10 @@ class DatabaseManager:
                         else:
                             counts[key] = value
 
+                self._extract_pending_gcode_metadata(pending_gcode_metadata)
                 self._rebuild_search_index_locked(session)
+                self.invalidate_gcode_files_cache(session)
+                self.invalidate_search_candidates_cache(session)
                 session.commit()
             except Exception:
                 session.rollback()
@@ -462,69 +730,59 @@ class DatabaseManager:
 
         # Update Moonraker stats only after file/index transaction is committed.
         if moonraker_url:
-            logger.debug(f"Updating Moonraker stats from URL: {moonraker_url}")
+            logger.debug("Updating Moonraker stats from URL: %s", moonraker_url)
             stats_result = self.update_moonraker_stats(moonraker_url, moonraker_client)
-            logger.debug(f"Moonraker stats update result: {stats_result}")
+            logger.debug("Moonraker stats update result: %s", stats_result)
             counts["moonraker_stats_updated"] = stats_result["updated"]
             counts["moonraker_stats_failed"] = stats_result["failed"]
 
         logger.info(f"Index reload completed: {counts}")
         return counts
 
-    def _process_stl_base_path(self, session: Session, stl_base_path: str) -> Dict[str, int]:
+    def _process_stl_base_path(
+        self,
+        session: Session,
+        stl_base_path: str,
+        gcode_metadata_cache: Optional[Dict[str, Tuple[Any, Any, Optional[str]]]] = None,
+        pending_gcode_metadata: Optional[List[GCodeFile]] = None,
+    ) -> Dict[str, int]:
         """Process STL base path and extract all files."""
         counts = {"folders": 0, "stl_files": 0, "image_files": 0, "pdf_files": 0}
+        # reload_index cleared every table, so the walk itself is the only source of rows.
+        # STL, image and PDF rows are plain dicts written with executemany in batches; the
+        # ORM would otherwise issue one INSERT per file to fetch each new primary key.
+        folder_names = set()
+        pending_rows: Dict[Any, List[Dict[str, Any]]] = {STLFile: [], ImageFile: [], PDFFile: []}
+
+        def write_pending_rows(min_rows: int = 1) -> None:
+            for model, rows in pending_rows.items():
+                if len(rows) >= min_rows:
+                    session.execute(insert(model), rows)
+                    rows.clear()
 
         # Only process top-level folders
         for entry in os.scandir(stl_base_path):
             if entry.is_dir():
                 folder_name = entry.name
                 folder_path = entry.path
-
-                # Create or get folder
-                folder = session.query(Folder).filter(Folder.name == folder_name).first()
-                if not folder:
-                    # Get folder timestamps
-                    try:
-                        ctime = os.path.getctime(folder_path)
-                        mtime = os.path.getmtime(folder_path)
-                        created_at = datetime.fromtimestamp(ctime)
-                        updated_at = datetime.fromtimestamp(mtime)
-                    except OSError:
-                        # Fallback to current time if we can't get folder timestamps
-                        created_at = datetime.utcnow()
-                        updated_at = datetime.utcnow()
-
-                    folder = Folder(name=folder_name, created_at=created_at, updated_at=updated_at)
-                    session.add(folder)
-                    session.flush()  # Get the ID
-                    counts["folders"] += 1
+                folder_rows: List[Tuple[Any, Dict[str, Any]]] = []
+                folder_gcode_files: List[GCodeFile] = []
 
                 # Process all files in this folder recursively
                 folder_created_at = None
                 folder_updated_at = None
 
-                for root, dirs, files in os.walk(folder_path):
-                    for file in files:
-                        abs_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(abs_path, stl_base_path)
+                for root, file_entries in scandir_walk(folder_path):
+                    rel_prefix = _rel_dir_prefix(root, stl_base_path)
+                    for file_entry in file_entries:
+                        file = file_entry.name
+                        abs_path = file_entry.path
+                        rel_path = rel_prefix + file
                         ext = os.path.splitext(file)[1].lower()
-
-                        try:
-                            file_size = os.path.getsize(abs_path)
-                        except OSError:
-                            file_size = 0
-
-                        # Get file timestamps
-                        try:
-                            ctime = os.path.getctime(abs_path)
-                            mtime = os.path.getmtime(abs_path)
-                            file_created_at = datetime.fromtimestamp(ctime)
-                            file_updated_at = datetime.fromtimestamp(mtime)
-                        except OSError:
-                            # Fallback to current time if we can't get file timestamps
-                            file_created_at = datetime.utcnow()
-                            file_updated_at = datetime.utcnow()
+                        kind = FILE_KIND_BY_EXTENSION.get(ext)
+                        file_size, file_created_at, file_updated_at = _entry_stat_fields(
+                            file_entry
+                        )
 
                         # Update folder timestamps if this file is newer
                         if folder_created_at is None or file_created_at < folder_created_at:
@@ -532,114 +790,72 @@ class DatabaseManager:
                         if folder_updated_at is None or file_updated_at > folder_updated_at:
                             folder_updated_at = file_updated_at
 
-                        if ext == ".stl":
-                            # Check if STL file already exists
-                            existing = (
-                                session.query(STLFile)
-                                .filter(
-                                    and_(
-                                        STLFile.folder_id == folder.id, STLFile.rel_path == rel_path
-                                    )
-                                )
-                                .first()
-                            )
-                            if not existing:
-                                stl_file = STLFile(
-                                    folder_id=folder.id,
-                                    file_name=file,
-                                    rel_path=rel_path,
-                                    abs_path=abs_path,
-                                    file_size=file_size,
-                                    created_at=file_created_at,
-                                    updated_at=file_updated_at,
-                                )
-                                session.add(stl_file)
-                                counts["stl_files"] += 1
-
-                        elif ext in [".png", ".jpg", ".jpeg", ".gif", ".bmp"]:
-                            existing = (
-                                session.query(ImageFile)
-                                .filter(
-                                    and_(
-                                        ImageFile.folder_id == folder.id,
-                                        ImageFile.rel_path == rel_path,
-                                    )
-                                )
-                                .first()
-                            )
-                            if not existing:
-                                image_file = ImageFile(
-                                    folder_id=folder.id,
-                                    file_name=file,
-                                    rel_path=rel_path,
-                                    abs_path=abs_path,
-                                    file_size=file_size,
-                                    extension=ext,
-                                    created_at=file_created_at,
-                                    updated_at=file_updated_at,
-                                )
-                                session.add(image_file)
-                                counts["image_files"] += 1
-
-                        elif ext == ".pdf":
-                            existing = (
-                                session.query(PDFFile)
-                                .filter(
-                                    and_(
-                                        PDFFile.folder_id == folder.id, PDFFile.rel_path == rel_path
-                                    )
-                                )
-                                .first()
-                            )
-                            if not existing:
-                                pdf_file = PDFFile(
-                                    folder_id=folder.id,
-                                    file_name=file,
-                                    rel_path=rel_path,
-                                    abs_path=abs_path,
-                                    file_size=file_size,
-                                    created_at=file_created_at,
-                                    updated_at=file_updated_at,
-                                )
-                                session.add(pdf_file)
-                                counts["pdf_files"] += 1
-
-                        elif ext == ".gcode":
+                        row = {
+                            "file_name": file,
+                            "rel_path": rel_path,
+                            "abs_path": abs_path,
+                            "file_size": file_size,
+                            "created_at": file_created_at,
+                            "updated_at": file_updated_at,
+                        }
+                        if kind == "stl":
+                            folder_rows.append((STLFile, row))
+                            counts["stl_files"] += 1
+
+                        elif kind == "image":
+                            row["extension"] = ext
+                            folder_rows.append((ImageFile, row))
+                            counts["image_files"] += 1
+
+                        elif kind == "pdf":
+                            folder_rows.append((PDFFile, row))
+                            counts["pdf_files"] += 1
+
+                        elif kind == "gcode":
                             # Process G-code files in STL base path
-                            metadata = self._extract_gcode_metadata(abs_path)
-                            existing = (
-                                session.query(GCodeFile)
-                                .filter(
-                                    and_(
-                                        GCodeFile.folder_id == folder.id,
-                                        GCodeFile.rel_path == rel_path,
-                                    )
-                                )
-                                .first()
+                            gcode_file = GCodeFile(base_path="STL_BASE_PATH", **row)
+                            self._apply_gcode_metadata(
+                                gcode_file, gcode_metadata_cache, pending_gcode_metadata
+                            )
+                            folder_gcode_files.append(gcode_file)
+                            counts["gcode_files"] = counts.get("gcode_files", 0) + 1
+                            logger.debug(
+                                "Processed G-code file in STL base path: %s (rel_path: %s)",
+                                file,
+                                rel_path,
                             )
-                            if not existing:
-                                gcode_file = GCodeFile(
-                                    folder_id=folder.id,
-                                    file_name=file,
-                                    rel_path=rel_path,
-                                    abs_path=abs_path,
-                                    file_size=file_size,
-                                    base_path="STL_BASE_PATH",
-                                    created_at=file_created_at,
-                                    updated_at=file_updated_at,
-                                )
-                                gcode_file.set_metadata(metadata)
-                                session.add(gcode_file)
-                                counts["gcode_files"] = counts.get("gcode_files", 0) + 1
-                                logger.debug(
-                                    f"Processed G-code file in STL base path: {file} (rel_path: {rel_path})"
-                                )
-
-                # Update folder timestamps to reflect the most recent file timestamps
-                if folder_created_at is not None:
-                    folder.created_at = folder_created_at
-                if folder_updated_at is not None:
-                    folder.updated_at = folder_updated_at
+
+                # Folder timestamps reflect the oldest and newest files inside it
+                if folder_created_at is None or folder_updated_at is None:
+                    try:
+                        ctime = os.path.getctime(folder_path)
+                        mtime = os.path.getmtime(folder_path)
+                        created_at = datetime.fromtimestamp(ctime)
+                        updated_at = datetime.fromtimestamp(mtime)
+                    except OSError:
+                        # Fallback to current time if we can't get folder timestamps
+                        created_at = datetime.utcnow()
+                        updated_at = datetime.utcnow()
+                    folder_created_at = folder_created_at or created_at
+                    folder_updated_at = folder_updated_at or updated_at
+
+                folder = Folder(
+                    name=folder_name, created_at=folder_created_at, updated_at=folder_updated_at
+                )
+                session.add(folder)
+                session.flush()  # Get the ID
+                folder_names.add(folder_name)
+                counts["folders"] += 1
+
+                for model, row in folder_rows:
+                    row["folder_id"] = folder.id
+                    pending_rows[model].append(row)
+                for gcode_file in folder_gcode_files:
+                    gcode_file.folder_id = folder.id
+                    session.add(gcode_file)
+                write_pending_rows(INDEX_INSERT_BATCH_SIZE)
+
+        write_pending_rows()
 
         # Also support standalone top-level 3MF files as virtual projects.
         # Example: <base>/swirl_lamp.3mf -> folder entry "swirl_lamp"
@@ -650,17 +866,10 @@ class DatabaseManager:
                 continue
 
             virtual_folder_name = os.path.splitext(entry.name)[0]
-            colliding_dir = os.path.join(stl_base_path, virtual_folder_name)
-            if os.path.isdir(colliding_dir):
+            if virtual_folder_name in folder_names:
                 # Real folder of same name takes precedence.
                 continue
 
-            existing_folder = (
-                session.query(Folder).filter(Folder.name == virtual_folder_name).first()
-            )
-            if existing_folder:
-                continue
-
             try:
                 ctime = os.path.getctime(entry.path)
                 mtime = os.path.getmtime(entry.path)
@@ -673,6 +882,7 @@ class DatabaseManager:
             session.add(
                 Folder(name=virtual_folder_name, created_at=created_at, updated_at=updated_at)
             )
+            folder_names.add(virtual_folder_name)
             counts["folders"] += 1
 
         logger.debug(
@@ -684,7 +894,12 @@ class DatabaseManager:
         return counts
 
     def _process_gcode_base_path(
-        self, session: Session, gcode_base_path: str, stl_base_path: str
+        self,
+        session: Session,
+        gcode_base_path: str,
+        stl_base_path: str,
+        gcode_metadata_cache: Optional[Dict[str, Tuple[Any, Any, Optional[str]]]] = None,
+        pending_gcode_metadata: Optional[List[GCodeFile]] = None,
     ) -> Dict[str, int]:
         """Process GCODE base path and link with STL files."""
         counts = {"gcode_files": 0}
@@ -697,31 +912,21 @@ class DatabaseManager:
         for stl_file in stl_files:
             stl_filename = os.path.splitext(stl_file.file_name)[0]
             stl_bases[stl_filename] = stl_file
+        max_stl_base_len = max((len(name) for name in stl_bases), default=0)
 
         # Process all G-code files
         folder_timestamps = {}  # Track timestamps for each folder
+        # Existing rows were cleared by reload_index, so only this walk can produce duplicates
+        seen_rel_paths = set()
 
-        for root, dirs, files in os.walk(gcode_base_path):
-            for file in files:
+        for root, file_entries in scandir_walk(gcode_base_path):
+            rel_prefix = _rel_dir_prefix(root, gcode_base_path)
+            for file_entry in file_entries:
+                file = file_entry.name
                 if file.lower().endswith(".gcode"):
-                    abs_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(abs_path, gcode_base_path)
-
-                    try:
-                        file_size = os.path.getsize(abs_path)
-                    except OSError:
-                        file_size = 0
-
-                    # Get file timestamps
-                    try:
-                        ctime = os.path.getctime(abs_path)
-                        mtime = os.path.getmtime(abs_path)
-                        file_created_at = datetime.fromtimestamp(ctime)
-                        file_updated_at = datetime.fromtimestamp(mtime)
-                    except OSError:
-                        # Fallback to current time if we can't get file timestamps
-                        file_created_at = datetime.utcnow()
-                        file_updated_at = datetime.utcnow()
+                    abs_path = file_entry.path
+                    rel_path = rel_prefix + file
+                    file_size, file_created_at, file_updated_at = _entry_stat_fields(file_entry)
 
                     # Try to find matching STL file
                     gcode_base = self._split_base(file)
@@ -729,14 +934,12 @@ class DatabaseManager:
                     matching_folder = None
 
                     # Find STL filename that is prefix of gcode base (most specific/longest match)
+                    # by probing the G-code name's own prefixes, longest first
                     matching_stl_filename = None
-                    max_match_len = 0
-                    for stl_filename in stl_bases:
-                        if gcode_base.startswith(stl_filename):
-                            # Prefer the longest matching prefix
-                            if len(stl_filename) > max_match_len:
-                                matching_stl_filename = stl_filename
-                                max_match_len = len(stl_filename)
+                    for prefix_len in range(min(len(gcode_base), max_stl_base_len), 0, -1):
+                        if gcode_base[:prefix_len] in stl_bases:
+                            matching_stl_filename = gcode_base[:prefix_len]
+                            break
 
                     if matching_stl_filename:
                         matching_stl = stl_bases[matching_stl_filename]
@@ -756,20 +959,8 @@ class DatabaseManager:
                             if file_updated_at > folder_timestamps[folder_id]["updated_at"]:
                                 folder_timestamps[folder_id]["updated_at"] = file_updated_at
 
-                    # Check if G-code file already exists
-                    existing = (
-                        session.query(GCodeFile)
-                        .filter(
-                            and_(
-                                GCodeFile.rel_path == rel_path,
-                                GCodeFile.base_path == "GCODE_BASE_PATH",
-                            )
-                        )
-                        .first()
-                    )
-
-                    if not existing:
-                        metadata = self._extract_gcode_metadata(abs_path)
+                    if rel_path not in seen_rel_paths:
+                        seen_rel_paths.add(rel_path)
                         gcode_file = GCodeFile(
                             folder_id=matching_folder.id if matching_folder else None,
                             stl_file_id=matching_stl.id if matching_stl else None,
@@ -781,14 +972,16 @@ class DatabaseManager:
                             created_at=file_created_at,
                             updated_at=file_updated_at,
                         )
-                        gcode_file.set_metadata(metadata)
+                        self._apply_gcode_metadata(
+                            gcode_file, gcode_metadata_cache, pending_gcode_metadata
+                        )
                         session.add(gcode_file)
                         counts["gcode_files"] += 1
-                        logger.debug(f"Processed G-code file: {file} (rel_path: {rel_path})")
+                        logger.debug("Processed G-code file: %s (rel_path: %s)", file, rel_path)
 
         # Update folder timestamps to reflect the most recent file timestamps
         for folder_id, timestamps in folder_timestamps.items():
-            folder = session.query(Folder).filter(Folder.id == folder_id).first()
+            folder = session.get(Folder, folder_id)
             if folder:
                 folder.created_at = timestamps["created_at"]
                 folder.updated_at = timestamps["updated_at"]
@@ -805,11 +998,52 @@ class DatabaseManager:
         """Get base name from filename (without extension)."""
         return os.path.splitext(filename)[0]
 
+    @staticmethod
+    def _snapshot_gcode_metadata(
+        session: Session,
+    ) -> Dict[str, Tuple[Any, Any, Optional[str]]]:
+        """Map indexed G-code paths to (file_size, updated_at, metadata_json) before a reload."""
+        rows = session.query(
+            GCodeFile.abs_path, GCodeFile.file_size, GCodeFile.updated_at, GCodeFile.metadata_json
+        ).all()
+        return {row.abs_path: (row.file_size, row.updated_at, row.metadata_json) for row in rows}
+
+    def _apply_gcode_metadata(
+        self,
+        gcode_file: GCodeFile,
+        gcode_metadata_cache: Optional[Dict[str, Tuple[Any, Any, Optional[str]]]],
+        pending_gcode_metadata: Optional[List[GCodeFile]] = None,
+    ) -> None:
+        """Reuse snapshotted metadata when size and mtime are unchanged, otherwise parse the file."""
+        cached = (gcode_metadata_cache or {}).get(gcode_file.abs_path)
+        if cached is not None and cached[:2] == (gcode_file.file_size, gcode_file.updated_at):
+            gcode_file.metadata_json = cached[2]
+        elif pending_gcode_metadata is not None:
+            pending_gcode_metadata.append(gcode_file)
+        else:
+            gcode_file.set_metadata(self._extract_gcode_metadata(gcode_file.abs_path))
+
+    def _extract_pending_gcode_metadata(self, gcode_files: List[GCodeFile]) -> None:
+        """Parse queued G-code files on a thread pool; file reads release the GIL."""
+        if not gcode_files:
+            return
+        paths = [gcode_file.abs_path for gcode_file in gcode_files]
+        if len(paths) == 1:
+            results = [self._extract_gcode_metadata(paths[0])]
+        else:
+            workers = min(GCODE_METADATA_MAX_WORKERS, len(paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._extract_gcode_metadata, paths))
+        # ORM objects are only touched from this thread
+        for gcode_file, metadata in zip(gcode_files, results):
+            gcode_file.set_metadata(metadata)
+            # Rows may already be flushed; keep the file mtime instead of the onupdate default
+            flag_modified(gcode_file, "updated_at")
+
     def _extract_gcode_metadata(self, file_path: str) -> Dict[str, Any]:
         """Extract metadata from G-code file."""
         try:
-            with open(file_path, encoding="utf-8", errors="ignore") as file:
-                return gcode_handler.extract_gcode_metadata(file)
+            return gcode_handler.extract_gcode_metadata_from_path(file_path)
         except Exception as e:
             logger.error(f"Error reading G-code file {file_path}: {e}")
             return {}
@@ -817,18 +1051,24 @@ class DatabaseManager:
     def get_stl_files(self) -> List[Dict[str, Any]]:
         """Get all STL files organized by folders (compatible with existing app.py)."""
         with self.get_session() as session:
-            folders = session.query(Folder).all()
+            # Plain rows, since refreshing 3MF caches below may commit and expire ORM objects
+            folders = session.query(Folder.id, Folder.name).all()
             result = []
 
-            for folder in folders:
-                stl_files = session.query(STLFile).filter(STLFile.folder_id == folder.id).all()
-                three_mf_projects = self.get_folder_three_mf_projects(folder.name)
-                folder_files = []
-                for stl_file in stl_files:
-                    folder_files.append(
-                        {"file_name": stl_file.file_name, "rel_path": stl_file.rel_path}
-                    )
+            # One query for every folder's STL rows instead of one per folder
+            files_by_folder: Dict[int, List[Dict[str, str]]] = {}
+            stl_rows = session.query(
+                STLFile.folder_id, STLFile.file_name, STLFile.rel_path
+            ).order_by(STLFile.id.asc())
+            for row in stl_rows:
+                files_by_folder.setdefault(row.folder_id, []).append(
+                    {"file_name": row.file_name, "rel_path": row.rel_path}
+                )
 
+            for folder in folders:
+                # 3MF projects are discovered on disk, so they are read live in this session
+                three_mf_projects = self._get_folder_three_mf_projects_locked(session, folder.name)
+                folder_files = files_by_folder.get(folder.id, [])
                 has_three_mf = bool(three_mf_projects)
                 if folder_files or has_three_mf:
                     result.append(
@@ -850,6 +1090,7 @@ class DatabaseManager:
         sort_order: str = "asc",
         filter_text: str = "",
         filter_type: str = "all",
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Get STL files with pagination, sorting, and filtering.
 
@@ -860,6 +1101,8 @@ class DatabaseManager:
             sort_order: Sort order ('asc' or 'desc')
             filter_text: Text to filter folders/files by
             filter_type: Type of filter to apply ('all', 'today')
+            cursor: pagination.next_cursor from a previous page; seeks instead of
+                using page and skips the total counts (ignored for text filters)
         """
         page = max(1, int(page or 1))
         per_page = int(per_page or 15)
@@ -932,6 +1175,7 @@ class DatabaseManager:
                         "total_folders": total_folders,
                         "total_files": total_files,
                         "total_pages": (total_folders + per_page - 1) // per_page,
+                        "next_cursor": None,
                     },
                     "filter": {
                         "text": filter_text,
@@ -959,16 +1203,26 @@ class DatabaseManager:
             else:
                 order_column = Folder.name  # Default sorting
 
-            if sort_order.lower() == "desc":
-                query = query.order_by(order_column.desc())
-            else:
-                query = query.order_by(order_column.asc())
+            # Get total count for pagination; cursor requests skip the COUNT scan
+            total_folders = query.count() if cursor is None else None
 
-            # Get total count for pagination
-            total_folders = query.count()
+            query = self._apply_keyset_order(
+                query.add_columns(order_column),
+                order_column,
+                Folder.id,
+                sort_order.lower() == "desc",
+                decode_page_cursor(cursor) if cursor is not None else None,
+            )
 
-            # Apply pagination
-            folders = query.offset((page - 1) * per_page).limit(per_page).all()
+            # Apply pagination (one extra row tells us whether a next page exists)
+            if cursor is None:
+                query = query.offset((page - 1) * per_page)
+            rows = query.limit(per_page + 1).all()
+            next_cursor = None
+            if len(rows) > per_page:
+                rows = rows[:per_page]
+                next_cursor = encode_page_cursor(rows[-1][1], rows[-1][0].id)
+            folders = [row[0] for row in rows]
 
             result = []
             total_files = 0
@@ -1010,7 +1264,10 @@ class DatabaseManager:
                     "per_page": per_page,
                     "total_folders": total_folders,
                     "total_files": total_files,
-                    "total_pages": (total_folders + per_page - 1) // per_page,
+                    "total_pages": (total_folders + per_page - 1) // per_page
+                    if total_folders is not None
+                    else None,
+                    "next_cursor": next_cursor,
                 },
                 "filter": {
                     "text": filter_text,
@@ -1020,140 +1277,185 @@ class DatabaseManager:
                 },
             }
 
-    def get_folder_contents(self, folder_name: str) -> Tuple[List, List, List, List]:
-        """Get contents of a specific folder (compatible with existing app.py)."""
-        with self.get_session() as session:
-            folder = session.query(Folder).filter(Folder.name == folder_name).first()
-            if not folder:
-                return [], [], [], []
-
-            # Get STL files
-            stl_files = []
-            for stl_file in folder.stl_files:
-                stl_files.append(
-                    {
-                        "file_name": stl_file.file_name,
-                        "path": "STL_BASE_PATH",
-                        "rel_path": stl_file.rel_path,
-                    }
-                )
-
-            # Get image files
-            image_files = []
-            for image_file in folder.image_files:
-                image_files.append(
-                    {
-                        "file_name": image_file.file_name,
-                        "path": "STL_BASE_PATH",
-                        "rel_path": image_file.rel_path,
-                        "ext": image_file.extension,
-                    }
-                )
+    @staticmethod
+    def _gcode_stats_payload(gcode_file: GCodeFile) -> Optional[Dict[str, Any]]:
+        """Serialize a G-code file's print stats, or None when it has none."""
+        if not gcode_file.stats:
+            return None
+        stats = gcode_file.stats[0] if isinstance(gcode_file.stats, list) else gcode_file.stats
+        # Calculate average duration in seconds
+        avg_duration = 0
+        if stats.print_count > 0 and stats.total_print_time > 0:
+            avg_duration = stats.total_print_time / stats.print_count
+
+        return {
+            "print_count": stats.print_count,
+            "successful_prints": stats.successful_prints,
+            "canceled_prints": stats.canceled_prints,
+            "avg_duration": avg_duration,
+            "total_print_time": stats.total_print_time,
+            "total_filament_used": stats.total_filament_used,
+            "last_print_date": stats.last_print_date.isoformat()
+            if stats.last_print_date
+            else None,
+            "success_rate": stats.success_rate,
+            "job_id": stats.job_id,
+            "last_status": stats.last_status,
+        }
 
-            # Get PDF files
-            pdf_files = []
-            for pdf_file in folder.pdf_files:
-                pdf_files.append(
-                    {
-                        "file_name": pdf_file.file_name,
-                        "path": "STL_BASE_PATH",
-                        "rel_path": pdf_file.rel_path,
-                        "ext": ".pdf",
-                    }
-                )
+    @classmethod
+    def _folder_gcode_payload(cls, gcode_file: GCodeFile) -> Dict[str, Any]:
+        return {
+            "file_name": gcode_file.file_name,
+            "path": gcode_file.base_path,
+            "rel_path": gcode_file.rel_path,
+            "metadata": gcode_file.get_metadata(),
+            "stats": cls._gcode_stats_payload(gcode_file),
+        }
 
-            # Get G-code files (both from STL and GCODE base paths)
-            gcode_files = []
-            for gcode_file in folder.gcode_files:
-                # Get stats data if available
-                stats_data = None
-                if gcode_file.stats:
-                    stats = (
-                        gcode_file.stats[0]
-                        if isinstance(gcode_file.stats, list)
-                        else gcode_file.stats
-                    )
-                    # Calculate average duration in seconds
-                    avg_duration = 0
-                    if stats.print_count > 0 and stats.total_print_time > 0:
-                        avg_duration = stats.total_print_time / stats.print_count
+    def _get_folder_contents_locked(
+        self, session: Session, folder_name: str
+    ) -> Tuple[List, List, List, List]:
+        # Load every relationship the page needs up front instead of one lazy query per row
+        folder = (
+            session.query(Folder)
+            .options(
+                selectinload(Folder.stl_files)
+                .selectinload(STLFile.gcode_files)
+                .selectinload(GCodeFile.stats),
+                selectinload(Folder.image_files),
+                selectinload(Folder.pdf_files),
+                selectinload(Folder.gcode_files).selectinload(GCodeFile.stats),
+            )
+            .filter(Folder.name == folder_name)
+            .first()
+        )
+        if not folder:
+            return [], [], [], []
+
+        stl_files = [
+            {
+                "file_name": stl_file.file_name,
+                "path": "STL_BASE_PATH",
+                "rel_path": stl_file.rel_path,
+            }
+            for stl_file in folder.stl_files
+        ]
+        image_files = [
+            {
+                "file_name": image_file.file_name,
+                "path": "STL_BASE_PATH",
+                "rel_path": image_file.rel_path,
+                "ext": image_file.extension,
+            }
+            for image_file in folder.image_files
+        ]
+        pdf_files = [
+            {
+                "file_name": pdf_file.file_name,
+                "path": "STL_BASE_PATH",
+                "rel_path": pdf_file.rel_path,
+                "ext": ".pdf",
+            }
+            for pdf_file in folder.pdf_files
+        ]
+
+        # G-code files in the folder, then those associated with its STL files,
+        # deduplicated by (file_name, rel_path)
+        gcode_sources = list(folder.gcode_files)
+        for stl_file in folder.stl_files:
+            gcode_sources.extend(stl_file.gcode_files)
+
+        seen = set()
+        gcode_files = []
+        for gcode_file in gcode_sources:
+            key = (gcode_file.file_name, gcode_file.rel_path)
+            if key in seen:
+                continue
+            seen.add(key)
+            gcode_files.append(self._folder_gcode_payload(gcode_file))
+
+        return stl_files, image_files, pdf_files, gcode_files
+
+    def _folder_contents_version(self, session: Session) -> Tuple[int, int]:
+        # STL/image/PDF rows only change alongside a search index rebuild, and G-code rows or
+        # their stats alongside a G-code snapshot invalidation; both bump the shared versions
+        versions = self.library_versions(session)
+        return versions.get("files"), versions.get("gcode")
+
+    def _get_cached_folder_contents(
+        self, session: Session, folder_name: str
+    ) -> Tuple[List, List, List, List]:
+        version = self._folder_contents_version(session)
+        with self._folder_contents_lock:
+            cached = self._folder_contents_cache.get(folder_name)
+            if cached is not None and cached[0] == version:
+                self._folder_contents_cache.move_to_end(folder_name)
+                return tuple(list(items) for items in cached[1])
+
+        # Tagged with the version read before loading, so a concurrent write forces a reload
+        contents = self._get_folder_contents_locked(session, folder_name)
+        with self._folder_contents_lock:
+            self._folder_contents_cache[folder_name] = (version, contents)
+            self._folder_contents_cache.move_to_end(folder_name)
+            while len(self._folder_contents_cache) > self.FOLDER_CONTENTS_CACHE_MAX:
+                self._folder_contents_cache.popitem(last=False)
+        return tuple(list(items) for items in contents)
 
-                    stats_data = {
-                        "print_count": stats.print_count,
-                        "successful_prints": stats.successful_prints,
-                        "canceled_prints": stats.canceled_prints,
-                        "avg_duration": avg_duration,
-                        "total_print_time": stats.total_print_time,
-                        "total_filament_used": stats.total_filament_used,
-                        "last_print_date": stats.last_print_date.isoformat()
-                        if stats.last_print_date
-                        else None,
-                        "success_rate": stats.success_rate,
-                        "job_id": stats.job_id,
-                        "last_status": stats.last_status,
-                    }
+    def get_folder_contents(self, folder_name: str) -> Tuple[List, List, List, List]:
+        """Get contents of a specific folder (compatible with existing app.py)."""
+        with self.get_session() as session:
+            return self._get_cached_folder_contents(session, folder_name)
 
-                gcode_files.append(
-                    {
-                        "file_name": gcode_file.file_name,
-                        "path": gcode_file.base_path,
-                        "rel_path": gcode_file.rel_path,
-                        "metadata": gcode_file.get_metadata(),
-                        "stats": stats_data,
-                    }
-                )
+    def get_folder_bundle(self, folder_name: str) -> FolderBundle:
+        """Get folder contents and 3MF projects for the folder page in one session."""
+        with self.get_session() as session:
+            stl_files, image_files, pdf_files, gcode_files = self._get_cached_folder_contents(
+                session, folder_name
+            )
+            three_mf_projects = self._get_folder_three_mf_projects_locked(session, folder_name)
+        return FolderBundle(stl_files, image_files, pdf_files, gcode_files, three_mf_projects)
 
-            # Also get G-code files that are associated with STL files in this folder
-            for stl_file in folder.stl_files:
-                for gcode_file in stl_file.gcode_files:
-                    # Get stats data if available
-                    stats_data = None
-                    if gcode_file.stats:
-                        stats = (
-                            gcode_file.stats[0]
-                            if isinstance(gcode_file.stats, list)
-                            else gcode_file.stats
-                        )
-                        # Calculate average duration in seconds
-                        avg_duration = 0
-                        if stats.print_count > 0 and stats.total_print_time > 0:
-                            avg_duration = stats.total_print_time / stats.print_count
-
-                        stats_data = {
-                            "print_count": stats.print_count,
-                            "successful_prints": stats.successful_prints,
-                            "canceled_prints": stats.canceled_prints,
-                            "avg_duration": avg_duration,
-                            "total_print_time": stats.total_print_time,
-                            "total_filament_used": stats.total_filament_used,
-                            "last_print_date": stats.last_print_date.isoformat()
-                            if stats.last_print_date
-                            else None,
-                            "success_rate": stats.success_rate,
-                            "job_id": stats.job_id,
-                            "last_status": stats.last_status,
-                        }
+    def _list_folder_three_mf_paths(self, folder_path: str) -> List[str]:
+        """
+        List 3MF files below folder_path, reusing the last listing while no directory changed.
 
-                    gcode_files.append(
-                        {
-                            "file_name": gcode_file.file_name,
-                            "path": gcode_file.base_path,
-                            "rel_path": gcode_file.rel_path,
-                            "metadata": gcode_file.get_metadata(),
-                            "stats": stats_data,
-                        }
-                    )
+        Adding, removing or renaming an entry bumps its parent directory's mtime, so
+        re-statting the directories seen last time is enough to validate the cached list.
+        """
+        with self._three_mf_listing_lock:
+            cached = self._three_mf_listing_cache.get(folder_path)
+        if cached is not None:
+            dir_mtimes, paths = cached
+            try:
+                if all(os.stat(d).st_mtime_ns == m for d, m in dir_mtimes.items()):
+                    return list(paths)
+            except OSError:
+                pass
 
-            # Deduplicate gcode_files by (file_name, rel_path)
-            seen = set()
-            deduped_gcode_files = []
-            for gfile in gcode_files:
-                key = (gfile["file_name"], gfile["rel_path"])
-                if key not in seen:
-                    deduped_gcode_files.append(gfile)
-                    seen.add(key)
+        dir_mtimes: Dict[str, int] = {}
+        paths: List[str] = []
+        pending = [folder_path]
+        while pending:
+            dir_path = pending.pop()
+            try:
+                dir_mtimes[dir_path] = os.stat(dir_path).st_mtime_ns
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.name.lower().endswith(".3mf") and entry.is_file():
+                            paths.append(entry.path)
+            except OSError:
+                continue
 
-            return stl_files, image_files, pdf_files, deduped_gcode_files
+        if folder_path not in dir_mtimes:
+            return paths
+        with self._three_mf_listing_lock:
+            if len(self._three_mf_listing_cache) >= self.THREE_MF_LISTING_CACHE_MAX:
+                self._three_mf_listing_cache.clear()
+            self._three_mf_listing_cache[folder_path] = (dir_mtimes, paths)
+        return list(paths)
 
     def _discover_three_mf_candidate_paths(self, folder_name: str) -> List[str]:
         if not self.stl_base_path:
@@ -1163,10 +1465,7 @@ class DatabaseManager:
         candidate_paths: List[str] = []
 
         if os.path.isdir(folder_path):
-            for root, _dirs, files in os.walk(folder_path):
-                for file_name in files:
-                    if file_name.lower().endswith(".3mf"):
-                        candidate_paths.append(os.path.join(root, file_name))
+            candidate_paths = self._list_folder_three_mf_paths(folder_path)
         else:
             root_three_mf = os.path.join(self.stl_base_path, f"{folder_name}.3mf")
             if os.path.isfile(root_three_mf):
@@ -1206,12 +1505,16 @@ class DatabaseManager:
         """Get parsed 3MF project data for a folder with persistent cache."""
         if not self.stl_base_path:
             return []
+        with self.get_session() as session:
+            return self._get_folder_three_mf_projects_locked(session, folder_name)
 
-        candidate_paths = self._discover_three_mf_candidate_paths(folder_name)
-        if not candidate_paths:
-            self._prune_three_mf_cache_for_folder(folder_name, valid_rel_paths=set())
+    def _get_folder_three_mf_projects_locked(
+        self, session: Session, folder_name: str
+    ) -> List[Dict[str, Any]]:
+        if not self.stl_base_path:
             return []
 
+        candidate_paths = self._discover_three_mf_candidate_paths(folder_name)
         candidate_records: List[Dict[str, Any]] = []
         for abs_path in candidate_paths:
             try:
@@ -1229,18 +1532,20 @@ class DatabaseManager:
             )
 
         if not candidate_records:
-            self._prune_three_mf_cache_for_folder(folder_name, valid_rel_paths=set())
+            if self._prune_three_mf_cache_for_folder_locked(
+                session, folder_name, valid_rel_paths=set()
+            ):
+                session.commit()
             return []
 
         candidate_records.sort(key=lambda item: item["rel_path"])
         candidate_rel_paths = {item["rel_path"] for item in candidate_records}
 
-        with self.get_session() as session:
-            cache_rows = (
-                session.query(ThreeMFProjectCache)
-                .filter(ThreeMFProjectCache.rel_path.in_(list(candidate_rel_paths)))
-                .all()
-            )
+        cache_rows = (
+            session.query(ThreeMFProjectCache)
+            .filter(ThreeMFProjectCache.rel_path.in_(list(candidate_rel_paths)))
+            .all()
+        )
         cache_by_rel_path = {row.rel_path: row for row in cache_rows}
 
         results: List[Dict[str, Any]] = []
@@ -1277,35 +1582,66 @@ class DatabaseManager:
 
             results.append(payload)
 
+        # Rows loaded above are still attached to this session, so reuse them for updates
+        for update in cache_updates:
+            row = cache_by_rel_path.get(update["rel_path"])
+            if row is None:
+                row = ThreeMFProjectCache(rel_path=update["rel_path"])
+                session.add(row)
+            row.file_mtime_ns = update["file_mtime_ns"]
+            row.file_size = update["file_size"]
+            row.summary_version = self.THREE_MF_SUMMARY_VERSION
+            row.summary_json = update["summary_json"]
+
+        pruned = self._prune_three_mf_cache_for_folder_locked(
+            session, folder_name, valid_rel_paths=candidate_rel_paths
+        )
+
+        if cache_updates or pruned:
+            session.commit()
+
+        return results
+
+    def get_gcode_stats_by_name(self, file_name: str) -> Optional[Dict[str, Any]]:
+        """Get print stats for the first G-code file with the given name."""
         with self.get_session() as session:
-            if cache_updates:
-                existing_rows = (
-                    session.query(ThreeMFProjectCache)
-                    .filter(ThreeMFProjectCache.rel_path.in_([item["rel_path"] for item in cache_updates]))
-                    .all()
-                )
-                existing_by_rel_path = {row.rel_path: row for row in existing_rows}
-                for update in cache_updates:
-                    row = existing_by_rel_path.get(update["rel_path"])
-                    if row is None:
-                        row = ThreeMFProjectCache(rel_path=update["rel_path"])
-                        session.add(row)
-                    row.file_mtime_ns = update["file_mtime_ns"]
-                    row.file_size = update["file_size"]
-                    row.summary_version = self.THREE_MF_SUMMARY_VERSION
-                    row.summary_json = update["summary_json"]
-
-            pruned = self._prune_three_mf_cache_for_folder_locked(
-                session, folder_name, valid_rel_paths=candidate_rel_paths
+            gcode_file = (
+                session.query(GCodeFile)
+                .options(selectinload(GCodeFile.stats))
+                .filter(GCodeFile.file_name == file_name)
+                .order_by(GCodeFile.id.asc())
+                .first()
             )
+            if not gcode_file:
+                return None
+            return self._gcode_stats_payload(gcode_file)
 
-            if cache_updates or pruned:
-                session.commit()
+    def invalidate_gcode_files_cache(self, session: Optional[Session] = None) -> None:
+        """Bump the shared "gcode" version after G-code rows or their stats change.
 
-        return results
+        Pass the writing session to bump inside its transaction, so other workers
+        never see the new rows under the old version.
+        """
+        self._bump_library_version("gcode", session)
+        with self._gcode_files_lock:
+            self._gcode_files_cache = None
 
     def get_all_gcode_files(self) -> List[Dict[str, Any]]:
         """Get all G-code files with folder associations and stats."""
+        version = self.library_versions().get("gcode")
+        with self._gcode_files_lock:
+            cached = self._gcode_files_cache
+        if cached is not None and cached[0] == version:
+            return list(cached[1])
+
+        # A write landing mid-load leaves the snapshot tagged with the older version,
+        # so the next call reloads instead of trusting it.
+        result = self._load_all_gcode_files()
+        with self._gcode_files_lock:
+            self._gcode_files_cache = (version, result)
+        return list(result)
+
+    def _load_all_gcode_files(self) -> List[Dict[str, Any]]:
         with self.get_session() as session:
             # Join GCodeFile with GCodeFileStats to get stats data
             gcode_files = session.query(GCodeFile).outerjoin(GCodeFileStats).all()
@@ -1369,6 +1705,7 @@ class DatabaseManager:
         sort_order: str = "asc",
         filter_text: str = "",
         filter_type: str = "all",
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Get G-code files with pagination, sorting, and filtering.
 
@@ -1379,6 +1716,8 @@ class DatabaseManager:
             sort_order: Sort order ('asc' or 'desc')
             filter_text: Text to filter files by
             filter_type: Type of filter to apply ('all', 'today', 'successful', 'failed')
+            cursor: pagination.next_cursor from a previous page; seeks instead of
+                using page and skips the total count
         """
         with self.get_session() as session:
             # Base query for G-code files
@@ -1387,14 +1726,10 @@ class DatabaseManager:
             # Apply filter type
             if filter_type == "today":
                 # Filter files created within the last 24 hours
-                from datetime import datetime, timedelta
-
                 twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
                 query = query.filter(GCodeFile.created_at >= twenty_four_hours_ago)
             elif filter_type == "week":
                 # Filter files created within the last 7 days
-                from datetime import datetime, timedelta
-
                 seven_days_ago = datetime.utcnow() - timedelta(days=7)
                 query = query.filter(GCodeFile.created_at >= seven_days_ago)
             elif filter_type == "successful":
@@ -1445,16 +1780,26 @@ class DatabaseManager:
                 query = query.join(Folder, GCodeFile.folder_id == Folder.id, isouter=True)
                 order_column = Folder.name  # Default sorting
 
-            if sort_order.lower() == "desc":
-                query = query.order_by(order_column.desc())
-            else:
-                query = query.order_by(order_column.asc())
+            # Get total count for pagination; cursor requests skip the COUNT scan
+            total_files = query.count() if cursor is None else None
 
-            # Get total count for pagination
-            total_files = query.count()
+            query = self._apply_keyset_order(
+                query.add_columns(order_column),
+                order_column,
+                GCodeFile.id,
+                sort_order.lower() == "desc",
+                decode_page_cursor(cursor) if cursor is not None else None,
+            )
 
-            # Apply pagination
-            gcode_files = query.offset((page - 1) * per_page).limit(per_page).all()
+            # Apply pagination (one extra row tells us whether a next page exists)
+            if cursor is None:
+                query = query.offset((page - 1) * per_page)
+            rows = query.limit(per_page + 1).all()
+            next_cursor = None
+            if len(rows) > per_page:
+                rows = rows[:per_page]
+                next_cursor = encode_page_cursor(rows[-1][1], rows[-1][0].id)
+            gcode_files = [row[0] for row in rows]
 
             result = []
 
@@ -1510,7 +1855,10 @@ class DatabaseManager:
                     "page": page,
                     "per_page": per_page,
                     "total_files": total_files,
-                    "total_pages": (total_files + per_page - 1) // per_page,
+                    "total_pages": (total_files + per_page - 1) // per_page
+                    if total_files is not None
+                    else None,
+                    "next_cursor": next_cursor,
                 },
                 "filter": {
                     "text": filter_text,
@@ -1522,8 +1870,15 @@ class DatabaseManager:
 
     def search_stl_files(self, query: str, limit: int = 25) -> List[Dict[str, Any]]:
         """Search STL files and folders."""
+        return self.search_stl_files_with_total(query, limit)[0]
+
+    def search_stl_files_with_total(
+        self, query: str, limit: int = 25
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Search STL files and folders, also returning the number of matched STL files."""
         if not query.strip():
-            return self.get_stl_files()
+            folders = self.get_stl_files()
+            return folders, sum(len(folder["files"]) for folder in folders)
 
         with self.get_session() as session:
             folder_matches = self._search_folder_matches(
@@ -1533,33 +1888,41 @@ class DatabaseManager:
                 limit=max(200, limit * 20),
             )[:limit]
             if not folder_matches:
-                return []
+                return [], 0
 
             folder_ids = [match["folder_id"] for match in folder_matches]
             folders = session.query(Folder).filter(Folder.id.in_(folder_ids)).all()
             folders_map = {folder.id: folder for folder in folders}
 
+            # One query for the STL rows of every matched folder instead of one per folder
+            stl_rows = (
+                session.query(STLFile.id, STLFile.folder_id, STLFile.file_name, STLFile.rel_path)
+                .filter(STLFile.folder_id.in_(folder_ids))
+                .order_by(STLFile.file_name.asc())
+                .all()
+            )
+            stl_rows_by_folder: Dict[int, List[Any]] = {}
+            for row in stl_rows:
+                stl_rows_by_folder.setdefault(row.folder_id, []).append(row)
+
             result: List[Dict[str, Any]] = []
+            total_matches = 0
             for match in folder_matches:
                 folder = folders_map.get(match["folder_id"])
                 if not folder:
                     continue
 
-                stl_query = session.query(STLFile).filter(STLFile.folder_id == folder.id)
+                folder_rows = stl_rows_by_folder.get(folder.id, [])
                 if not match.get("folder_name_matched"):
-                    matched_file_ids = list(match.get("matched_file_ids", set()))
-                    if matched_file_ids:
-                        stl_query = stl_query.filter(STLFile.id.in_(matched_file_ids))
-                    else:
-                        stl_query = stl_query.filter(text("1=0"))
+                    matched_file_ids = match.get("matched_file_ids") or set()
+                    folder_rows = [row for row in folder_rows if row.id in matched_file_ids]
 
-                stl_files = stl_query.order_by(STLFile.file_name.asc()).all()
                 folder_files = [
-                    {"file_name": stl_file.file_name, "rel_path": stl_file.rel_path}
-                    for stl_file in stl_files
+                    {"file_name": row.file_name, "rel_path": row.rel_path} for row in folder_rows
                 ]
                 three_mf_projects = self.get_folder_three_mf_projects(folder.name)
                 if folder_files or three_mf_projects:
+                    total_matches += len(folder_files)
                     result.append(
                         {
                             "folder_name": folder.name,
@@ -1568,24 +1931,38 @@ class DatabaseManager:
                             "three_mf_projects": three_mf_projects,
                         }
                     )
-            return result
+            return result, total_matches
 
     def search_gcode_files(self, query: str, limit: int = 25) -> List[Dict[str, Any]]:
         """Search G-code files."""
-        gcode_files = self.get_all_gcode_files()
-        return search.search_gcode_files(query, gcode_files, limit)
+        version = self.library_versions().get("gcode")
+        key = ("gcode", version, self._search_key_text(query), limit)
+        results = self._cached_search_result(
+            key, lambda: search.search_gcode_files(query, self.get_all_gcode_files(), limit)
+        )
+        return list(results)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive statistics."""
         with self.get_session() as session:
-            total_folders = session.query(Folder).count()
-            total_stl_files = session.query(STLFile).count()
-            total_gcode_files = session.query(GCodeFile).count()
-            total_image_files = session.query(ImageFile).count()
-            total_pdf_files = session.query(PDFFile).count()
-
-            # Count folders with G-code files
-            folders_with_gcode = session.query(Folder).join(GCodeFile).distinct().count()
+            # One round trip for every counter; a folder "has G-code" once any G-code row
+            # points at it, which the folder_id index answers without touching folders
+            counts = session.query(
+                session.query(func.count(Folder.id)).scalar_subquery(),
+                session.query(func.count(STLFile.id)).scalar_subquery(),
+                session.query(func.count(GCodeFile.id)).scalar_subquery(),
+                session.query(func.count(ImageFile.id)).scalar_subquery(),
+                session.query(func.count(PDFFile.id)).scalar_subquery(),
+                session.query(func.count(GCodeFile.folder_id.distinct())).scalar_subquery(),
+            ).one()
+            (
+                total_folders,
+                total_stl_files,
+                total_gcode_files,
+                total_image_files,
+                total_pdf_files,
+                folders_with_gcode,
+            ) = counts
 
             return {
                 "total_folders": total_folders,
@@ -1602,6 +1979,7 @@ class DatabaseManager:
             folder = session.query(Folder).filter(Folder.name == folder_name).first()
             if folder:
                 session.delete(folder)
+                self.invalidate_gcode_files_cache(session)
                 session.commit()
                 self.rebuild_search_index()
                 self._prune_three_mf_cache_for_folder(folder_name, valid_rel_paths=set())
@@ -1704,6 +2082,8 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Error updating Moonraker stats: {e}")
             return {"updated": 0, "failed": 0}
+        finally:
+            self.invalidate_gcode_files_cache()
 
     def reload_moonraker_only(
         self, moonraker_url: str, moonraker_client: Optional[PrinterServiceClient] = None
@@ -1843,8 +2223,6 @@ class DatabaseManager:
                         counters["inserted"] += 1
 
                 if cleanup_expired and ttl_days is not None and ttl_days > 0:
-                    from datetime import timedelta
-
                     cutoff = now - timedelta(days=ttl_days)
                     expired_rows = (
                         session.query(PrintHistoryEvent.id, PrintHistoryEvent.gcode_file_id)
@@ -1869,6 +2247,8 @@ class DatabaseManager:
                     integration_mode=integration_mode,
                     synced_at=now,
                 )
+                if affected_gcode_file_ids:
+                    self.invalidate_gcode_files_cache(session)
                 session.commit()
                 return counters
             except Exception as exc:
@@ -2229,33 +2609,58 @@ class DatabaseManager:
                     "print_days": 0,
                 }
 
-    def get_activity_calendar(self) -> Dict[str, int]:
-        """Get activity calendar data from database."""
+    def get_activity_calendar(
+        self, since: Optional[str] = None, until: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Get activity calendar data from database.
+
+        since and until are inclusive YYYY-MM-DD bounds; days outside them are left out.
+        """
+
+        def in_range(date_str: str) -> bool:
+            return (since is None or date_str >= since) and (until is None or date_str <= until)
+
         with self.get_session() as session:
             try:
-                history_rows = (
-                    session.query(
+                # Any synced history, even outside the window, supersedes the legacy stats;
+                # a window with no prints in it is simply empty.
+                has_history = session.query(
+                    session.query(PrintHistoryEvent.id).exists()
+                ).scalar()
+                activity_calendar: Dict[str, int] = {}
+                if has_history:
+                    # Bucket events by day in SQL; only rows without any timestamp
+                    # column need their raw payload decoded in Python.
+                    event_dt = func.coalesce(
                         PrintHistoryEvent.event_at,
                         PrintHistoryEvent.ended_at,
                         PrintHistoryEvent.started_at,
-                        PrintHistoryEvent.raw_payload_json,
                     )
-                    .order_by(PrintHistoryEvent.id.asc())
-                    .all()
-                )
-
-                activity_calendar: Dict[str, int] = {}
-                if history_rows:
-                    for row in history_rows:
-                        event_dt = self._resolve_event_datetime(
-                            row.event_at, row.ended_at, row.started_at
-                        )
-                        if not event_dt:
-                            event_dt = self._extract_event_datetime_from_payload(row.raw_payload_json)
-                        if not event_dt:
+                    event_day = func.date(event_dt)
+                    day_query = session.query(
+                        event_day, func.count(PrintHistoryEvent.id)
+                    ).filter(event_dt.isnot(None))
+                    if since is not None:
+                        day_query = day_query.filter(event_day >= since)
+                    if until is not None:
+                        day_query = day_query.filter(event_day <= until)
+                    for date_str, count in day_query.group_by(event_day).all():
+                        if date_str:
+                            activity_calendar[date_str] = activity_calendar.get(date_str, 0) + count
+                    payload_rows = (
+                        session.query(PrintHistoryEvent.raw_payload_json)
+                        .filter(event_dt.is_(None))
+                        .order_by(PrintHistoryEvent.id.asc())
+                        .all()
+                    )
+                    for row in payload_rows:
+                        payload_dt = self._extract_event_datetime_from_payload(row.raw_payload_json)
+                        if not payload_dt:
                             continue
-                        date_str = event_dt.strftime("%Y-%m-%d")
-                        activity_calendar[date_str] = activity_calendar.get(date_str, 0) + 1
+                        date_str = payload_dt.strftime("%Y-%m-%d")
+                        if in_range(date_str):
+                            activity_calendar[date_str] = activity_calendar.get(date_str, 0) + 1
                     return activity_calendar
 
                 # Backward-compatible fallback for legacy datasets.
@@ -2267,7 +2672,10 @@ class DatabaseManager:
 
                 for stat in stats_with_dates:
                     date_str = stat.last_print_date.strftime("%Y-%m-%d")
-                    activity_calendar[date_str] = activity_calendar.get(date_str, 0) + stat.print_count
+                    if in_range(date_str):
+                        activity_calendar[date_str] = (
+                            activity_calendar.get(date_str, 0) + stat.print_count
+                        )
 
                 return activity_calendar
             except Exception as e:
@@ -2290,7 +2698,7 @@ def main():
 
     # Load config
     with open(args.config, "r") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
     # Configure logging
     from trinetra.logger import configure_logging
@@ -1,6 +1,8 @@
 import configparser
 import json
+import os
 import re
+from functools import lru_cache
 
 from trinetra.logger import get_logger
 
@@ -113,27 +115,50 @@ def format_metadata_keys_for_display(metadata):
     return formatted_metadata
 
 
-def extract_gcode_metadata(file):
-    # Handle both string and file inputs
-    if isinstance(file, str):
-        content = file
-    else:
-        content = file.read()
-        file.seek(0)  # Reset file pointer for potential future reads
+# Slicer metadata lives in the header (up to "G28 ;Home") and the Cura settings trailer,
+# so large files are only read at both ends.
+GCODE_HEAD_CHUNK_BYTES = 64 * 1024
+GCODE_HEAD_LIMIT_BYTES = 1024 * 1024
+GCODE_TAIL_BYTES = 256 * 1024
+_HEADER_END_MARKER = b"G28 ;Home"
 
-    lines = content.splitlines()
+
+def read_gcode_metadata_blocks(file_path):
+    """Return (head, tail) bytes of a G-code file covering its header and settings trailer."""
+    with open(file_path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size <= GCODE_HEAD_LIMIT_BYTES + GCODE_TAIL_BYTES:
+            data = file.read()
+            return data, data
+
+        head = bytearray()
+        while len(head) < GCODE_HEAD_LIMIT_BYTES:
+            chunk = file.read(GCODE_HEAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            search_from = max(0, len(head) - len(_HEADER_END_MARKER))
+            head += chunk
+            if head.find(_HEADER_END_MARKER, search_from) != -1:
+                break
+
+        file.seek(size - GCODE_TAIL_BYTES)
+        tail = file.read()
+    return bytes(head), tail
+
+
+def _extract_metadata_from_lines(header_source_lines, trailer_source_lines):
     header_lines = []
     cura_config_lines = []
     in_cura_config = False
 
-    for line in lines:
+    for line in header_source_lines:
         line = line.strip()
         if "G28 ;Home" in line:
             break
         header_lines.append(line)
 
     # Look for Cura config after "End of Gcode"
-    for line in lines:
+    for line in trailer_source_lines:
         line = line.strip()
         if ";End of Gcode" in line:
             in_cura_config = True
@@ -154,9 +179,59 @@ def extract_gcode_metadata(file):
             metadata_from_cura = extract_gcode_metadata_from_cura_config(cura_config_dict)
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error: {e}")
-            logger.debug(f"Cura config data: {cura_config_data[:200]}...")
+            logger.debug("Cura config data: %s...", cura_config_data[:200])
 
     metadata = {**metadata_from_header, **metadata_from_cura}
 
     # Format keys for HTML display
     return format_metadata_keys_for_display(metadata)
+
+
+def extract_gcode_metadata_from_bytes(head: bytes, tail: bytes):
+    """Extract metadata from the head and tail blocks returned by read_gcode_metadata_blocks."""
+    head_lines = head.decode("utf-8", errors="ignore").splitlines()
+    if tail is head:
+        tail_lines = head_lines
+    else:
+        tail_lines = tail.decode("utf-8", errors="ignore").splitlines()
+    return _extract_metadata_from_lines(head_lines, tail_lines)
+
+
+# Display keys produced from the header block (;TIME, M140, M104)
+_HEADER_METADATA_KEYS = {"Time", "Bed Temperature", "Extruder Temperature"}
+
+
+@lru_cache(maxsize=1024)
+def _extract_metadata_from_path_cached(path, mtime_ns, file_size):
+    del mtime_ns, file_size  # Cache invalidation key only.
+    head, tail = read_gcode_metadata_blocks(path)
+    metadata = extract_gcode_metadata_from_bytes(head, tail)
+    if (
+        head is not tail
+        and _HEADER_END_MARKER not in head
+        and not _HEADER_METADATA_KEYS & metadata.keys()
+    ):
+        # The header ran past the head window without yielding anything; parse the whole file
+        with open(path, "rb") as file:
+            data = file.read()
+        metadata = extract_gcode_metadata_from_bytes(data, data)
+    return metadata
+
+
+def extract_gcode_metadata_from_path(file_path):
+    """Extract metadata from a G-code file, reusing the last parse until the file changes."""
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    return dict(_extract_metadata_from_path_cached(path, stat.st_mtime_ns, stat.st_size))
+
+
+def extract_gcode_metadata(file):
+    # Handle both string and file inputs
+    if isinstance(file, str):
+        content = file
+    else:
+        content = file.read()
+        file.seek(0)  # Reset file pointer for potential future reads
+
+    lines = content.splitlines()
+    return _extract_metadata_from_lines(lines, lines)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, TypedDict
+from typing import Any, Mapping, TypedDict
 
 
 class BambuCloudConfigBlock(TypedDict, total=False):
@@ -32,6 +32,28 @@ class BambuIntegrationSettings:
             return bool(self.access_token)
         return False
 
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> BambuIntegrationSettings:
+        """Normalize a settings form payload."""
+        return cls(
+            enabled=bool(payload.get("enabled", False)),
+            mode=str(payload.get("mode") or "cloud").strip().lower() or "cloud",
+            access_token=str(payload.get("access_token") or "").strip(),
+            refresh_token=str(payload.get("refresh_token") or "").strip(),
+            region=str(payload.get("region") or "global").strip().lower() or "global",
+        )
+
+    def to_config_block(self) -> BambuConfigBlock:
+        return {
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "cloud": {
+                "access_token": self.access_token,
+                "refresh_token": self.refresh_token,
+                "region": self.region,
+            },
+        }
+
     def to_ui_settings(self) -> dict[str, Any]:
         return {
             "mode": self.mode,
@@ -4,6 +4,7 @@ Handles communication with Moonraker API to get print history and other informat
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin
 
@@ -25,6 +26,10 @@ class MoonrakerAPI:
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
         self.session.timeout = 10  # 10 second timeout
+        # Keep a few connections to the printer open for concurrent UI requests
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def _make_request(
         self, endpoint: str, method: str = "GET", **kwargs
@@ -43,12 +48,12 @@ class MoonrakerAPI:
         url = urljoin(self.base_url, endpoint)
 
         try:
-            logger.debug(f"Making request to {url} with params {kwargs.get('params', {})}")
+            logger.debug("Making request to %s with params %s", url, kwargs.get("params", {}))
             response = self.session.request(method, url, **kwargs)
-            logger.debug(f"Response status code: {response.status_code}")
+            logger.debug("Response status code: %s", response.status_code)
             response.raise_for_status()
             result = response.json()
-            logger.debug(f"Response JSON: {result}")
+            logger.debug("Response JSON: %s", result)
             return result
         except requests.exceptions.RequestException as e:
             logger.error(f"Moonraker API request failed for {url}: {e}")
@@ -152,10 +157,10 @@ class MoonrakerAPI:
         Returns:
             Dictionary containing print history or None if failed
         """
-        logger.debug(f"Getting history with limit {limit}")
+        logger.debug("Getting history with limit %s", limit)
         params = {"limit": limit}
         response = self._make_request("/server/history/list", params=params)
-        logger.debug(f"History response: {response}")
+        logger.debug("History response: %s", response)
         if response and "result" in response:
             return response["result"]
         return None
@@ -172,9 +177,9 @@ class MoonrakerAPI:
             True if successfully added to queue, False otherwise
         """
         payload = {"filenames": filenames, "reset": reset}
-        logger.debug(f"Moonraker queue_job payload: {payload}")
+        logger.debug("Moonraker queue_job payload: %s", payload)
         response = self._make_request("/server/job_queue/job", method="POST", json=payload)
-        logger.debug(f"Moonraker queue_job response: {response}")
+        logger.debug("Moonraker queue_job response: %s", response)
 
         # Check if the request was successful
         if response is not None:
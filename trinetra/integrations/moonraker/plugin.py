@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Optional, Sequence
+import threading
+from typing import Dict, Optional, Sequence
 
 from trinetra.integrations.moonraker.api import MoonrakerAPI
 from trinetra.integrations.moonraker.types import (
@@ -22,6 +23,11 @@ class MoonrakerIntegration(PrinterIntegration[MoonrakerIntegrationSettings]):
     display_name = "Moonraker"
     description = "Klipper/Moonraker integration for print stats and queue management."
 
+    def __init__(self) -> None:
+        # One client per base URL so its requests.Session keeps connections alive across calls
+        self._clients: Dict[str, MoonrakerAPI] = {}
+        self._clients_lock = threading.Lock()
+
     def _integration_block(self, config: RuntimeIntegrationConfig) -> MoonrakerConfigBlock:
         integrations = config.get("integrations")
         if not isinstance(integrations, dict):
@@ -48,7 +54,14 @@ class MoonrakerIntegration(PrinterIntegration[MoonrakerIntegrationSettings]):
         settings = self.get_settings(config)
         if not settings.enabled or not settings.base_url:
             return None
-        return MoonrakerAPI(settings.base_url)
+        with self._clients_lock:
+            client = self._clients.get(settings.base_url)
+            if client is None:
+                # A changed URL replaces the old client instead of accumulating sessions; it is
+                # not closed here since another request may still be using it
+                self._clients = {settings.base_url: MoonrakerAPI(settings.base_url)}
+                client = self._clients[settings.base_url]
+            return client
 
     def queue_jobs(
         self, config: RuntimeIntegrationConfig, filenames: Sequence[str], reset: bool = False
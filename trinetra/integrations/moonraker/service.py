@@ -25,11 +25,11 @@ class MoonrakerService:
             logger.debug("Fetching history from Moonraker")
             # Query moonraker history for all files with high limit
             history_response = self.client.get_history(limit=1000)
-            logger.debug(f"History response type: {type(history_response)}")
+            logger.debug("History response type: %s", type(history_response))
             logger.debug(
                 f"History response keys: {history_response.keys() if isinstance(history_response, dict) else 'Not a dict'}"
             )
-            logger.debug(f"History response: {history_response}")
+            logger.debug("History response: %s", history_response)
 
             if not history_response:
                 logger.debug("No history response")
@@ -42,7 +42,7 @@ class MoonrakerService:
                 return {}
 
             jobs = history_response.get("jobs", [])
-            logger.debug(f"Found {len(jobs)} jobs in history response")
+            logger.debug("Found %s jobs in history response", len(jobs))
 
             # Group jobs by filename for efficient processing
             file_stats_map = {}
@@ -51,9 +51,9 @@ class MoonrakerService:
             for i, job in enumerate(jobs):
                 try:
                     filename = job.get("filename")
-                    logger.debug(f"Processing job {i}, filename: {filename}")
+                    logger.debug("Processing job %s, filename: %s", i, filename)
                     if not filename:
-                        logger.debug(f"Skipping job {i} with no filename")
+                        logger.debug("Skipping job %s with no filename", i)
                         continue
 
                     if filename not in file_stats_map:
@@ -68,12 +68,12 @@ class MoonrakerService:
                         }
 
                     file_stats_map[filename]["jobs"].append(job)
-                    logger.debug(f"Added job {i} to file {filename}")
+                    logger.debug("Added job %s to file %s", i, filename)
                 except Exception as job_e:
                     logger.error(f"Error processing job {i}: {job_e}")
                     continue
 
-            logger.debug(f"Grouped jobs into {len(file_stats_map)} files")
+            logger.debug("Grouped jobs into %s files", len(file_stats_map))
 
             # Calculate statistics for each file
             result = {}
@@ -81,12 +81,12 @@ class MoonrakerService:
 
             for filename, stats in file_stats_map.items():
                 try:
-                    logger.debug(f"Processing file: {filename}")
+                    logger.debug("Processing file: %s", filename)
                     jobs = stats["jobs"]
-                    logger.debug(f"File {filename} has {len(jobs)} jobs")
+                    logger.debug("File %s has %s jobs", filename, len(jobs))
 
                     stats["print_count"] = len(jobs)
-                    logger.debug(f"Set print_count for {filename}: {stats['print_count']}")
+                    logger.debug("Set print_count for %s: %s", filename, stats["print_count"])
 
                     stats["total_print_time"] = sum(job.get("print_duration", 0) for job in jobs)
                     logger.debug(
@@ -137,7 +137,7 @@ class MoonrakerService:
                         if isinstance(end_time, str):
                             try:
                                 end_time = float(end_time)
-                                logger.debug(f"Converted string end_time to float: {end_time}")
+                                logger.debug("Converted string end_time to float: %s", end_time)
                             except ValueError:
                                 logger.error(
                                     f"Invalid end_time string for job {job.get('job_id')}: {end_time}"
@@ -151,7 +151,7 @@ class MoonrakerService:
                             )
                             return 0
 
-                        logger.debug(f"Job {job.get('job_id')} has end_time: {end_time}")
+                        logger.debug("Job %s has end_time: %s", job.get("job_id"), end_time)
                         return end_time
 
                     # Log all effective end times before finding max
@@ -172,12 +172,12 @@ class MoonrakerService:
                             )
                             logger.error(f"Job details: {job}")
 
-                    logger.debug(f"Effective end times for {filename}: {effective_end_times}")
+                    logger.debug("Effective end times for %s: %s", filename, effective_end_times)
 
                     try:
                         last_job = max(jobs, key=get_effective_end_time)
                         stats["last_job"] = last_job
-                        logger.debug(f"Last job for {filename}: {last_job.get('job_id')}")
+                        logger.debug("Last job for %s: %s", filename, last_job.get("job_id"))
                     except Exception as max_e:
                         logger.error(f"Error finding max job for {filename}: {max_e}")
                         logger.error(f"Jobs for {filename}: {jobs}")
@@ -208,7 +208,7 @@ class MoonrakerService:
 
                     try:
                         last_print_date = datetime.fromtimestamp(effective_end_time)
-                        logger.debug(f"Last print date for {filename}: {last_print_date}")
+                        logger.debug("Last print date for %s: %s", filename, last_print_date)
                     except Exception as date_e:
                         logger.error(
                             f"Error converting effective_end_time to datetime for {filename}: {date_e}"
@@ -223,7 +223,7 @@ class MoonrakerService:
                         if stats["print_count"] > 0
                         else 0.0
                     )
-                    logger.debug(f"Calculated success_rate for {filename}: {success_rate}")
+                    logger.debug("Calculated success_rate for %s: %s", filename, success_rate)
 
                     result[filename] = {
                         "print_count": stats["print_count"],
@@ -236,14 +236,15 @@ class MoonrakerService:
                         "job_id": last_job.get("job_id"),
                         "last_status": last_job.get("status"),
                     }
-                    logger.debug(f"Successfully processed file {filename}")
+                    logger.debug("Successfully processed file %s", filename)
                 except Exception as file_e:
                     logger.error(f"Error processing file {filename}: {file_e}")
                     logger.error(f"File stats: {stats}", exc_info=True)
                     continue
 
-            logger.debug(f"Processed {len(result)} files successfully")
-            logger.debug(f"Returning result with {len(result)} entries: {list(result.keys())}")
+            logger.debug("Processed %s files successfully", len(result))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Returning result with %s entries: %s", len(result), list(result))
             return result
 
         except Exception as e:
@@ -255,10 +256,10 @@ class MoonrakerService:
         try:
             # Fetch all statistics in one go
             all_stats = self.fetch_all_file_statistics()
-            logger.debug(f"Fetched {len(all_stats)} files from Moonraker")
+            logger.debug("Fetched %s files from Moonraker", len(all_stats))
 
             gcode_files = db_session.query(GCodeFile).all()
-            logger.debug(f"Found {len(gcode_files)} G-code files in database")
+            logger.debug("Found %s G-code files in database", len(gcode_files))
             updated_count = 0
             failed_count = 0
 
@@ -267,10 +268,10 @@ class MoonrakerService:
                     stats_data = all_stats.get(gcode_file.file_name)
                     if not stats_data:
                         # No stats available for this file
-                        logger.debug(f"No stats found for {gcode_file.file_name}")
+                        logger.debug("No stats found for %s", gcode_file.file_name)
                         continue
 
-                    logger.debug(f"Updating stats for {gcode_file.file_name}: {stats_data}")
+                    logger.debug("Updating stats for %s: %s", gcode_file.file_name, stats_data)
 
                     # Check if stats already exist
                     file_stats = (
@@ -281,7 +282,7 @@ class MoonrakerService:
 
                     if file_stats:
                         # Update existing stats
-                        logger.debug(f"Updating existing stats for {gcode_file.file_name}")
+                        logger.debug("Updating existing stats for %s", gcode_file.file_name)
                         file_stats.print_count = stats_data["print_count"]
                         file_stats.successful_prints = stats_data["successful_prints"]
                         file_stats.canceled_prints = stats_data["canceled_prints"]
@@ -293,7 +294,7 @@ class MoonrakerService:
                         file_stats.last_status = stats_data["last_status"]
                     else:
                         # Create new stats
-                        logger.debug(f"Creating new stats for {gcode_file.file_name}")
+                        logger.debug("Creating new stats for %s", gcode_file.file_name)
                         file_stats = GCodeFileStats(
                             gcode_file_id=gcode_file.id,
                             print_count=stats_data["print_count"],
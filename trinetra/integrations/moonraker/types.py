@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TypedDict
+from typing import Any, Mapping, TypedDict
 
 
 class MoonrakerConfigBlock(TypedDict, total=False):
@@ -20,5 +20,16 @@ class MoonrakerIntegrationSettings:
     def configured(self) -> bool:
         return bool(self.base_url)
 
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> MoonrakerIntegrationSettings:
+        """Normalize a settings form payload."""
+        return cls(
+            enabled=bool(payload.get("enabled", False)),
+            base_url=str(payload.get("base_url") or "").strip(),
+        )
+
+    def to_config_block(self) -> MoonrakerConfigBlock:
+        return {"enabled": self.enabled, "base_url": self.base_url}
+
     def to_ui_settings(self) -> dict[str, str]:
         return {"base_url": self.base_url}
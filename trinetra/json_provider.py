@@ -0,0 +1,53 @@
+from types import MappingProxyType
+from typing import Any
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on orjson availability
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Values orjson cannot encode natively (datetimes, read-only mappings, dataclasses
+    and so on) fall back to Flask's default conversions, so responses keep the
+    same shape as with the stdlib encoder.
+    """
+
+    def _default(self, obj: Any) -> Any:
+        if isinstance(obj, MappingProxyType):
+            return dict(obj)
+        return DefaultJSONProvider.default(obj)
+
+    def _dumps_bytes(self, obj: Any, **kwargs: Any) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self._default, option=option)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._dumps_bytes(obj, **kwargs).decode()
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # jsonify bodies go out as the bytes orjson produced, skipping a str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self._dumps_bytes(obj, indent=indent) + b"\n", mimetype=self.mimetype
+        )
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+def install_json_provider(app) -> None:
+    """Swap in the orjson provider when orjson is installed."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
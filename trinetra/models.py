@@ -17,7 +17,7 @@ from sqlalchemy import (
     UniqueConstraint,
 )
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, func, text
 from sqlalchemy.pool import StaticPool
 
 Base = declarative_base()
@@ -39,6 +39,13 @@ class Folder(Base):
     pdf_files = relationship("PDFFile", back_populates="folder", cascade="all, delete-orphan")
     gcode_files = relationship("GCodeFile", back_populates="folder", cascade="all, delete-orphan")
 
+    # Keyset pagination orders by (sort column, id); SQLite indexes carry the rowid, so
+    # these cover the created/updated sorts (name is covered by its unique index)
+    __table_args__ = (
+        Index("idx_folder_created_at", "created_at"),
+        Index("idx_folder_updated_at", "updated_at"),
+    )
+
     def __repr__(self):
         return f"<Folder(name='{self.name}')>"
 
@@ -155,6 +162,9 @@ class GCodeFile(Base):
         Index("idx_gcode_rel_path", "rel_path"),
         Index("idx_gcode_base_path", "base_path"),
         Index("idx_gcode_stl_file", "stl_file_id"),
+        Index("idx_gcode_file_name", "file_name"),
+        Index("idx_gcode_created_at", "created_at"),
+        Index("idx_gcode_updated_at", "updated_at"),
     )
 
     def __repr__(self):
@@ -270,6 +280,11 @@ class PrintHistoryEvent(Base):
         Index("idx_history_event_event_at", "event_at"),
         Index("idx_history_event_file_id", "gcode_file_id"),
         Index("idx_history_event_basename", "normalized_basename"),
+        # Day buckets used by the activity calendar; must match its GROUP BY expression
+        Index(
+            "idx_history_event_day",
+            func.date(func.coalesce(event_at, ended_at, started_at)),
+        ),
     )
 
     def __repr__(self):
@@ -308,19 +323,68 @@ class IntegrationSyncState(Base):
         return f"<IntegrationSyncState(provider='{self.integration_id}', printer='{self.printer_uid}')>"
 
 
+class LibraryVersion(Base):
+    """Write counter shared by every process serving the same database."""
+
+    __tablename__ = "library_versions"
+
+    name = Column(String(32), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<LibraryVersion(name='{self.name}', version={self.version})>"
+
+
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("temp_store", "MEMORY"),
+    ("mmap_size", 268435456),
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL with relaxed syncing so commits are not bound by fsync."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
 def create_database_engine(db_path="trinetra.db"):
-    """Create SQLAlchemy engine for the database."""
-    return create_engine(
+    """
+    Create SQLAlchemy engine for the database.
+
+    File-backed databases get a connection per thread from the default pool: a shared
+    connection would let one thread's session rollback undo another's pending writes,
+    and WAL already lets readers run alongside the writer. Only an in-memory database,
+    which exists per connection, keeps a single static one.
+    """
+    pool_args = {"poolclass": StaticPool} if db_path == ":memory:" else {}
+    engine = create_engine(
         f"sqlite:///{db_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
         echo=False,
+        **pool_args,
     )
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return engine
 
 
 def init_database(engine):
     """Initialize the database with all tables."""
     Base.metadata.create_all(engine)
+    # create_all skips tables that already exist, so add indexes introduced since.
+    # Names come from sqlite_master because reflection does not report expression indexes.
+    with engine.begin() as conn:
+        rows = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))
+        existing = {row[0] for row in rows}
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(conn)
 
 
 def create_session_factory(engine):
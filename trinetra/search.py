@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import re
 import unicodedata
-from typing import Any, Dict, List, Tuple
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Tuple
 
 import Levenshtein
 
@@ -15,6 +16,7 @@ logger = get_logger(__name__)
 RANKING_THRESHOLD = 50
 _TOKEN_RE = re.compile(r"[a-z0-9]+")
 _ALNUM_SPLIT_RE = re.compile(r"(?<=[a-z])(?=\d)|(?<=\d)(?=[a-z])")
+_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
 
 
 def normalize_text(value: str) -> str:
@@ -22,12 +24,15 @@ def normalize_text(value: str) -> str:
     lowered = unicodedata.normalize("NFKD", value or "").lower()
     no_accents = "".join(ch for ch in lowered if not unicodedata.combining(ch))
     # Unify separators so phrase and token matching can work consistently.
-    return re.sub(r"[^a-z0-9]+", " ", no_accents).strip()
+    return _SEPARATOR_RE.sub(" ", no_accents).strip()
 
 
 def tokenize_text(value: str) -> List[str]:
     """Tokenize search text while handling mixed alpha-numeric segments."""
-    normalized = normalize_text(value)
+    return list(_text_features(value)[1])
+
+
+def _tokenize_normalized(normalized: str) -> List[str]:
     if not normalized:
         return []
 
@@ -50,17 +55,29 @@ def tokenize_text(value: str) -> List[str]:
     return deduped
 
 
-def _trigrams(value: str) -> set[str]:
-    compact = normalize_text(value).replace(" ", "")
+@lru_cache(maxsize=16384)
+def _text_features(
+    value: str,
+) -> Tuple[str, Tuple[str, ...], FrozenSet[str], FrozenSet[str]]:
+    """Normalized text, tokens, token set and trigrams, computed once per distinct string."""
+    normalized = normalize_text(value)
+    tokens = tuple(_tokenize_normalized(normalized))
+    compact = normalized.replace(" ", "")
     if len(compact) < 3:
-        return {compact} if compact else set()
-    return {compact[i : i + 3] for i in range(len(compact) - 2)}
+        trigrams = frozenset({compact} if compact else ())
+    else:
+        trigrams = frozenset(compact[i : i + 3] for i in range(len(compact) - 2))
+    return normalized, tokens, frozenset(tokens), trigrams
+
+
+def _trigrams(value: str) -> FrozenSet[str]:
+    return _text_features(value)[3]
 
 
 def jaccard_similarity(a: str, b: str) -> float:
     """Compute token Jaccard similarity."""
-    set_a = set(tokenize_text(a))
-    set_b = set(tokenize_text(b))
+    set_a = _text_features(a)[2]
+    set_b = _text_features(b)[2]
     union = set_a | set_b
     return (len(set_a & set_b) / len(union)) if union else 0.0
 
@@ -77,14 +94,13 @@ def normalized_edit_score(a: str, b: str) -> float:
 
 
 def _partial_ratio(query: str, target: str) -> float:
-    query_norm = normalize_text(query)
-    target_norm = normalize_text(target)
+    query_norm = _text_features(query)[0]
+    target_norm, target_tokens, _token_set, _trigram_set = _text_features(target)
     if not query_norm or not target_norm:
         return 0.0
     if query_norm in target_norm:
         return 1.0
 
-    target_tokens = tokenize_text(target_norm)
     if not target_tokens:
         return 0.0
     return max(Levenshtein.ratio(query_norm, token) for token in target_tokens)
@@ -117,7 +133,7 @@ def _trigram_jaccard(query: str, target: str) -> float:
 
 
 def _adaptive_threshold(query: str) -> int:
-    compact = normalize_text(query).replace(" ", "")
+    compact = _text_features(query)[0].replace(" ", "")
     size = len(compact)
     if size <= 2:
         return 82
@@ -148,14 +164,13 @@ def compute_match_score(query: str, target: str, bm25_norm: float = 0.0) -> int:
     - trigram similarity
     - optional FTS BM25 normalization
     """
-    query_norm = normalize_text(query)
-    target_norm = normalize_text(target)
+    # Normalization and tokenization are memoized per string, so the query's features are
+    # computed once per search and each target's once across searches
+    query_norm, query_tokens, _query_set, _query_trigrams = _text_features(query)
+    target_norm, target_tokens, _target_set, _target_trigrams = _text_features(target)
     if not query_norm or not target_norm:
         return 0
 
-    query_tokens = tokenize_text(query_norm)
-    target_tokens = tokenize_text(target_norm)
-
     token_overlap = jaccard_similarity(query_norm, target_norm)
     prefix_ratio = _prefix_ratio(query_tokens, target_tokens)
     typo_ratio = _token_typo_ratio(query_tokens, target_tokens)
@@ -226,7 +241,7 @@ def search_with_ranking(
 
 def build_fts_query(query: str, max_terms: int = 8) -> str:
     """Build a prefix-query expression for SQLite FTS5 retrieval."""
-    tokens = [token for token in tokenize_text(query) if len(token) >= 2][:max_terms]
+    tokens = [token for token in _text_features(query)[1] if len(token) >= 2][:max_terms]
     if not tokens:
         return ""
     unique_tokens = list(dict.fromkeys(tokens))
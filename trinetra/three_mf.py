@@ -13,7 +13,6 @@ viewer pipeline can render each plate independently.
 
 from __future__ import annotations
 
-import io
 import json
 import os
 import re
@@ -612,8 +611,8 @@ def _merge_slice_info(
 
 
 @lru_cache(maxsize=8)
-def _parse_3mf_cached(path: str, mtime: float, file_size: int) -> dict[str, Any]:
-    del mtime, file_size  # Cache invalidation key only.
+def _parse_3mf_cached(path: str, mtime_ns: int, file_size: int) -> dict[str, Any]:
+    del mtime_ns, file_size  # Cache invalidation key only.
 
     with zipfile.ZipFile(path, "r") as archive:
         model_xml = _read_zip_text(archive, ["3D/3dmodel.model"])
@@ -680,8 +679,9 @@ def _parse_3mf_cached(path: str, mtime: float, file_size: int) -> dict[str, Any]
 
 def load_3mf_project(path: str) -> dict[str, Any]:
     """Load and parse a 3MF project with cache invalidation based on file stats."""
+    path = os.path.abspath(path)
     stat = os.stat(path)
-    return _parse_3mf_cached(path, stat.st_mtime, stat.st_size)
+    return _parse_3mf_cached(path, stat.st_mtime_ns, stat.st_size)
 
 
 def project_to_summary(parsed: dict[str, Any]) -> dict[str, Any]:
@@ -717,46 +717,112 @@ def get_plate_triangles(parsed: dict[str, Any], plate_index: int) -> list[Triang
     return []
 
 
-def _build_binary_stl(triangles: list[Triangle], header_text: str = "") -> bytes:
+_STL_FACET = struct.Struct("<12fH")
+STL_HEADER_SIZE = 84
+
+
+def binary_stl_size(triangle_count: int) -> int:
+    return STL_HEADER_SIZE + _STL_FACET.size * triangle_count
+
+
+def _binary_stl_header(header_text: str, triangle_count: int) -> bytes:
     header = (header_text or "Trinetra 3MF plate").encode("ascii", errors="ignore")[:80]
-    header = header.ljust(80, b"\0")
+    return header.ljust(80, b"\0") + struct.pack("<I", triangle_count)
 
-    buf = io.BytesIO()
-    buf.write(header)
-    buf.write(struct.pack("<I", len(triangles)))
 
+def _iter_binary_stl_facets(triangles: list[Triangle], chunk_bytes: int):
+    pack = _STL_FACET.pack
+    buf = bytearray()
     for tri in triangles:
         v1, v2, v3 = tri
         normal = _normalize(_cross(_vector_sub(v2, v1), _vector_sub(v3, v1)))
-        buf.write(
-            struct.pack(
-                "<12fH",
-                normal[0],
-                normal[1],
-                normal[2],
-                v1[0],
-                v1[1],
-                v1[2],
-                v2[0],
-                v2[1],
-                v2[2],
-                v3[0],
-                v3[1],
-                v3[2],
-                0,
-            )
+        buf += pack(
+            normal[0],
+            normal[1],
+            normal[2],
+            v1[0],
+            v1[1],
+            v1[2],
+            v2[0],
+            v2[1],
+            v2[2],
+            v3[0],
+            v3[1],
+            v3[2],
+            0,
         )
+        if len(buf) >= chunk_bytes:
+            yield bytes(buf)
+            buf.clear()
+    if buf:
+        yield bytes(buf)
 
-    return buf.getvalue()
 
+def _iter_binary_stl(
+    triangles: list[Triangle], header_text: str = "", chunk_bytes: int = 1 << 20
+):
+    yield _binary_stl_header(header_text, len(triangles))
+    yield from _iter_binary_stl_facets(triangles, chunk_bytes)
 
-def build_plate_stl_bytes(
-    parsed: dict[str, Any], plate_index: int, header_text: str | None = None
-) -> bytes:
+
+def _build_binary_stl(triangles: list[Triangle], header_text: str = "") -> bytes:
+    return b"".join(_iter_binary_stl(triangles, header_text=header_text))
+
+
+def compute_plate_stl_length(parsed: dict[str, Any], plate_index: int) -> int:
+    return binary_stl_size(len(get_plate_triangles(parsed, plate_index)))
+
+
+def iter_plate_stl_chunks(
+    parsed: dict[str, Any],
+    plate_index: int,
+    header_text: str | None = None,
+    chunk_bytes: int = 1 << 20,
+):
+    """Yield a plate's binary STL in roughly chunk_bytes pieces."""
+    triangles = get_plate_triangles(parsed, plate_index)
+    if header_text is None:
+        header_text = f"Trinetra plate {plate_index}"
+    return _iter_binary_stl(triangles, header_text=header_text, chunk_bytes=chunk_bytes)
+
+
+def iter_plate_stl_range(
+    parsed: dict[str, Any],
+    plate_index: int,
+    start: int,
+    stop: int,
+    header_text: str | None = None,
+    chunk_bytes: int = 1 << 20,
+):
+    """Yield bytes [start, stop) of a plate's binary STL, packing only the facets in range."""
     triangles = get_plate_triangles(parsed, plate_index)
     if header_text is None:
         header_text = f"Trinetra plate {plate_index}"
-    return _build_binary_stl(triangles, header_text=header_text)
+    stop = min(stop, binary_stl_size(len(triangles)))
+    if start >= stop:
+        return
+
+    if start < STL_HEADER_SIZE:
+        yield _binary_stl_header(header_text, len(triangles))[start : min(stop, STL_HEADER_SIZE)]
+    if stop <= STL_HEADER_SIZE:
+        return
+
+    facet_size = _STL_FACET.size
+    first = max(start - STL_HEADER_SIZE, 0) // facet_size
+    last = -(-(stop - STL_HEADER_SIZE) // facet_size)
+    offset = STL_HEADER_SIZE + first * facet_size
+    for chunk in _iter_binary_stl_facets(triangles[first:last], chunk_bytes):
+        lo = max(start - offset, 0)
+        hi = min(stop - offset, len(chunk))
+        offset += len(chunk)
+        if lo < hi:
+            yield chunk[lo:hi]
+
+
+def build_plate_stl_bytes(
+    parsed: dict[str, Any], plate_index: int, header_text: str | None = None
+) -> bytes:
+    return b"".join(iter_plate_stl_chunks(parsed, plate_index, header_text=header_text))
 
 
 def summarize_settings(settings: dict[str, str], max_items: int = 20) -> dict[str, str]: